@@ -11,4 +11,4 @@ from tsp_solvers.methods import (
     SimulatedAnnealingThreeOpt,
 )
 
-from tsp_solvers.graph import Graph
+from tsp_solvers.graph import Graph, Tour
@@ -1 +1,3 @@
 from .graph import Graph, Edge
+from .tour import Tour
+from .tsplib import read_tsplib
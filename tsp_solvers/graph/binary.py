@@ -0,0 +1,116 @@
+"""
+This file contains the binary format used to store graphs.
+The file starts with a small json header that describes the arrays that follow it.
+Each array is aligned so it can be memory mapped, which makes opening a graph almost free
+and lets several processes share the same pages.
+"""
+
+# Import from libraries
+import hashlib
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"TSPGRAPH"
+VERSION = 1
+ALIGNMENT = 64
+# Magic bytes followed by the length of the header
+PREFIX = struct.Struct("<8sQ")
+
+
+def content_hash(metric, ids, coordinates, weights=None, dtype=None):
+    """
+    Calculates a hash of the data that defines the instance.
+    The weights are only part of the hash when they are given explicitly, and the dtype
+    of the distances, which sets their rounding, when it is given.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(metric).encode())
+    digest.update(np.ascontiguousarray(ids, dtype="<i8").tobytes())
+    digest.update(np.ascontiguousarray(coordinates, dtype="<f8").tobytes())
+    if weights is not None:
+        digest.update(np.ascontiguousarray(weights, dtype="<f8").tobytes())
+    if dtype is not None:
+        digest.update(np.dtype(dtype).str.encode())
+    return digest.hexdigest()
+
+
+def _align(position):
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_binary(path, arrays, metadata):
+    """
+    Writes the arrays to a binary file.
+
+    :param path: the path of the file.
+    :param arrays: dict with the name and the array to store.
+    :param metadata: dict with data that can be serialized to json and is stored on the header.
+    """
+    description = dict()
+    offset = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        description[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps(
+        {"version": VERSION, "metadata": metadata, "arrays": description}
+    ).encode()
+    start = _align(PREFIX.size + len(header))
+
+    with open(path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (start + description[name]["offset"] - f.tell()))
+            np.ascontiguousarray(array).tofile(f)
+
+
+def read_binary(path, mmap=True):
+    """
+    Reads a binary file written by write_binary.
+
+    :param path: the path of the file.
+    :param mmap: if True the arrays are memory mapped in read only mode instead of read.
+    :return: a tuple with the metadata and a dict with the arrays.
+    """
+    with open(path, "rb") as f:
+        magic, length = PREFIX.unpack(f.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError("{} is not a graph binary file".format(path))
+        header = json.loads(f.read(length).decode())
+        if header["version"] > VERSION:
+            raise ValueError(
+                "The file has version {} and only up to {} is supported".format(
+                    header["version"], VERSION
+                )
+            )
+        start = _align(PREFIX.size + length)
+
+        arrays = dict()
+        for name, description in header["arrays"].items():
+            dtype = np.dtype(description["dtype"])
+            shape = tuple(description["shape"])
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(
+                    path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=start + description["offset"],
+                    shape=shape,
+                )
+            else:
+                f.seek(start + description["offset"])
+                arrays[name] = np.fromfile(
+                    f, dtype=dtype, count=int(np.prod(shape))
+                ).reshape(shape)
+
+    return header["metadata"], arrays
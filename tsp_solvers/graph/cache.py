@@ -0,0 +1,166 @@
+"""
+This file contains the cache on disk of the structures derived from an instance and of the best
+tours found for it. The entries are keyed by the fingerprint of the instance and a name,
+and each one is stored on the binary format of binary.py, so the arrays are memory mapped
+when they are read. The size of the cache is capped and the least recently used entries
+are removed first.
+"""
+
+# Import from libraries
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Import from internal modules
+from .binary import read_binary, write_binary
+
+EXTENSION = ".bin"
+
+
+class DiskCache:
+    """
+    Cache of arrays on a local directory.
+    Reading an entry updates its modification time, which is used as the time of last use.
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        """
+        :param directory: the directory of the cache, it is created if it does not exist.
+        :param max_bytes: the maximum size of the entries on the cache.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get(self, key, name, mmap=True):
+        """
+        Reads an entry.
+
+        :param key: the fingerprint of the instance.
+        :param name: the name of the entry.
+        :param mmap: if True the arrays are memory mapped.
+        :return: a tuple with the metadata and a dict with the arrays, or None if it is not cached.
+        """
+        path = self._path(key, name)
+        try:
+            metadata, arrays = read_binary(path, mmap=mmap)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return metadata, arrays
+
+    def put(self, key, name, arrays, metadata=None):
+        """
+        Writes an entry and removes the least recently used ones if the cache is too big.
+        The file is written under another name and then renamed, so a process reading it
+        never sees it half written. On Windows a file that is memory mapped can not be replaced,
+        so if the entry is being used the old one is kept.
+
+        :param key: the fingerprint of the instance.
+        :param name: the name of the entry.
+        :param arrays: dict with the arrays to store.
+        :param metadata: dict with data that can be serialized to json.
+        """
+        path = self._path(key, name)
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        write_binary(temporary, arrays, metadata or dict())
+        try:
+            os.replace(temporary, path)
+        except OSError:
+            os.remove(temporary)
+            return
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """
+        Removes the least recently used entries until the cache fits on max_bytes.
+        The entries that can not be removed, because they are memory mapped on Windows,
+        are skipped and still count on the size of the cache.
+
+        :param keep: the path of an entry that is not removed.
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*" + EXTENSION)):
+            try:
+                status = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """
+        Removes all the entries, except the ones that are memory mapped on Windows
+        """
+        for path in glob.glob(os.path.join(self.directory, "*" + EXTENSION)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @property
+    def nbytes(self):
+        return sum(
+            os.path.getsize(path)
+            for path in glob.glob(os.path.join(self.directory, "*" + EXTENSION))
+        )
+
+    def get_tour(self, key, solver, config=None):
+        """
+        Returns the best tour stored for a solver with a configuration.
+
+        :param key: the fingerprint of the instance.
+        :param solver: the name of the solver.
+        :param config: dict with the configuration of the solver.
+        :return: a tuple with the positions of the vertices of the tour and its cost,
+          or None if there is no tour.
+        """
+        entry = self.get(key, _tour_name(solver, config), mmap=False)
+        if entry is None:
+            return None
+        metadata, arrays = entry
+        return arrays["order"], metadata["cost"]
+
+    def put_tour(self, key, solver, config, order, cost):
+        """
+        Stores a tour for a solver with a configuration if it is better than the stored one.
+
+        :return: True if the tour is stored.
+        """
+        stored = self.get_tour(key, solver, config)
+        if stored is not None and stored[1] <= cost:
+            return False
+        self.put(
+            key,
+            _tour_name(solver, config),
+            {"order": np.asarray(order, dtype=np.int64)},
+            {"solver": solver, "config": config, "cost": float(cost)},
+        )
+        return True
+
+    def _path(self, key, name):
+        return os.path.join(self.directory, "{}-{}{}".format(key, name, EXTENSION))
+
+
+def _tour_name(solver, config):
+    """
+    Returns the name of the entry of the tours of a solver, with a hash of its configuration
+    """
+    text = json.dumps({"solver": solver, "config": config}, sort_keys=True, default=str)
+    return "tour-{}".format(hashlib.sha256(text.encode()).hexdigest()[:16])
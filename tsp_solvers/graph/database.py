@@ -0,0 +1,100 @@
+"""
+This file contains the functions used to read graphs from a SQLite database and write tours to it.
+The rows are fetched by large batches and each batch is turned into arrays straight away,
+so the memory used is close to the size of the arrays and not of one Python object per value.
+"""
+
+# Import from libraries
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+
+# Number of rows fetched or written at once
+BATCH_SIZE = 100_000
+
+
+@contextmanager
+def connect(database):
+    """
+    Yields a connection to the database. If a path is given the connection is opened and closed,
+    and if it is already a connection it is left open.
+
+    :param database: a sqlite3 connection or the path to the database.
+    """
+    if isinstance(database, (str, os.PathLike)):
+        connection = sqlite3.connect(database)
+        try:
+            yield connection
+        finally:
+            connection.close()
+    else:
+        yield database
+
+
+def read_columns(database, query, parameters=(), batch_size=BATCH_SIZE):
+    """
+    Runs a query and returns the columns of its result as arrays, fetching the rows by batches.
+    The numeric columns are int64 or float64 arrays and the text columns are string arrays.
+
+    :param database: a sqlite3 connection or the path to the database.
+    :param query: the query to run.
+    :param parameters: the parameters of the query.
+    :param batch_size: the number of rows fetched at once.
+    :return: a list with one array for each column of the result.
+    """
+    with connect(database) as connection:
+        cursor = connection.execute(query, parameters)
+        number_columns = len(cursor.description)
+        chunks = [[] for _ in range(number_columns)]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for chunk, values in zip(chunks, zip(*rows)):
+                chunk.append(np.array(values))
+        cursor.close()
+
+    columns = []
+    for chunk in chunks:
+        if not chunk:
+            columns.append(np.empty(0))
+            continue
+        column = np.concatenate(chunk)
+        # Numpy may have chosen an object dtype for a column of mixed integers and floats
+        if column.dtype == object:
+            column = column.astype(np.float64)
+        columns.append(column)
+    return columns
+
+
+def write_rows(database, table, columns, rows, batch_size=BATCH_SIZE):
+    """
+    Inserts rows on a table, which is created if it does not exist, by batches.
+
+    :param database: a sqlite3 connection or the path to the database.
+    :param table: the name of the table.
+    :param columns: the names of the columns of the table.
+    :param rows: an iterable of tuples with the values of each row.
+    :param batch_size: the number of rows inserted at once.
+    """
+    for name in [table] + list(columns):
+        if not name.isidentifier():
+            raise ValueError("{} is not a valid table or column name".format(name))
+    insert = "INSERT INTO {} ({}) VALUES ({})".format(
+        table, ", ".join(columns), ", ".join("?" * len(columns))
+    )
+    with connect(database) as connection:
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS {} ({})".format(table, ", ".join(columns))
+            )
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    connection.executemany(insert, batch)
+                    batch = []
+            if batch:
+                connection.executemany(insert, batch)
@@ -0,0 +1,70 @@
+"""
+This file contains the disjoint set (union-find) structure used to keep track of components.
+"""
+
+
+class DisjointSet:
+    """
+    Disjoint sets of the integers from 0 to size - 1.
+    find uses path compression and union joins by rank, so any sequence of operations
+    takes almost constant time for each one.
+    """
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+        self.count = size
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, x):
+        """
+        Returns the representative of the set of x
+        """
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        """
+        Joins the sets of a and b.
+
+        :return: True if they were on different sets.
+        """
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def groups(self):
+        """
+        Returns the lists with the elements of each set, in order of their first element
+        """
+        groups = dict()
+        for x in range(len(self.parent)):
+            groups.setdefault(self.find(x), []).append(x)
+        return list(groups.values())
+
+
+def connected_components(number_vertices, origins, destinations):
+    """
+    Returns the lists of vertices of each connected component of the graph given by its edges
+    """
+    sets = DisjointSet(number_vertices)
+    for origin, destination in zip(origins, destinations):
+        sets.union(origin, destination)
+    return sets.groups()
@@ -0,0 +1,423 @@
+"""
+This file contains the classes used to store the distances between the vertices of a graph.
+All of them are accessed by the position of the vertices on the graph and not by their idx.
+"""
+
+# Import from libraries
+from collections import OrderedDict, namedtuple
+from math import sqrt
+
+import numpy as np
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+# Names of the supported metrics. EUCLIDEAN is the plain euclidean distance,
+# the rest are the TSPLIB distance functions that are rounded to integer values
+METRICS = ("EUCLIDEAN", "EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+# Values used by TSPLIB for the geographical distance
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+# Maximum number of distances calculated at once when a full matrix is calculated by blocks
+BLOCK_SIZE = 2**22
+
+
+def prepare_coordinates(coordinates, metric="EUCLIDEAN"):
+    """
+    Returns the coordinates in the form used to calculate the distances of the metric.
+    GEO coordinates are given as DDD.MM (degrees and minutes) and are converted to radians.
+    """
+    if metric not in METRICS:
+        raise ValueError("The metric has to be one of: {}".format(", ".join(METRICS)))
+    coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+    if metric == "GEO":
+        # TSPLIB reference implementations truncate the degrees
+        degrees = np.trunc(coordinates)
+        minutes = coordinates - degrees
+        return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+    return coordinates
+
+
+def distance(origins, destinations, metric="EUCLIDEAN"):
+    """
+    Calculates the distance between the origins and the destinations element by element.
+    Both arrays are broadcast against each other and the last axis holds the coordinates.
+
+    :param origins: array of shape (..., 2) with the prepared coordinates of the origins.
+    :param destinations: array of shape (..., 2) with the prepared coordinates of the destinations.
+    :param metric: one of METRICS.
+    :return: array with the distances.
+    """
+    dx = origins[..., 0] - destinations[..., 0]
+    dy = origins[..., 1] - destinations[..., 1]
+    if metric == "EUCLIDEAN":
+        return np.sqrt(dx * dx + dy * dy)
+    elif metric == "EUC_2D":
+        return np.floor(np.sqrt(dx * dx + dy * dy) + 0.5)
+    elif metric == "CEIL_2D":
+        return np.ceil(np.sqrt(dx * dx + dy * dy))
+    elif metric == "ATT":
+        real = np.sqrt((dx * dx + dy * dy) / 10.0)
+        rounded = np.floor(real + 0.5)
+        return np.where(rounded < real, rounded + 1.0, rounded)
+    elif metric == "GEO":
+        q1 = np.cos(dy)
+        q2 = np.cos(dx)
+        q3 = np.cos(origins[..., 0] + destinations[..., 0])
+        value = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        result = np.floor(GEO_RADIUS * np.arccos(value) + 1.0)
+        # TSPLIB formula gives 1 for a vertex with itself
+        return np.where((dx == 0) & (dy == 0), 0.0, result)
+    raise ValueError("The metric has to be one of: {}".format(", ".join(METRICS)))
+
+
+def pairwise_distances(origins, destinations, metric="EUCLIDEAN", dtype=np.float64):
+    """
+    Calculates the distance between every pair of origin and destination.
+    The calculation is vectorised by blocks of rows so the temporary arrays stay bounded.
+
+    :param origins: array of shape (n, 2) with the prepared coordinates of the origins.
+    :param destinations: array of shape (m, 2) with the prepared coordinates of the destinations.
+    :param metric: one of METRICS.
+    :param dtype: the dtype of the result, see quantize.
+    :return: array of shape (n, m) with the distances.
+    """
+    distances = np.empty((origins.shape[0], destinations.shape[0]), dtype=dtype)
+    step = max(1, BLOCK_SIZE // max(1, destinations.shape[0]))
+    for start in range(0, origins.shape[0], step):
+        distances[start : start + step] = quantize(
+            distance(
+                origins[start : start + step, np.newaxis, :],
+                destinations[np.newaxis, :, :],
+                metric,
+            ),
+            dtype,
+        )
+    return distances
+
+
+def pairwise_rows(matrix, dtype):
+    """
+    Converts a full matrix to the given dtype by blocks of rows
+    """
+    result = np.empty(matrix.shape, dtype=dtype)
+    step = max(1, BLOCK_SIZE // max(1, matrix.shape[1]))
+    for start in range(0, matrix.shape[0], step):
+        result[start : start + step] = quantize(
+            np.asarray(matrix[start : start + step]), dtype
+        )
+    return result
+
+
+def check_dtype(dtype):
+    """
+    Returns the numpy dtype if it can be used to store distances
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "fiu":
+        raise ValueError("The dtype of the distances has to be a float or integer type")
+    return dtype
+
+
+def quantize(values, dtype):
+    """
+    Converts the distances to the given dtype.
+    Integer dtypes round to the nearest integer as TSPLIB nint does, and
+    the distances have to fit on the dtype.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == "f" or values.dtype == dtype:
+        return values.astype(dtype, copy=False)
+    values = np.floor(np.asarray(values, dtype=np.float64) + 0.5)
+    limits = np.iinfo(dtype)
+    if values.size and (values.min() < limits.min or values.max() > limits.max):
+        raise ValueError("The distances do not fit on {}".format(dtype.name))
+    return values.astype(dtype)
+
+
+def storage_nbytes(number_vertices, storage="dense", dtype=np.float64):
+    """
+    Returns the memory in bytes needed to store the distances of a graph, so the storage and
+    the dtype can be chosen for the memory available before the graph is created.
+    The lazy storage only needs the coordinates, without counting its cache.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    if storage == "dense":
+        return number_vertices * number_vertices * itemsize
+    elif storage == "packed":
+        return number_vertices * (number_vertices - 1) // 2 * itemsize
+    elif storage == "lazy":
+        return number_vertices * 2 * np.dtype(np.float64).itemsize
+    raise ValueError("Unknown storage {}".format(storage))
+
+
+class DenseDistances:
+    """
+    Stores the full distance matrix of the graph as one contiguous array.
+    The rows and batches are returned as float64 whatever the dtype of the matrix.
+    """
+
+    def __init__(self, matrix, dtype=None):
+        """
+        :param matrix: the full matrix of distances.
+        :param dtype: the dtype used to store the matrix, by default the one of the matrix.
+        """
+        matrix = np.ascontiguousarray(matrix)
+        if dtype is not None and matrix.dtype != check_dtype(dtype):
+            matrix = pairwise_rows(matrix, dtype)
+        self.matrix = matrix
+        self.number_vertices = self.matrix.shape[0]
+
+    @classmethod
+    def from_coordinates(cls, coordinates, metric="EUCLIDEAN", dtype=np.float64):
+        coordinates = prepare_coordinates(coordinates, metric)
+        return cls(
+            pairwise_distances(coordinates, coordinates, metric, check_dtype(dtype))
+        )
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes
+
+    def cost(self, i, j):
+        return self.matrix.item(i, j)
+
+    def row(self, i):
+        return self.matrix[i].astype(np.float64, copy=False)
+
+    def rows(self, indices):
+        return self.matrix[indices].astype(np.float64, copy=False)
+
+    def batch(self, origins, destinations):
+        return self.matrix[origins, destinations].astype(np.float64, copy=False)
+
+    def to_matrix(self):
+        return self.matrix
+
+
+class PackedDistances:
+    """
+    Stores the distances of a symmetric graph as the upper triangle of the matrix
+    without the diagonal, using half of the memory of the full matrix.
+    The distances from (i, j) with i < j are stored row after row on a flat array.
+    """
+
+    def __init__(self, values, number_vertices):
+        if len(values) != number_vertices * (number_vertices - 1) // 2:
+            raise ValueError(
+                "{} values can not be the upper triangle of {} vertices".format(
+                    len(values), number_vertices
+                )
+            )
+        self.values = values
+        self.number_vertices = number_vertices
+        # Position of the distance (i, i + 1) on the flat array
+        positions = np.arange(number_vertices, dtype=np.int64)
+        self._starts = positions * number_vertices - positions * (positions + 1) // 2
+        self._starts_list = self._starts.tolist()
+
+    @classmethod
+    def from_coordinates(cls, coordinates, metric="EUCLIDEAN", dtype=np.float64):
+        coordinates = prepare_coordinates(coordinates, metric)
+        n = coordinates.shape[0]
+        distances = cls(np.empty(n * (n - 1) // 2, dtype=check_dtype(dtype)), n)
+        for i in range(n - 1):
+            distances._row_values(i)[:] = quantize(
+                distance(coordinates[i], coordinates[i + 1 :], metric), dtype
+            )
+        return distances
+
+    @classmethod
+    def from_matrix(cls, matrix, dtype=np.float64):
+        """
+        Packs a full matrix, which has to be symmetric
+        """
+        n = matrix.shape[0]
+        distances = cls(np.empty(n * (n - 1) // 2, dtype=check_dtype(dtype)), n)
+        for i in range(n - 1):
+            if not np.array_equal(matrix[i, i + 1 :], matrix[i + 1 :, i]):
+                raise ValueError("Only symmetric distances can be packed")
+            distances._row_values(i)[:] = quantize(
+                np.asarray(matrix[i, i + 1 :]), dtype
+            )
+        return distances
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def cost(self, i, j):
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return self.values.item(self._starts_list[i] + j - i - 1)
+
+    def row(self, i):
+        row = np.empty(self.number_vertices, dtype=np.float64)
+        # The distances to the previous vertices are on their rows, one on each
+        previous = np.arange(i)
+        row[:i] = self.values[self._starts[:i] + i - previous - 1]
+        row[i] = 0.0
+        row[i + 1 :] = self._row_values(i)
+        return row
+
+    def rows(self, indices):
+        indices = np.asarray(indices)
+        result = np.empty((len(indices), self.number_vertices), dtype=np.float64)
+        for position, i in enumerate(indices.tolist()):
+            result[position] = self.row(i)
+        return result
+
+    def batch(self, origins, destinations):
+        origins, destinations = np.broadcast_arrays(origins, destinations)
+        low = np.minimum(origins, destinations)
+        high = np.maximum(origins, destinations)
+        same = low == high
+        indices = np.where(same, 0, self._starts[low] + high - low - 1)
+        return np.where(same, 0.0, self.values[indices]).astype(np.float64)
+
+    def to_matrix(self):
+        matrix = np.zeros(
+            (self.number_vertices, self.number_vertices), self.values.dtype
+        )
+        for i in range(self.number_vertices - 1):
+            matrix[i, i + 1 :] = self._row_values(i)
+            matrix[i + 1 :, i] = self._row_values(i)
+        return matrix
+
+    def _row_values(self, i):
+        """
+        Returns the stored distances from i to the vertices after it
+        """
+        start = self._starts_list[i]
+        return self.values[start : start + self.number_vertices - i - 1]
+
+
+class LazyDistances:
+    """
+    Only keeps the coordinates of the vertices and calculates the distances when they are needed.
+    Optionally, the last rows that have been requested are kept in a cache that holds at most
+    cache_size rows, so the memory used is still linear on the number of vertices.
+    The cost of a pair is then read from the cached row of its origin, which is calculated on
+    a miss. With the EUCLIDEAN metric one cost is cheaper to calculate than to look up, so
+    the cache only pays off for the other metrics or for whole rows.
+    """
+
+    def __init__(self, coordinates, cache_size=0, metric="EUCLIDEAN"):
+        self.metric = metric
+        self.coordinates = prepare_coordinates(coordinates, metric)
+        self.number_vertices = self.coordinates.shape[0]
+        self.cache_size = cache_size
+        self._x = self.coordinates[:, 0].tolist()
+        self._y = self.coordinates[:, 1].tolist()
+        self._rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self):
+        return self.coordinates.nbytes + sum(row.nbytes for row in self._rows.values())
+
+    def cost(self, i, j):
+        if self.cache_size:
+            row = self._rows.get(i)
+            if row is None:
+                # The row of i is calculated and stored, so the next costs from i are hits
+                return self.row(i).item(j)
+            self.hits += 1
+            self._rows.move_to_end(i)
+            return row.item(j)
+        if self.metric != "EUCLIDEAN":
+            return distance(
+                self.coordinates[i], self.coordinates[j], self.metric
+            ).item()
+        dx = self._x[i] - self._x[j]
+        dy = self._y[i] - self._y[j]
+        return sqrt(dx * dx + dy * dy)
+
+    def row(self, i):
+        if self.cache_size:
+            row = self._rows.get(i)
+            if row is not None:
+                self.hits += 1
+                self._rows.move_to_end(i)
+                return row
+            self.misses += 1
+
+        row = distance(self.coordinates[i], self.coordinates, self.metric)
+        row.flags.writeable = False
+        if self.cache_size:
+            self._rows[i] = row
+            if len(self._rows) > self.cache_size:
+                self._rows.popitem(last=False)
+        return row
+
+    def rows(self, indices):
+        """
+        Returns the distances from the given vertices to all the vertices, without caching them
+        """
+        return pairwise_distances(
+            self.coordinates[indices], self.coordinates, self.metric
+        )
+
+    def batch(self, origins, destinations):
+        return distance(
+            self.coordinates[origins], self.coordinates[destinations], self.metric
+        )
+
+    def to_matrix(self):
+        return pairwise_distances(self.coordinates, self.coordinates, self.metric)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self._rows))
+
+    def cache_clear(self):
+        self._rows.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class SubsetDistances:
+    """
+    View of the distances between a subset of the vertices of another storage.
+    Only the positions of the vertices on the other storage are kept, and every access is
+    remapped to it, so no distance is copied. The views of views remap to the first storage.
+    """
+
+    def __init__(self, distances, indices):
+        """
+        :param distances: the distance storage with all the vertices.
+        :param indices: array with the positions on distances of the vertices of the subset.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if isinstance(distances, SubsetDistances):
+            indices = distances.indices[indices]
+            distances = distances.distances
+        self.distances = distances
+        self.indices = indices
+        self.number_vertices = len(indices)
+        self._indices_list = indices.tolist()
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes
+
+    def cost(self, i, j):
+        return self.distances.cost(self._indices_list[i], self._indices_list[j])
+
+    def row(self, i):
+        return self.distances.batch(self._indices_list[i], self.indices)
+
+    def rows(self, indices):
+        # Only the columns of the subset are gathered, not the full rows of the storage
+        origins = self.indices[np.asarray(indices)]
+        return self.distances.batch(origins[:, np.newaxis], self.indices[np.newaxis])
+
+    def batch(self, origins, destinations):
+        return self.distances.batch(self.indices[origins], self.indices[destinations])
+
+    def to_matrix(self):
+        return self.rows(np.arange(self.number_vertices))
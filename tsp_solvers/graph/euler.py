@@ -0,0 +1,64 @@
+"""
+This file contains the functions used to turn an eulerian multigraph into a tour.
+The multigraph is given by the arrays of origins and destinations of its edges, by position,
+and the adjacency lists are built once as arrays sorted by vertex.
+"""
+
+# Import from libraries
+import numpy as np
+
+
+def euler_tour(number_vertices, origins, destinations, start=0):
+    """
+    Calculates an Euler circuit of a connected multigraph with Hierholzer algorithm in O(n + m).
+    The walk is built with a stack instead of recursion, so it works on any number of edges.
+
+    :param number_vertices: the number of vertices.
+    :param origins: the positions of the origins of the edges.
+    :param destinations: the positions of the destinations of the edges.
+    :param start: the position of the vertex where the circuit starts.
+    :return: array with the vertices of the circuit, with the start repeated at the end.
+    """
+    origins = np.asarray(origins, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    degrees = np.bincount(
+        np.concatenate((origins, destinations)), minlength=number_vertices
+    )
+    if np.any(degrees % 2):
+        raise ValueError("All the vertices need an even degree to have an Euler tour")
+
+    # Each edge appears in the adjacency lists of both of its ends
+    number_edges = len(origins)
+    ends = np.concatenate((origins, destinations))
+    order = np.argsort(ends, kind="stable")
+    adjacent = np.concatenate((destinations, origins))[order].tolist()
+    edge_ids = np.tile(np.arange(number_edges), 2)[order].tolist()
+    starts = np.searchsorted(ends[order], np.arange(number_vertices + 1)).tolist()
+
+    # The next edge of the list of each vertex that may not have been used
+    pointer = starts[:-1]
+    used = [False] * number_edges
+    stack = [start]
+    circuit = []
+    while stack:
+        vertex = stack[-1]
+        i, end = pointer[vertex], starts[vertex + 1]
+        while i < end and used[edge_ids[i]]:
+            i += 1
+        if i == end:
+            pointer[vertex] = i
+            circuit.append(stack.pop())
+        else:
+            pointer[vertex] = i + 1
+            used[edge_ids[i]] = True
+            stack.append(adjacent[i])
+    return np.array(circuit[::-1], dtype=np.int64)
+
+
+def shortcut(walk):
+    """
+    Returns the order of the first visit to each vertex of a walk
+    """
+    walk = np.asarray(walk)
+    _, first = np.unique(walk, return_index=True)
+    return walk[np.sort(first)]
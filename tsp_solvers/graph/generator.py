@@ -0,0 +1,107 @@
+"""
+This file contains the generator of random instances.
+The coordinates are drawn at once with numpy and the duplicated ones are removed by sorting,
+drawing again only the number of vertices that are missing.
+"""
+
+# Import from libraries
+from math import ceil, sqrt
+
+import numpy as np
+
+LAYOUTS = ("uniform", "clustered", "grid")
+
+# Maximum number of times the duplicated coordinates are drawn again
+MAX_ROUNDS = 100
+
+
+def generate_coordinates(
+    size,
+    layout="uniform",
+    seed=None,
+    scale=None,
+    integer=True,
+    clusters=None,
+    spread=None,
+    perturbation=0.25,
+):
+    """
+    Generates the coordinates of a random instance without duplicated vertices.
+
+    :param size: number of vertices.
+    :param layout: "uniform" draws the vertices uniformly on the square, "clustered" draws them
+      from a mixture of gaussians with the centers drawn uniformly and "grid" takes random cells
+      of a regular grid and moves each vertex a bit from the center of its cell.
+    :param seed: seed of the random generator, the same seed gives the same instance.
+    :param scale: size of the side of the square, by default twice the number of vertices.
+    :param integer: if True the coordinates are rounded to integers.
+    :param clusters: number of clusters of the clustered layout, by default one every 100 vertices.
+    :param spread: standard deviation of the clusters, by default the square is split evenly
+      between the clusters.
+    :param perturbation: maximum displacement of the vertices of the grid layout,
+      as a fraction of the size of the cells.
+    :return: array of shape (size, 2), of integers if integer is True.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError("The layout has to be one of: {}".format(", ".join(LAYOUTS)))
+    rng = np.random.default_rng(seed)
+    scale = float(size * 2 if scale is None else scale)
+
+    if layout == "clustered":
+        clusters = clusters or max(1, size // 100)
+        spread = spread or scale / (2 * sqrt(clusters))
+        centers = rng.uniform(0, scale, (clusters, 2))
+
+        def draw(number):
+            chosen = rng.integers(0, clusters, number)
+            points = centers[chosen] + rng.normal(0, spread, (number, 2))
+            # The vertices outside of the square are drawn again
+            return points[((points >= 0) & (points <= scale)).all(axis=1)]
+
+    elif layout == "grid":
+        side = max(1, ceil(sqrt(size)))
+        step = scale / side
+        cells = rng.permutation(side * side)
+
+        def draw(number):
+            nonlocal cells
+            # The cells are taken without repetition until all of them have been used
+            if len(cells) < number:
+                cells = np.concatenate((cells, rng.integers(0, side * side, number)))
+            chosen, cells = cells[:number], cells[number:]
+            centers = (
+                np.stack((chosen // side, chosen % side), axis=1) * step + step / 2
+            )
+            offset = rng.uniform(-perturbation, perturbation, (number, 2)) * step
+            return np.clip(centers + offset, 0, scale)
+
+    else:
+
+        def draw(number):
+            return rng.uniform(0, scale, (number, 2))
+
+    coordinates = np.empty((0, 2))
+    for _ in range(MAX_ROUNDS):
+        points = draw(size - len(coordinates))
+        if integer:
+            points = np.rint(points)
+        coordinates = _unique(np.concatenate((coordinates, points)))
+        if len(coordinates) == size:
+            break
+    else:
+        raise ValueError(
+            "{} different vertices could not be generated, the scale is too small "
+            "or the clusters too spread".format(size)
+        )
+
+    if integer:
+        return coordinates.astype(np.int64)
+    return coordinates
+
+
+def _unique(coordinates):
+    """
+    Removes the duplicated coordinates keeping the first ones in their original order
+    """
+    _, first = np.unique(coordinates, axis=0, return_index=True)
+    return coordinates[np.sort(first)]
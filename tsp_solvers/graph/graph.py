@@ -6,10 +6,33 @@ This graph is constructed from nodes and edges
 
 # Import from libraries
 import json
+import os
 import random
 import sys
-from functools import lru_cache
-from math import pow, sqrt
+from collections.abc import Mapping
+
+import numpy as np
+
+# Import from internal modules
+from .binary import content_hash, read_binary, write_binary
+from .cache import DiskCache
+from .database import read_columns, write_rows
+from .distances import (
+    DenseDistances,
+    LazyDistances,
+    PackedDistances,
+    SubsetDistances,
+    check_dtype,
+)
+from .generator import generate_coordinates
+from .matching import greedy_matching, improve_matching, minimum_weight_perfect_matching
+from .neighbors import nearest_neighbors, quadrant_neighbors, subset_neighbors
+from .shared import SharedGraph
+from .spanning_tree import kruskal, prim, tree_parents
+from .sparse import SparseEdges, edge_columns, read_edges
+from .spatial import PLANAR_METRICS, GridIndex
+from .tour import Tour
+from .tsplib import read_tsplib
 
 # Matplotlib is not an required requirement
 try:
@@ -21,6 +44,8 @@ except ModuleNotFoundError:
 except NameError:
     pass
 
+MATCHING_METHODS = ("exact", "blossom", "greedy")
+
 
 class Edge:
     def __init__(self, data):
@@ -93,14 +118,152 @@ class Vertex:
         return "Vertex: {}".format(self.idx)
 
 
+class EdgesView(Mapping):
+    """
+    Compatibility view of the edges of a complete graph keyed by (origin idx, destination idx).
+    The Edge objects are only created when they are accessed and are kept afterwards,
+    so the attributes set on them are not lost.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._edges = dict()
+
+    def __getitem__(self, key):
+        edge = self._edges.get(key)
+        if edge is None:
+            origin, destination = key
+            if origin == destination:
+                raise KeyError(key)
+            edge = Edge(
+                {
+                    "origin": self.graph.vertices_collection[origin],
+                    "destination": self.graph.vertices_collection[destination],
+                    "cost": self.graph.get_edge_cost(origin, destination),
+                }
+            )
+            self._edges[key] = edge
+        return edge
+
+    def __setitem__(self, key, edge):
+        self._edges[key] = edge
+
+    def __contains__(self, key):
+        try:
+            origin, destination = key
+        except (TypeError, ValueError):
+            return False
+        return (
+            origin != destination
+            and origin in self.graph.vertices_position
+            and destination in self.graph.vertices_position
+        )
+
+    def __iter__(self):
+        for origin in self.graph.vertices:
+            for destination in self.graph.vertices:
+                if origin.idx != destination.idx:
+                    yield origin.idx, destination.idx
+
+    def __len__(self):
+        return self.graph.number_vertices * (self.graph.number_vertices - 1)
+
+
+class SparseEdgesView(EdgesView):
+    """
+    Compatibility view of the edges of a sparse graph keyed by (origin idx, destination idx).
+    Only the edges stored on the sparse edges of the graph are on it.
+    """
+
+    def __getitem__(self, key):
+        if key not in self._edges and key not in self:
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if not super().__contains__(key):
+            return False
+        origin, destination = key
+        return self.graph.get_edge_cost(origin, destination) < np.inf
+
+    def __iter__(self):
+        ids = [vertex.idx for vertex in self.graph.vertices]
+        origins, destinations, _ = self.graph.sparse_edges.edges()
+        for origin, destination in zip(origins.tolist(), destinations.tolist()):
+            yield ids[origin], ids[destination]
+
+    def __len__(self):
+        return self.graph.sparse_edges.number_edges
+
+
 class Graph:
-    def __init__(self):
+    STORAGES = ("dense", "packed", "lazy")
+
+    def __init__(self, storage="dense", cache_size=0, dtype="float64", disk_cache=None):
+        """
+        :param storage: how the distances between vertices are stored. With "dense" the full
+          distance matrix is calculated when the graph is created. With "packed" only the upper
+          triangle of the matrix is stored, which takes half of the memory and needs the distances
+          to be symmetric. With "lazy" only the coordinates are kept and the distances are
+          calculated on demand, which is meant for instances too large for a matrix.
+        :param cache_size: number of distance rows kept in cache by the lazy storage.
+          By default there is no cache.
+        :param dtype: the dtype of the stored distances. float32 takes half of the memory and
+          integer dtypes (int32, uint16...) round the distances to the nearest integer as TSPLIB does.
+          The memory needed can be checked beforehand with distances.storage_nbytes.
+        :param disk_cache: a DiskCache, or the path of its directory, where the distances,
+          neighbours and minimum spanning trees are stored once calculated and read from
+          on the next graphs of the same instance, see fingerprint. The best tours can be
+          stored on it as well with save_best_tour.
+        """
+        if storage not in self.STORAGES:
+            raise ValueError(
+                "The storage has to be one of: {}".format(", ".join(self.STORAGES))
+            )
+        self.dtype = check_dtype(dtype)
+        if storage == "lazy" and self.dtype != np.float64:
+            raise ValueError("The lazy storage calculates the distances as float64")
+        self.storage = storage
+        self.cache_size = cache_size
         self.data = None
         self.number_vertices = None
         self.edges = list()
-        self.edges_collection = dict()
+        self._edges_collection = dict()
+        self._edges_view = None
         self.vertices = list()
         self.vertices_collection = dict()
+        self.vertices_position = dict()
+        self.coordinates = None
+        self.metric = "EUCLIDEAN"
+        self.distances = None
+        self.sparse_edges = None
+        self.neighbors = None
+        self.quadrant_neighbors = None
+        self.spatial_index = None
+        self.parent = None
+        self.parent_positions = None
+        self.shared = None
+        if isinstance(disk_cache, (str, os.PathLike)):
+            disk_cache = DiskCache(disk_cache)
+        self.disk_cache = disk_cache
+        self._fingerprint = None
+
+    @property
+    def edges_collection(self):
+        if self._edges_collection is not None:
+            return self._edges_collection
+
+        if self._edges_view is None:
+            if self.distances is None and self.sparse_edges is not None:
+                self._edges_view = SparseEdgesView(self)
+            else:
+                self._edges_view = EdgesView(self)
+        return self._edges_view
+
+    @edges_collection.setter
+    def edges_collection(self, edges_collection):
+        self._edges_collection = edges_collection
+        self._edges_view = None
 
     def add_edge(self, vertex_1, vertex_2, cost=0.0, check=False):
         edge = Edge({"origin": vertex_1, "destination": vertex_2})
@@ -113,48 +276,44 @@ class Graph:
         self.edges_collection[(vertex_1.idx, vertex_2.idx)] = edge
         self.edges.append(edge)
 
-    @staticmethod
-    @lru_cache(maxsize=None)
-    def calculate_cost(vertex_1, vertex_2):
-        distance = sqrt(
-            pow(
-                vertex_1.x - vertex_2.x,
-                2,
-            )
-            + pow(
-                vertex_1.y - vertex_2.y,
-                2,
-            )
-        )
-        return distance
-
-    def random_complete_graph(self, size):
-        self.number_vertices = size
-
-        for i in range(self.number_vertices):
-            new = True
-            while new:
-                temp = {
-                    "idx": i,
-                    "x": random.randint(0, self.number_vertices * 2),
-                    "y": random.randint(0, self.number_vertices * 2),
-                }
-                temp_vertex = Vertex(temp)
-                repeat = False
-                for vertex in self.vertices:
-                    if vertex == temp_vertex:
-                        repeat = True
-
-                if not repeat:
-                    new = False
-            self.vertices.append(temp_vertex)
-            self.vertices_collection[temp_vertex.idx] = temp_vertex
-
-        self._create_edges()
-
-    def create_graph_from_json(self, path: str):
+    def calculate_cost(self, vertex_1, vertex_2):
+        return self.get_edge_cost(vertex_1.idx, vertex_2.idx)
+
+    def cache_info(self):
+        """
+        Returns the hits and misses of the distance cache of the lazy storage,
+        or None if the distances are not cached.
+        """
+        if self.distances is None or not hasattr(self.distances, "cache_info"):
+            return None
+        return self.distances.cache_info()
+
+    def random_complete_graph(self, size, layout="uniform", seed=None, **options):
+        """
+        Creates a random instance, see generator.generate_coordinates for the layouts and options.
+        If no seed is given it is taken from the random module, so random.seed sets the instance.
+
+        :param size: number of vertices.
+        :param layout: one of "uniform", "clustered" or "grid".
+        :param seed: seed of the random generator.
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        coordinates = generate_coordinates(size, layout, seed, **options)
+        self._create_vertices(np.arange(size), coordinates)
+        self._create_distances(coordinates)
+
+    def create_graph_from_json(self, path: str, complete=False):
+        """
+        Loads a graph from a json file with its vertices and optionally its edges.
+        The edges are records with the idx of their ends on n1 and n2 and their weight on w.
+        If there are no edges the graph is complete with the distances between the coordinates.
+
+        :param path: the path to the file.
+        :param complete: if True and there are edges, the distances are the shortest paths
+          on them, see create_graph_from_edges.
+        """
         # TODO: add json schema validation here of kwargs so if data is passed no need to execute another method
-        # TODO: add vertices_collection
         with open(path) as f:
             self.data = json.load(f)
         self.number_vertices = len(self.data.get("vertices"))
@@ -163,142 +322,500 @@ class Graph:
 
         edges = self.data.get("edges", None)
         if edges is None:
-            self._create_edges()
+            self._create_distances()
 
         else:
-            # TODO: implement if the json has edges
-            pass
+            self._create_sparse_edges(*edge_columns(edges), complete)
+
+    def create_graph_from_edges(self, path: str, file_format=None, complete=False):
+        """
+        Loads a sparse graph from an edge list on a json, ndjson or csv file, with the idx of
+        the ends of each edge on the fields n1 and n2 and its weight on w.
+        The vertices are the ones on the edges and they do not have coordinates.
+
+        :param path: the path to the file.
+        :param file_format: "json", "ndjson" or "csv". By default it is given by the extension.
+        :param complete: if False the graph only has the given edges, stored in CSR form on
+          sparse_edges. If True the graph is completed with the length of the shortest path
+          between every pair of vertices as an EXPLICIT metric, so all the solvers can be used.
+          That takes O(n²) memory.
+        """
+        self.data = None
+        self.vertices = list()
+        self._create_sparse_edges(*read_edges(path, file_format), complete)
 
     def create_graph_from_tsp(self, path: str):
-        with open(path) as f:
-            text = f.read()
-            _, nodes = text.split("NODE_COORD_SECTION")
-            nodes = nodes.split("\n")
-            nodes = nodes[1:-1]
-            nodes = [node.split(" ") for node in nodes]
-
-        self.number_vertices = len(nodes)
-
-        self.vertices = [
-            Vertex({"idx": int(node[0]), "x": float(node[1]), "y": float(node[2])})
-            for node in nodes
-        ]
-
-        self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
-
-        self._create_edges()
-
-    def create_graph_from_db(self):
-        pass
-
-    def create_graph_from_schema(self, data):
-        aux_vertices = list(set([d["n1"] for d in data] + [d["n2"] for d in data]))
-        self.number_vertices = len(aux_vertices)
-        self.vertices = [
-            Vertex({"idx": vertex, "x": 0, "y": 0}) for vertex in aux_vertices
-        ]
-
-        self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
-
-        self.edges = [
-            Edge(
-                {
-                    "origin": self.vertices_collection[d["n1"]],
-                    "destination": self.vertices_collection[d["n2"]],
-                    "cost": d["w"],
-                }
+        instance = read_tsplib(path)
+        self.data = instance.specification
+        self.number_vertices = instance.dimension
+        coordinates = instance.coordinates
+        if coordinates is None:
+            coordinates = np.zeros((self.number_vertices, 2))
+
+        self._create_vertices(instance.ids, coordinates)
+
+        self.metric = instance.edge_weight_type
+        self._create_distances(coordinates, instance.weights)
+
+    def create_graph_from_binary(self, path: str, mmap=True, verify=False):
+        """
+        Loads a graph saved with save_graph_to_binary.
+
+        The distances saved on the file are used as they are stored, with their dtype and layout,
+        so a memory mapped file is not copied, unless the storage of the graph is lazy.
+
+        :param path: the path to the file.
+        :param mmap: if True the arrays are memory mapped instead of read into memory.
+        :param verify: if True the content hash of the file is checked.
+        """
+        metadata, arrays = read_binary(path, mmap=mmap)
+        self.data = metadata
+        self.metric = metadata["metric"]
+        self.number_vertices = metadata["number_vertices"]
+        weights = arrays.get("distances")
+        if verify:
+            loaded_hash = content_hash(
+                self.metric,
+                arrays["ids"],
+                arrays["coordinates"],
+                weights if self.metric == "EXPLICIT" else None,
             )
-            for d in data
-            if d["n1"] != d["n2"]
-        ] + [
-            Edge(
-                {
-                    "origin": self.vertices_collection[d["n2"]],
-                    "destination": self.vertices_collection[d["n1"]],
-                    "cost": d["w"],
-                }
+            if loaded_hash != metadata["hash"]:
+                raise ValueError("The content hash of {} does not match".format(path))
+
+        self._create_vertices(arrays["ids"], arrays["coordinates"])
+        stored = None
+        lazy = self.storage == "lazy" and self.metric != "EXPLICIT"
+        if weights is not None and not lazy:
+            # Files written before the layout was saved have the full matrix
+            self.storage = metadata.get("layout", "dense")
+            self.dtype = weights.dtype
+            if self.storage == "packed":
+                stored = PackedDistances(weights, self.number_vertices)
+            else:
+                stored = DenseDistances(weights)
+        self._create_distances(arrays["coordinates"], weights, stored)
+        self.neighbors = arrays.get("neighbors")
+        self.quadrant_neighbors = arrays.get("quadrant_neighbors")
+
+    def create_graph_from_shared(self, shared):
+        """
+        Loads a graph published with share, usually on another process. The coordinates,
+        distances and neighbours are read-only views of the shared memory, so nothing is copied
+        and only the vertices are created.
+
+        :param shared: the SharedGraph returned by share.
+        """
+        metadata = shared.metadata
+        arrays = shared.attach()
+        self.storage = metadata["storage"]
+        self.cache_size = metadata["cache_size"]
+        self.dtype = np.dtype(metadata["dtype"])
+        self.metric = metadata["metric"]
+        self.data = None
+        self._create_vertices(arrays["ids"], arrays["coordinates"])
+        self.number_vertices = len(self.vertices)
+        self.vertices_position = {
+            vertex.idx: position for position, vertex in enumerate(self.vertices)
+        }
+        self.coordinates = arrays["coordinates"]
+        self._fingerprint = None
+        if self.storage == "dense":
+            self.distances = DenseDistances(arrays["distances"])
+        elif self.storage == "packed":
+            self.distances = PackedDistances(arrays["distances"], self.number_vertices)
+        else:
+            self.distances = LazyDistances(
+                self.coordinates, self.cache_size, self.metric
             )
-            for d in data
-            if d["n1"] != d["n2"]
-        ]
-
-        self.edges_collection = {
-            (edge.origin.idx, edge.destination.idx): edge for edge in self.edges
+        self.neighbors = arrays.get("neighbors")
+        self.quadrant_neighbors = arrays.get("quadrant_neighbors")
+        self.spatial_index = None
+        self.edges_collection = None
+        # The handle keeps the shared memory open while the graph uses it
+        self.shared = shared
+
+    def share(self):
+        """
+        Publishes the arrays of the graph on shared memory: the ids and coordinates of the
+        vertices, the stored distances and the neighbours that have been calculated.
+        The returned SharedGraph can be sent to other processes, where create_graph_from_shared
+        attaches to the same memory, so the distances are not copied for each process.
+        The blocks have to be freed with unlink, or by using the SharedGraph on a with statement,
+        when the other processes are done.
+
+        :return: the SharedGraph.
+        """
+        storages = (DenseDistances, PackedDistances, LazyDistances)
+        if not isinstance(self.distances, storages):
+            raise ValueError(
+                "Only graphs with dense, packed or lazy storage can be shared"
+            )
+        arrays = {
+            "ids": np.array([vertex.idx for vertex in self.vertices]),
+            "coordinates": self.coordinates,
+        }
+        if isinstance(self.distances, DenseDistances):
+            arrays["distances"] = self.distances.matrix
+        elif isinstance(self.distances, PackedDistances):
+            arrays["distances"] = self.distances.values
+        if self.neighbors is not None:
+            arrays["neighbors"] = self.neighbors
+        if self.quadrant_neighbors is not None:
+            arrays["quadrant_neighbors"] = self.quadrant_neighbors
+
+        metadata = {
+            "storage": self.storage,
+            "cache_size": self.cache_size,
+            "dtype": self.dtype.str,
+            "metric": self.metric,
         }
+        return SharedGraph.publish(metadata, arrays)
+
+    def create_graph_from_db(
+        self,
+        database,
+        nodes_query="SELECT idx, x, y FROM nodes",
+        edges_query=None,
+        complete=False,
+    ):
+        """
+        Loads a graph from a SQLite database. The rows are fetched by large batches straight into
+        arrays, see database.read_columns.
+
+        :param database: a sqlite3 connection or the path to the database.
+        :param nodes_query: query that returns the idx of each vertex and optionally its x and y.
+        :param edges_query: query that returns the idx of the ends of each edge and its weight.
+          If it is not given the graph is complete with the distances between the coordinates.
+        :param complete: if True the distances are the shortest paths on the edges,
+          see create_graph_from_edges.
+        """
+        columns = read_columns(database, nodes_query)
+        if len(columns) not in (1, 3):
+            raise ValueError("The nodes query has to return idx or idx, x and y")
+        ids = columns[0]
+        if len(columns) == 3:
+            coordinates = np.column_stack(columns[1:]).astype(np.float64)
+        else:
+            coordinates = np.zeros((len(ids), 2))
+        self.data = None
+        self._create_vertices(ids, coordinates.reshape(-1, 2))
+
+        if edges_query is None:
+            self._create_distances(coordinates.reshape(-1, 2))
+            return
+
+        columns = read_columns(database, edges_query)
+        if len(columns) != 3:
+            raise ValueError("The edges query has to return n1, n2 and w")
+        self._create_sparse_edges(*columns, complete)
+
+    def save_tour_to_db(self, database, tour, table="tours", name=None):
+        """
+        Writes a tour on a table of a SQLite database with one row for each vertex,
+        with the columns tour, position and idx. The table is created if it does not exist.
+
+        :param database: a sqlite3 connection or the path to the database.
+        :param tour: a Tour or a list of vertices, like the solution of the solvers.
+        :param table: the name of the table.
+        :param name: the value of the tour column, to tell apart the tours on the table.
+        """
+        if not isinstance(tour, Tour):
+            tour = Tour.from_path(self, tour)
+        ids = [vertex.idx for vertex in tour.to_path(self)]
+        write_rows(
+            database,
+            table,
+            ("tour", "position", "idx"),
+            ((name, position, idx) for position, idx in enumerate(ids)),
+        )
 
-    def create_minimum_spanning_tree(self):
-        # With Boruvka algorithm - kind of
+    def create_graph_from_schema(self, data, complete=False):
+        """
+        Loads a sparse graph from a list of records with the fields n1, n2 and w.
+        See create_graph_from_edges for the parameters.
+        """
+        self.vertices = list()
+        self._create_sparse_edges(*edge_columns(data), complete)
+
+    def create_minimum_spanning_tree(self, method="prim", k=10):
+        """
+        Replaces the edges of the graph with the ones of its minimum spanning tree.
+        See get_minimum_spanning_tree for the parameters.
+        """
+        parents = self.get_minimum_spanning_tree(method, k)
         self._clean_edges()
-        completed = False
-        # First iteration
-        for vertex in self.vertices:
-            rest = {
-                other: self.calculate_cost(vertex, other)
-                for other in self.vertices
-                if other != vertex
-            }
-
-            nearest = min(rest, key=rest.get)
-
-            self.edges.append(
-                Edge(
-                    {
-                        "origin": vertex,
-                        "destination": nearest,
-                        "cost": rest[nearest],
-                    }
+        for position, parent in enumerate(parents.tolist()):
+            if parent != -1:
+                self.add_edge(
+                    self.vertices[parent],
+                    self.vertices[position],
+                    self.distances.cost(parent, position),
                 )
-            )
-            self.edges_collection[(vertex.idx, nearest.idx)] = self.edges[-1]
-
-        self._calculate_first_components()
-
-        if len(self.components_groups) == 1:
-            completed = True
-
-        while not completed:
-            # Function to check if we have only one component to exit loop
-
-            for group1 in self.components_groups:
-                rest = {}
-                for group2 in self.components_groups:
-                    if group1 != group2:
-                        for origin in group1:
-                            for destination in group2:
-                                rest[origin, destination] = self.calculate_cost(
-                                    origin, destination
-                                )
 
-                nearest = min(rest, key=rest.get)
-
-                self.edges.append(
-                    Edge(
-                        {
-                            "origin": nearest[0],
-                            "destination": nearest[1],
-                            "cost": rest[nearest],
-                        }
-                    )
-                )
-
-                self.edges_collection[(nearest[0].idx, nearest[1].idx)] = self.edges[-1]
-
-                break
-
-            self._update_components()
-
-            if len(self.components_groups) == 1:
-                completed = True
-                self.plot_edges()
+    def get_minimum_spanning_tree(self, method="prim", k=10):
+        """
+        Calculates the minimum spanning tree of the graph.
+
+        :param method: with "prim" the tree is calculated on the full distances in O(n²).
+          With "kruskal" only the edges to the k nearest neighbours of each vertex are used,
+          which is much faster on geometric instances. The tree is the minimum one of those edges,
+          which with k = 10 is almost always the minimum of the graph. If those edges do not
+          connect the graph, k is doubled until they do.
+        :param k: the number of neighbours used by kruskal.
+        :return: array with the position of the parent of each vertex, -1 for the root.
+        """
+        if method not in ("prim", "kruskal"):
+            raise ValueError("The method has to be prim or kruskal")
+        name = "tree-prim" if method == "prim" else "tree-kruskal-{}".format(k)
+        cached = self._get_cached(name)
+        if cached is not None:
+            return cached["parents"]
+
+        parents = self._get_minimum_spanning_tree(method, k)
+        self._put_cached(name, parents=parents)
+        return parents
+
+    def _get_minimum_spanning_tree(self, method, k):
+        if method == "prim":
+            return prim(self.distances)
+
+        n = self.number_vertices
+        while True:
+            neighbors = self.get_neighbors(k)
+            origins = np.repeat(np.arange(n), neighbors.shape[1])
+            destinations = neighbors.ravel().astype(np.int64)
+            # Each edge is kept once
+            low = np.minimum(origins, destinations)
+            high = np.maximum(origins, destinations)
+            _, unique = np.unique(low * n + high, return_index=True)
+            origins, destinations = low[unique], high[unique]
+            costs = self.distances.batch(origins, destinations)
+            origins, destinations = kruskal(n, origins, destinations, costs)
+            if len(origins) == n - 1 or k >= n - 1:
+                return tree_parents(n, origins, destinations)
+            k *= 2
 
     def create_full_odd_graph(self):
         self._calculate_vertices_degrees()
         self._clean_edges()
-        self._subset_odd_vertices()
-        self._create_edges()
+        if self.distances is None:
+            self._subset_odd_vertices()
+            self._create_distances()
+        else:
+            odd = np.flatnonzero([vertex.is_odd() for vertex in self.vertices])
+            self._set_subset(self, odd)
+            if self.parent_positions is not None:
+                self.parent_positions = self.parent_positions[odd]
+
+    def subgraph(self, indices):
+        """
+        Returns a view of the graph with only the given vertices. It shares the vertices and the
+        distance storage of this graph, the distances are accessed remapping the positions,
+        so nothing is copied but the coordinates of the subset.
+        The vertex at position i of the subgraph is the one at position indices[i] of the graph,
+        which is kept in parent_positions.
+
+        :param indices: array with the positions of the vertices of the subgraph.
+        :return: the subgraph, a Graph.
+        """
+        if self.distances is None:
+            raise ValueError("Only a graph with distances can have subgraphs")
+        graph = Graph(self.storage, self.cache_size, self.dtype, self.disk_cache)
+        graph.data = self.data
+        graph.metric = self.metric
+        graph._set_subset(self, indices)
+        graph.parent = self
+        graph.parent_positions = np.asarray(indices, dtype=np.int64)
+        return graph
+
+    def create_minimum_weight_perfect_matching(self, method="blossom", k=10, passes=3):
+        """
+        Replaces the edges of the graph with the ones of a minimum weight perfect matching
+        of its vertices. See get_minimum_weight_perfect_matching for the parameters.
+        """
+        origins, destinations = self.get_minimum_weight_perfect_matching(
+            None, method, k, passes
+        )
+        self._clean_edges()
+        for origin, destination in zip(origins.tolist(), destinations.tolist()):
+            self.add_edge(
+                self.vertices[origin],
+                self.vertices[destination],
+                self.distances.cost(origin, destination),
+            )
 
-    def create_minimum_weight_perfect_matching(self):
-        pass
+    def get_minimum_weight_perfect_matching(
+        self, positions=None, method="blossom", k=10, passes=3
+    ):
+        """
+        Calculates a minimum weight perfect matching of the given vertices.
+        With "exact" it is searched on all the edges between them, which takes O(n^3).
+        The other methods search it on the edges to the k nearest of the other given vertices,
+        which on geometric instances almost always contain the minimum one, but the matching
+        is not guaranteed to be the minimum.
+
+        :param positions: array with the positions of the vertices, an even number of them.
+          By default all the vertices of the graph.
+        :param method: with "exact" the matching is the minimum one of all the edges.
+          With "blossom" the matching is the minimum one of the candidate edges, and the few
+          vertices that can not be matched with them are matched using all the edges between them.
+          With "greedy" the edges are matched by increasing cost, again with the neighbours
+          among the vertices left until all of them are matched, and then improved with passes
+          of 2-opt moves. It is much faster on large instances but the matching is a bit worse.
+        :param k: the number of neighbours of each vertex used as candidate edges.
+        :param passes: the maximum number of improvement passes of the greedy method.
+        :return: a tuple with the positions of the origins and destinations of the matched edges.
+        """
+        if method not in MATCHING_METHODS:
+            raise ValueError(
+                "The method has to be one of {}".format(", ".join(MATCHING_METHODS))
+            )
+        if positions is None:
+            positions = np.arange(self.number_vertices)
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) % 2:
+            raise ValueError("A perfect matching needs an even number of vertices")
+
+        number = len(positions)
+        mate = np.full(number, -1, dtype=np.int64)
+        free = np.arange(number)
+        candidates = None
+        while len(free):
+            if method == "exact" or (method == "blossom" and candidates is not None):
+                size = len(free) - 1
+            else:
+                size = k
+            neighbors = subset_neighbors(
+                self.distances, positions[free], size, self.coordinates, self.metric
+            )
+            if candidates is None:
+                candidates = neighbors
+            origins = np.repeat(np.arange(len(free)), neighbors.shape[1])
+            destinations = neighbors.ravel().astype(np.int64)
+            matched = self._match(positions[free], origins, destinations, method)
+            mate[free[matched >= 0]] = free[matched[matched >= 0]]
+            free = free[matched < 0]
+
+        if method == "greedy" and number > 2:
+            improve_matching(
+                mate,
+                candidates,
+                lambda origins, destinations: self.distances.batch(
+                    positions[origins], positions[destinations]
+                ),
+                passes,
+            )
+        chosen = np.flatnonzero(np.arange(number) < mate)
+        return positions[chosen], positions[mate[chosen]]
+
+    def get_neighbors(self, k=10, quadrant=False):
+        """
+        Returns the candidate neighbours of each vertex as an array of shape (n, k) with the
+        positions of the k nearest vertices sorted by distance. They are calculated once and reused
+        for any smaller k.
+
+        :param k: number of neighbours of each vertex.
+        :param quadrant: if True the neighbours are taken evenly from the four quadrants around
+          each vertex, which is better on clustered instances.
+        """
+        k = min(k, self.number_vertices - 1)
+        if quadrant:
+            if self.quadrant_neighbors is None or self.quadrant_neighbors.shape[1] != k:
+                name = "quadrant-neighbors-{}".format(k)
+                cached = self._get_cached(name)
+                if cached is not None:
+                    self.quadrant_neighbors = cached["neighbors"]
+                else:
+                    self.quadrant_neighbors = quadrant_neighbors(
+                        self.distances, k, self.coordinates, self.metric
+                    )
+                    self._put_cached(name, neighbors=self.quadrant_neighbors)
+            return self.quadrant_neighbors
+
+        if self.neighbors is None or self.neighbors.shape[1] < k:
+            cached = self._get_cached("neighbors")
+            if cached is not None and cached["neighbors"].shape[1] >= k:
+                self.neighbors = cached["neighbors"]
+            else:
+                self.neighbors = nearest_neighbors(
+                    self.distances, k, self.coordinates, self.metric
+                )
+                self._put_cached("neighbors", neighbors=self.neighbors)
+        return self.neighbors[:, :k]
+
+    def fingerprint(self):
+        """
+        Returns a hash of the data that defines the distances of the graph: the metric,
+        the ids and coordinates of the vertices, the dtype of the distances, which sets their
+        rounding, and the distances themselves when they are given explicitly or by edges.
+        It is the key of the graph on the disk cache.
+        """
+        if self._fingerprint is None:
+            if self.coordinates is None:
+                raise ValueError("The graph does not have vertices")
+            weights = None
+            if self.distances is None and self.sparse_edges is not None:
+                weights = np.concatenate(
+                    (
+                        self.sparse_edges.indptr,
+                        self.sparse_edges.indices,
+                        self.sparse_edges.weights,
+                    )
+                )
+            elif self.metric == "EXPLICIT":
+                weights = self.distances.to_matrix()
+            self._fingerprint = content_hash(
+                self.metric,
+                [vertex.idx for vertex in self.vertices],
+                self.coordinates,
+                weights,
+                self.dtype,
+            )
+        return self._fingerprint
+
+    def get_best_tour(self, solver, config=None):
+        """
+        Returns the best tour stored on the disk cache for a solver with a configuration.
+
+        :param solver: the name of the solver.
+        :param config: dict with the configuration of the solver.
+        :return: a tuple with the Tour and its cost, or None if there is no tour.
+        """
+        if self.disk_cache is None:
+            return None
+        stored = self.disk_cache.get_tour(self.fingerprint(), solver, config)
+        if stored is None:
+            return None
+        return Tour(stored[0]), stored[1]
+
+    def save_best_tour(self, solver, config, tour, cost):
+        """
+        Stores a tour on the disk cache if it is better than the stored one for the solver
+        with the configuration.
+
+        :param solver: the name of the solver.
+        :param config: dict with the configuration of the solver.
+        :param tour: a Tour or a list of vertices, like the solution of the solvers.
+        :param cost: the cost of the tour.
+        :return: True if the tour is stored.
+        """
+        if self.disk_cache is None:
+            raise ValueError("The graph does not have a disk cache")
+        if not isinstance(tour, Tour):
+            tour = Tour.from_path(self, tour)
+        return self.disk_cache.put_tour(
+            self.fingerprint(), solver, config, tour.order, cost
+        )
+
+    def get_spatial_index(self):
+        """
+        Returns the grid spatial index of the vertices, or None if the metric is not planar.
+        The index is shared, so it has to be copied before removing vertices from it.
+        """
+        if self.spatial_index is None and self.metric in PLANAR_METRICS:
+            self.spatial_index = GridIndex(self.coordinates, self.metric)
+        return self.spatial_index
 
     def get_random_paths(self, number):
         random_paths = []
@@ -310,14 +827,52 @@ class Graph:
         return random_paths
 
     def get_solution_cost(self, path):
-        total_cost = 0
-        for i in range(self.number_vertices - 1):
-            total_cost += self.edges_collection[(path[i].idx, path[i + 1].idx)].cost
+        if self.distances is None:
+            total_cost = 0
+            for i in range(len(path) - 1):
+                total_cost += self.edges_collection[(path[i].idx, path[i + 1].idx)].cost
+
+            total_cost += self.edges_collection[(path[-1].idx, path[0].idx)].cost
+            return total_cost
+
+        return self.get_tour_costs(self.get_positions(path))
 
-        total_cost += self.edges_collection[
-            (path[self.number_vertices - 1].idx, path[0].idx)
-        ].cost
-        return total_cost
+    def get_cost(self, path):
+        return self.get_solution_cost(path)
+
+    def get_tour_costs(self, tours):
+        """
+        Returns the cost of closed tours given by the positions of their vertices.
+        All the costs are gathered from the distances at once.
+
+        :param tours: array of shape (n,) with one tour or of shape (m, n) with m tours.
+        :return: the cost of the tour, or an array with the cost of each tour.
+        """
+        tours = np.asarray(tours, dtype=np.intp)
+        if self.distances is None:
+            costs = [
+                self.get_solution_cost([self.vertices[position] for position in tour])
+                for tour in np.atleast_2d(tours).tolist()
+            ]
+            return costs[0] if tours.ndim == 1 else np.array(costs)
+
+        # The costs are added sequentially in the order of the tour, so the result
+        # does not depend on the way the costs are stored or on the number of tours
+        if tours.ndim == 1:
+            return sum(self.distances.batch(tours, np.roll(tours, -1)).tolist())
+        columns = np.ascontiguousarray(tours.T)
+        costs = self.distances.batch(columns, np.roll(columns, -1, axis=0))
+        return np.add.reduce(np.ascontiguousarray(costs), axis=0)
+
+    def get_positions(self, path):
+        """
+        Returns the positions on the distance storage of the vertices of the given path
+        """
+        return np.fromiter(
+            (self.vertices_position[vertex.idx] for vertex in path),
+            dtype=np.intp,
+            count=len(path),
+        )
 
     def update_pheromone(self, edge, pheromone):
         self.edges_collection[edge].pheromone = pheromone
@@ -338,6 +893,78 @@ class Graph:
                 f,
             )
 
+    def save_graph_to_binary(self, path, distances=True):
+        """
+        Saves the graph on a binary file that can be memory mapped when loaded.
+
+        :param path: the path to the file.
+        :param distances: if True and the distances are stored, they are saved as well
+          so they do not have to be calculated again when the graph is loaded.
+          They are saved with the dtype and layout of their storage, so the packed distances
+          are saved packed. The neighbours that have been calculated are always saved.
+        """
+        ids = np.array([vertex.idx for vertex in self.vertices], dtype=np.int64)
+        arrays = {"ids": ids, "coordinates": self.coordinates}
+        layout = None
+        if self.metric == "EXPLICIT" or (distances and self.storage != "lazy"):
+            if isinstance(self.distances, PackedDistances):
+                arrays["distances"], layout = self.distances.values, "packed"
+            elif isinstance(self.distances, DenseDistances):
+                arrays["distances"], layout = self.distances.matrix, "dense"
+            else:
+                arrays["distances"], layout = self.distances.to_matrix(), "dense"
+        if self.neighbors is not None:
+            arrays["neighbors"] = self.neighbors
+        if self.quadrant_neighbors is not None:
+            arrays["quadrant_neighbors"] = self.quadrant_neighbors
+
+        metadata = {
+            "number_vertices": self.number_vertices,
+            "metric": self.metric,
+            "hash": content_hash(
+                self.metric,
+                ids,
+                self.coordinates,
+                arrays["distances"] if self.metric == "EXPLICIT" else None,
+            ),
+        }
+        if layout is not None:
+            metadata["layout"] = layout
+            metadata["dtype"] = arrays["distances"].dtype.str
+        write_binary(path, arrays, metadata)
+
+    def get_edge_cost(self, i, j):
+        if self.distances is None and self.sparse_edges is not None:
+            try:
+                return self.sparse_edges.cost(
+                    self.vertices_position[i], self.vertices_position[j]
+                )
+            except KeyError:
+                return 0
+
+        if self.distances is None:
+            try:
+                return self.edges_collection[(i, j)].cost
+            except KeyError:
+                return 0
+
+        try:
+            return self.distances.cost(
+                self.vertices_position[i], self.vertices_position[j]
+            )
+        except KeyError:
+            return 0
+
+    def get_distance_matrix(self):
+        if self.distances is not None:
+            return self.distances.to_matrix()
+
+        distance_matrix = np.zeros((len(self.vertices), len(self.vertices)))
+        for i, origin in enumerate(self.vertices):
+            for j, destination in enumerate(self.vertices):
+                distance_matrix[i, j] = self.get_edge_cost(origin.idx, destination.idx)
+        return distance_matrix
+
     def plot(self):
         x_coord = [vertex.x for vertex in self.vertices]
         y_coord = [vertex.y for vertex in self.vertices]
@@ -372,10 +999,27 @@ class Graph:
             )
         plt.close()
 
-        if pheromones:
+        if isinstance(pheromones, np.ndarray):
+            # Matrix of pheromone by position, like the one of the ant colony
+            origins, destinations = np.nonzero(pheromones > pheromones.min())
+            values = pheromones[origins, destinations]
+            alphas = (values - values.min()) * 0.4 / max(np.ptp(values), 1e-12)
+            for origin, destination, alpha in zip(
+                origins.tolist(), destinations.tolist(), alphas.tolist()
+            ):
+                plt.plot(
+                    [self.vertices[origin].x, self.vertices[destination].x],
+                    [self.vertices[origin].y, self.vertices[destination].y],
+                    c="#FF0000",
+                    alpha=alpha,
+                    linewidth=3,
+                )
+
+        elif pheromones:
+            edges = list(self.edges_collection.values())
             min_pheromone = 100
             max_pheromone = 0
-            for index, edge in enumerate(self.edges):
+            for index, edge in enumerate(edges):
                 if min_pheromone > edge.pheromone:
                     min_pheromone = edge.pheromone
 
@@ -387,17 +1031,17 @@ class Graph:
                 + (edge.pheromone - min_pheromone)
                 * 0.4
                 / (max_pheromone - min_pheromone)
-                for index, edge in enumerate(self.edges)
+                for index, edge in enumerate(edges)
             }
 
             for i in pheromone_dict:
                 x_values = [
-                    self.edges[i].origin.x,
-                    self.edges[i].destination.x,
+                    edges[i].origin.x,
+                    edges[i].destination.x,
                 ]
                 y_values = [
-                    self.edges[i].origin.y,
-                    self.edges[i].destination.y,
+                    edges[i].origin.y,
+                    edges[i].destination.y,
                 ]
                 plt.plot(
                     x_values,
@@ -428,220 +1072,204 @@ class Graph:
         plt.title(title)
         plt.savefig(filename)
 
-    def random_complete_graph(self, size):
-        self.number_vertices = size
-
-        for i in range(self.number_vertices):
-            new = True
-            while new:
-                temp = {
-                    "idx": i,
-                    "x": random.randint(0, self.number_vertices * 2),
-                    "y": random.randint(0, self.number_vertices * 2),
-                }
-                temp_vertex = Vertex(temp)
-                repeat = False
-                for vertex in self.vertices:
-                    if vertex == temp_vertex:
-                        repeat = True
-
-                if not repeat:
-                    new = False
-            self.vertices.append(temp_vertex)
-            self.vertices_collection[temp_vertex.idx] = temp_vertex
-
-        for i in self.vertices:
-            for j in self.vertices:
-                if i < j:
-                    cost = self.calculate_cost(i, j)
-                    self.add_edge(i, j, cost)
-                    self.add_edge(j, i, cost)
-
-    def create_graph_from_json(self, path: str):
-        # TODO: add json schema validation here of kwargs so if data is passed no need to execute another method
-        with open(path) as f:
-            self.data = json.load(f)
-        self.number_vertices = len(self.data.get("vertices"))
-        self.vertices = [Vertex(vertex) for vertex in self.data.get("vertices")]
-        self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
-
-        edges = self.data.get("edges", None)
-        if edges is None:
-            for i in self.vertices:
-                for j in self.vertices:
-                    if i < j:
-                        cost = self.calculate_cost(i, j)
-                        self.add_edge(i, j, cost)
-                        self.add_edge(j, i, cost)
-
-        else:
-            # TODO: implement if the json has edges
-            pass
-
-    def create_graph_from_db(self):
-        pass
+    def _calculate_vertices_degrees(self):
+        """
+        Sets the degree of each vertex counting each edge once, whatever its direction
+        """
+        positions = {
+            vertex.idx: position for position, vertex in enumerate(self.vertices)
+        }
+        ends = np.array(
+            [
+                (positions[edge.origin.idx], positions[edge.destination.idx])
+                for edge in self.edges
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        ends = np.unique(np.sort(ends, axis=1), axis=0)
+        degrees = np.bincount(ends.ravel(), minlength=len(self.vertices))
+        for vertex, degree in zip(self.vertices, degrees.tolist()):
+            vertex.degree = degree
+
+    def _match(self, positions, origins, destinations, method):
+        """
+        Returns the mate of each of the given vertices on the matching of the edges between them,
+        given by indices on positions. Each edge is kept once
+        """
+        number = len(positions)
+        low = np.minimum(origins, destinations)
+        high = np.maximum(origins, destinations)
+        _, unique = np.unique(low * number + high, return_index=True)
+        low, high = low[unique], high[unique]
+        costs = self.distances.batch(positions[low], positions[high])
+        if method == "greedy":
+            return greedy_matching(number, low, high, costs)
+        return minimum_weight_perfect_matching(number, low, high, costs)
 
-    def create_graph_from_tsp(self, path: str):
-        with open(path) as f:
-            text = f.read()
-            _, nodes = text.split("NODE_COORD_SECTION")
-            nodes = nodes.split("\n")
-            nodes = nodes[1:-1]
-            nodes = [node.split(" ") for node in nodes]
+    def _clean_edges(self):
+        self.edges = list()
+        self.edges_collection = dict()
 
-        self.number_vertices = len(nodes)
-        print(nodes)
+    def _subset_odd_vertices(self):
+        self.vertices = [vertex for vertex in self.vertices if vertex.is_odd()]
+        self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
 
+    def _set_subset(self, graph, indices):
+        """
+        Sets the vertices and the distances of this graph to a subset of the ones of the given graph
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        vertices = [graph.vertices[position] for position in indices.tolist()]
+        coordinates = graph.coordinates[indices]
+        distances = SubsetDistances(graph.distances, indices)
+
+        self.vertices = vertices
+        self.vertices_collection = {vertex.idx: vertex for vertex in vertices}
+        self.vertices_position = {
+            vertex.idx: position for position, vertex in enumerate(vertices)
+        }
+        self.number_vertices = len(vertices)
+        self.coordinates = coordinates
+        self.distances = distances
+        self._fingerprint = None
+        self.neighbors = None
+        self.quadrant_neighbors = None
+        self.spatial_index = None
+        self.edges_collection = None
+
+    def _create_vertices(self, ids, coordinates):
         self.vertices = [
-            Vertex({"idx": int(node[0]), "x": float(node[1]), "y": float(node[2])})
-            for node in nodes
+            Vertex({"idx": idx, "x": x, "y": y})
+            for idx, (x, y) in zip(ids.tolist(), coordinates.tolist())
         ]
-
         self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
 
-        for i in self.vertices:
-            for j in self.vertices:
-                if i < j:
-                    cost = self.calculate_cost(i, j)
-                    self.add_edge(i, j, cost)
-                    self.add_edge(j, i, cost)
-
-    def get_random_paths(self, size):
-        random_paths = []
-
-        for i in range(size):
-            random_list = random.sample(self.vertices, len(self.vertices))
-            random_paths.append(random_list)
-
-        return random_paths
-
-    def get_cost(self, path):
-        total_cost = 0
-        for i in range(self.number_vertices - 1):
-            total_cost += self.edges_collection[(path[i].idx, path[i + 1].idx)].cost
-
-        total_cost += self.edges_collection[
-            (path[self.number_vertices - 1].idx, path[0].idx)
-        ].cost
-        return total_cost
-
-    def update_pheromone(self, edge, pheromone):
-        self.edges_collection[edge].pheromone = pheromone
-
-    def save_graph_to_json(self, path):
-        with open(path, "w") as f:
-            json.dump(
-                {
-                    "vertices": [
-                        {
-                            key: value
-                            for key, value in vertex.__dict__.items()
-                            if key in vertex.attributes_to_dict
-                        }
-                        for vertex in self.vertices
-                    ]
-                },
-                f,
-            )
-
-    def get_edge_cost(self, i, j):
-        try:
-            return self.edges_collection[(i, j)].cost
-        except KeyError:
-            return 0
-
-    def get_distance_matrix(self):
-        distance_matrix = []
-        for i in self.vertices:
-            row = []
-            for j in self.vertices:
-                row.append(self.get_edge_cost(i.idx, j.idx))
-            distance_matrix.append(row)
-        return distance_matrix
-
-    def _add_edge(self, vertex_1, vertex_2, cost=0.0, check=False):
-        edge = Edge({"origin": vertex_1, "destination": vertex_2})
-        if check:
-            for created_edge in self.edges:
-                if edge == created_edge:
-                    return False
-
-        edge.set_cost(cost)
-        self.edges_collection[(vertex_1.idx, vertex_2.idx)] = edge
-        self.edges.append(edge)
-
-    def _calculate_vertices_degrees(self):
-        # TODO: implement function that either calculates the degrees of all vertices or a given one
-        temp_count = {k: 0 for k in self.vertices}
-        counted = list()
-        for edge in self.edges:
-            if (edge.origin, edge.destination) in counted:
-                continue
-            temp_count[edge.origin] += 1
-            temp_count[edge.destination] += 1
-            counted.append((edge.destination, edge.origin))
-
-        for key, value in temp_count.items():
-            key.degree = value
-
-    def _calculate_first_components(self):
-        # TODO: review as it is not working properly.
-        self.components_groups = list()
-        for edge in self.edges:
-            in_group = False
-            if not self.components_groups:
-                self.components_groups.append([edge.origin, edge.destination])
-                continue
-
-            for component in self.components_groups:
-                if edge.origin in component or edge.destination in component:
-                    if edge.origin in component and edge.destination in component:
-                        in_group = True
-                        break
-
-                    elif edge.origin in component:
-                        component.append(edge.destination)
-                        in_group = True
-                        break
-
-                    elif edge.destination in component:
-                        component.append(edge.origin)
-                        in_group = True
-                        break
-
-            if not in_group:
-                self.components_groups.append([edge.origin, edge.destination])
-
-    def _update_components(self):
-        origin = self.edges[-1].origin
-        destination = self.edges[-1].destination
-
-        origin_component = [c for c in self.components_groups if origin in c][0]
-        destination_component = [c for c in self.components_groups if destination in c][
-            0
-        ]
-
-        self.components_groups.remove(origin_component)
-        self.components_groups.remove(destination_component)
+    def _create_sparse_edges(self, first, second, weights, complete=False):
+        """
+        Stores the edges given by the idx of their ends, as lists or arrays, in CSR form.
+        If the graph does not have vertices they are created from the ends of the edges,
+        sorted by idx. If complete is True the distances are the shortest paths on the edges.
+        """
+        if self.vertices:
+            # The ends are found by binary search on the sorted idx of the vertices
+            ids = np.array([vertex.idx for vertex in self.vertices])
+            order = np.argsort(ids, kind="stable")
+            ends = np.concatenate((first, second))
+            found = np.minimum(np.searchsorted(ids[order], ends), len(ids) - 1)
+            missing = ids[order][found] != ends
+            if missing.any():
+                raise ValueError(
+                    "The edge end {} is not a vertex".format(ends[missing][0])
+                )
+            ends = order[found]
+            origins, destinations = ends[: len(first)], ends[len(first) :]
+        else:
+            ids, ends = np.unique(np.concatenate((first, second)), return_inverse=True)
+            origins, destinations = ends[: len(first)], ends[len(first) :]
+            self._create_vertices(ids, np.zeros((len(ids), 2)))
+        self.number_vertices = len(self.vertices)
+        self.vertices_position = {
+            vertex.idx: position for position, vertex in enumerate(self.vertices)
+        }
 
-        final_component = list(origin_component) + list(
-            set(destination_component) - set(origin_component)
+        self.sparse_edges = SparseEdges.from_arrays(
+            self.number_vertices, origins, destinations, weights
         )
-
-        self.components_groups.append(final_component)
-
-    def _clean_edges(self):
+        self._fingerprint = None
         self.edges = list()
-        self.edges_collection = dict()
-
-    def _subset_odd_vertices(self):
-        self.vertices = [vertex for vertex in self.vertices if vertex.is_odd()]
-        self.vertices_collection = {vertex.idx: vertex for vertex in self.vertices}
+        if complete:
+            paths = self.sparse_edges.shortest_paths()
+            if np.isinf(paths).any():
+                raise ValueError("The edges do not connect all the vertices")
+            self.metric = "EXPLICIT"
+            self._create_distances(weights=paths)
+        else:
+            self.coordinates = np.array(
+                [(vertex.x, vertex.y) for vertex in self.vertices], dtype=np.float64
+            ).reshape(-1, 2)
+            self.distances = None
+            self.neighbors = None
+            self.quadrant_neighbors = None
+            self.spatial_index = None
+            self.edges_collection = None
+
+    def _create_distances(self, coordinates=None, weights=None, distances=None):
+        """
+        Stores the coordinates of the vertices as an array and creates the storage of the distances.
+        The edges are not created, they are served from the distances.
+
+        :param coordinates: the coordinates of the vertices, if not given they are taken from the vertices.
+        :param weights: the full matrix of distances when it is already known.
+        :param distances: the storage of the distances when it is already created.
+        """
+        self.number_vertices = len(self.vertices)
+        self.vertices_position = {
+            vertex.idx: position for position, vertex in enumerate(self.vertices)
+        }
+        if coordinates is None:
+            coordinates = np.array(
+                [(vertex.x, vertex.y) for vertex in self.vertices], dtype=np.float64
+            ).reshape(-1, 2)
+        self.coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        self._fingerprint = None
+
+        if self.metric == "EXPLICIT":
+            if weights is None:
+                raise ValueError("The distances of an EXPLICIT graph have to be given")
+            if self.storage == "lazy":
+                raise ValueError(
+                    "The lazy storage needs the distances to be calculated"
+                )
 
-    def _create_edges(self):
-        for i in self.vertices:
-            for j in self.vertices:
-                if i < j:
-                    cost = self.calculate_cost(i, j)
-                    self._add_edge(i, j, cost)
-                    self._add_edge(j, i, cost)
+        if distances is not None:
+            self.distances = distances
+        elif self.storage == "lazy":
+            self.distances = LazyDistances(
+                self.coordinates, self.cache_size, self.metric
+            )
+        elif weights is not None and self.storage == "packed":
+            self.distances = PackedDistances.from_matrix(weights, self.dtype)
+        elif weights is not None:
+            self.distances = DenseDistances(weights, self.dtype)
+        else:
+            self._create_coordinate_distances()
+        self.neighbors = None
+        self.quadrant_neighbors = None
+        self.spatial_index = None
+        self.edges_collection = None
+
+    def _create_coordinate_distances(self):
+        """
+        Creates the dense or packed storage of the distances between the coordinates,
+        which are read from the disk cache when they have been stored before
+        """
+        name = "distances-{}".format(self.storage)
+        cached = self._get_cached(name, mmap=True)
+        if cached is not None and self.storage == "packed":
+            self.distances = PackedDistances(cached["distances"], self.number_vertices)
+        elif cached is not None:
+            self.distances = DenseDistances(cached["distances"])
+        elif self.storage == "packed":
+            self.distances = PackedDistances.from_coordinates(
+                self.coordinates, self.metric, self.dtype
+            )
+            self._put_cached(name, distances=self.distances.values)
+        else:
+            self.distances = DenseDistances.from_coordinates(
+                self.coordinates, self.metric, self.dtype
+            )
+            self._put_cached(name, distances=self.distances.matrix)
+
+    def _get_cached(self, name, mmap=False):
+        """
+        Returns the arrays stored on the disk cache with the given name for this instance,
+        or None if there is no cache or they are not stored
+        """
+        if self.disk_cache is None:
+            return None
+        entry = self.disk_cache.get(self.fingerprint(), name, mmap=mmap)
+        return None if entry is None else entry[1]
+
+    def _put_cached(self, name, **arrays):
+        if self.disk_cache is not None:
+            self.disk_cache.put(self.fingerprint(), name, arrays)
@@ -0,0 +1,624 @@
+"""
+This file contains the matching algorithms used by Christofides.
+max_weight_matching is Edmonds blossom algorithm for general graphs, following the implementation
+of Joris van Rantwijk. The next dual update is found with heaps and it is applied lazily to the
+labeled blossoms, so the updates do not go through all the vertices. It works on integer weights,
+so the arithmetic on the dual variables is exact.
+"""
+
+# Import from libraries
+from heapq import heappop, heappush, heapreplace
+
+import numpy as np
+
+# The costs are converted to integers with this resolution before running the blossom algorithm
+COST_RESOLUTION = 2**20
+
+
+def minimum_weight_perfect_matching(number_vertices, origins, destinations, costs):
+    """
+    Calculates the matching with the maximum number of edges and the minimum cost among them.
+    If the edges have a perfect matching, that is the minimum weight perfect matching.
+
+    :param number_vertices: number of vertices.
+    :param origins: array with the origin of each edge.
+    :param destinations: array with the destination of each edge.
+    :param costs: array with the cost of each edge.
+    :return: array with the vertex matched to each vertex, or -1 if it is not matched.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if len(costs) == 0:
+        return np.full(number_vertices, -1, dtype=np.int64)
+    # Maximizing the weight among the matchings of maximum cardinality minimizes the cost
+    scale = COST_RESOLUTION / max(1.0, float(costs.max()))
+    weights = np.rint((costs.max() - costs) * scale).astype(np.int64) + 1
+    edges = list(zip(origins.tolist(), destinations.tolist(), weights.tolist()))
+    mate = max_weight_matching(
+        edges, max_cardinality=True, number_vertices=number_vertices, perfect=True
+    )
+    return np.array(mate, dtype=np.int64)
+
+
+def max_weight_matching(
+    edges, max_cardinality=False, number_vertices=None, perfect=False
+):
+    """
+    Calculates a maximum weight matching of a general graph.
+
+    :param edges: list of tuples (i, j, weight) with integer weights and i != j.
+    :param max_cardinality: if True only the matchings with the maximum number of edges
+      are considered.
+    :param number_vertices: number of vertices, by default the highest vertex of the edges + 1.
+    :param perfect: if True the matching starts from a greedy one and each stage grows the tree
+      of a single free vertex, which is much faster on large sparse graphs. The weight is only
+      guaranteed to be the maximum if the resulting matching is perfect. It needs max_cardinality.
+    :return: list with the vertex matched to each vertex, or -1 if it is not matched.
+    """
+    if number_vertices is None:
+        number_vertices = 1 + max([max(i, j) for i, j, _ in edges], default=-1)
+    n = number_vertices
+    if not edges:
+        return [-1] * n
+
+    number_edges = len(edges)
+    twice_weights = [2 * weight for _, _, weight in edges]
+    max_weight = max(0, max(weight for _, _, weight in edges))
+
+    # The endpoints 2k and 2k + 1 of the edge k are its first and second vertex
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * number_edges)]
+    # The endpoints of the edges of each vertex, pointing to the other vertex
+    neighbor_ends = [[] for _ in range(n)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbor_ends[i].append(2 * k + 1)
+        neighbor_ends[j].append(2 * k)
+
+    # The endpoint of the matched edge of each vertex, or -1
+    mate = [-1] * n
+    # Label of each top level blossom: 0 free, 1 S-vertex, 2 T-vertex. 5 marks a breadcrumb
+    label = [0] * (2 * n)
+    # The endpoint through which the blossom got its label
+    label_end = [-1] * (2 * n)
+    # The top level blossom of each vertex
+    in_blossom = list(range(n))
+    blossom_parent = [-1] * (2 * n)
+    blossom_children = [None] * (2 * n)
+    blossom_base = list(range(n)) + [-1] * n
+    # The endpoints of the edges that connect the children of each blossom
+    blossom_ends = [None] * (2 * n)
+    # The vertices of each blossom, which do not change while it exists
+    leaves = [[v] for v in range(n)] + [None] * n
+    unused_blossoms = list(range(n, 2 * n))
+    dual = [max_weight] * n + [0] * n
+    allowed = [False] * number_edges
+    queue = []
+    # The top level blossoms labeled during the stage
+    labeled = []
+    # The duals of the labeled top level blossoms change together by the total of the updates,
+    # so each one keeps the total when it got its label and the change is only applied to its
+    # vertices when it stops being a top level blossom or the stage ends
+    total = 0
+    since = [0] * (2 * n)
+    # Heaps with the candidates of each kind of dual update, keyed so the keys do not change
+    # while the total grows: the edges from S-vertices to free vertices, the edges between
+    # S-blossoms and the T-blossoms
+    free_edges = []
+    inner_edges = []
+    t_blossoms = []
+    if perfect:
+        if not max_cardinality:
+            raise ValueError(
+                "A perfect matching can only be searched with max_cardinality"
+            )
+        _jump_start(endpoint, neighbor_ends, twice_weights, mate, dual)
+        roots = [v for v in range(n) if mate[v] == -1]
+
+    def pending(b):
+        # The change of the duals of the vertices of the top level blossom b not applied yet
+        if label[b] == 1:
+            return since[b] - total
+        if label[b] == 2:
+            return total - since[b]
+        return 0
+
+    def apply_pending(b):
+        change = pending(b)
+        if change:
+            for v in leaves[b]:
+                dual[v] += change
+            if b >= n:
+                dual[b] -= change
+        since[b] = total
+
+    def slack(k):
+        i, j, weight = edges[k]
+        return (
+            dual[i]
+            + dual[j]
+            + pending(in_blossom[i])
+            + pending(in_blossom[j])
+            - 2 * weight
+        )
+
+    def assign_label(w, t, p):
+        # Labels the top level blossom of w with t, reached through the endpoint p
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        since[b] = total
+        labeled.append(b)
+        if t == 1:
+            queue.extend(leaves[b])
+        elif t == 2:
+            if b >= n:
+                heappush(t_blossoms, (dual[b] + total, b))
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        # Traces back from v and w to find a new blossom or an augmenting path
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & 4:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if label_end[b] == -1:
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        # Creates the blossom with the given base closed by the edge k
+        v, w, _ = edges[k]
+        bb = in_blossom[base]
+        bv = in_blossom[v]
+        bw = in_blossom[w]
+        b = unused_blossoms.pop()
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[bb] = b
+        blossom_children[b] = path = []
+        blossom_ends[b] = ends = []
+        while bv != bb:
+            blossom_parent[bv] = b
+            path.append(bv)
+            ends.append(label_end[bv])
+            v = endpoint[label_end[bv]]
+            bv = in_blossom[v]
+        path.append(bb)
+        path.reverse()
+        ends.reverse()
+        ends.append(2 * k)
+        while bw != bb:
+            blossom_parent[bw] = b
+            path.append(bw)
+            ends.append(label_end[bw] ^ 1)
+            w = endpoint[label_end[bw]]
+            bw = in_blossom[w]
+        for t in path:
+            apply_pending(t)
+        label[b] = 1
+        label_end[b] = label_end[bb]
+        since[b] = total
+        labeled.append(b)
+        dual[b] = 0
+        leaves[b] = [v for t in path for v in leaves[t]]
+        # The T-vertices become S-vertices, so their edges have to be scanned
+        for v in leaves[b]:
+            if label[in_blossom[v]] == 2:
+                queue.append(v)
+            in_blossom[v] = b
+
+    def expand_blossom(b, end_stage):
+        # Turns the children of the blossom into top level blossoms. At the end of a stage
+        # the children with zero dual are expanded too, with a list instead of recursion
+        nested = [b]
+        while nested:
+            expand_children(nested.pop(), end_stage, nested)
+
+    def expand_children(b, end_stage, nested):
+        apply_pending(b)
+        for s in blossom_children[b]:
+            blossom_parent[s] = -1
+            since[s] = total
+            if s < n:
+                in_blossom[s] = s
+            elif end_stage and dual[s] == 0:
+                nested.append(s)
+            else:
+                for v in leaves[s]:
+                    in_blossom[v] = s
+
+        if not end_stage and label[b] == 2:
+            labeled.extend(blossom_children[b])
+            # The children on the even path from the entry child to the base get labels
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                step = 1
+                trick = 0
+            else:
+                step = -1
+                trick = 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossom_ends[b][j - trick] ^ trick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowed[blossom_ends[b][j - trick] // 2] = True
+                j += step
+                p = blossom_ends[b][j - trick] ^ trick
+                allowed[p // 2] = True
+                j += step
+            bv = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            label_end[endpoint[p ^ 1]] = label_end[bv] = p
+            if bv >= n:
+                heappush(t_blossoms, (dual[bv] + total, bv))
+            j += step
+            while blossom_children[b][j] != entry_child:
+                bv = blossom_children[b][j]
+                if label[bv] == 1:
+                    j += step
+                    continue
+                for v in leaves[bv]:
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossom_base[bv]]]] = 0
+                    assign_label(v, 2, label_end[v])
+                j += step
+
+            # The edges from S-vertices to the children left free are candidates again
+            for s in blossom_children[b]:
+                if label[s] == 0:
+                    for v in leaves[s]:
+                        for p in neighbor_ends[v]:
+                            if label[in_blossom[endpoint[p]]] == 1:
+                                heappush(free_edges, (slack(p // 2) + total, p // 2))
+
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_ends[b] = None
+        blossom_base[b] = -1
+        leaves[b] = None
+        unused_blossoms.append(b)
+
+    def augment_blossom(b, v):
+        # Swaps the matched and unmatched edges of the blossom on the path from v to the base.
+        # The nested blossoms can be thousands of levels deep, so instead of recursion each
+        # call is a generator that yields the calls on its sub-blossoms
+        stack = [augment_steps(b, v)]
+        while stack:
+            call = next(stack[-1], None)
+            if call is None:
+                stack.pop()
+            else:
+                stack.append(augment_steps(*call))
+
+    def augment_steps(b, v):
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= n:
+            yield t, v
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            step = 1
+            trick = 0
+        else:
+            step = -1
+            trick = 1
+        while j != 0:
+            j += step
+            t = blossom_children[b][j]
+            p = blossom_ends[b][j - trick] ^ trick
+            if t >= n:
+                yield t, endpoint[p]
+            j += step
+            t = blossom_children[b][j]
+            if t >= n:
+                yield t, endpoint[p ^ 1]
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = blossom_children[b][i:] + blossom_children[b][:i]
+        blossom_ends[b] = blossom_ends[b][i:] + blossom_ends[b][:i]
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+
+    def augment_matching(k):
+        # Swaps the matched and unmatched edges of the augmenting path through the edge k
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = in_blossom[s]
+                if bs >= n:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if label_end[bs] == -1:
+                    break
+                t = endpoint[label_end[bs]]
+                bt = in_blossom[t]
+                s = endpoint[label_end[bt]]
+                j = endpoint[label_end[bt] ^ 1]
+                if bt >= n:
+                    augment_blossom(bt, j)
+                mate[j] = label_end[bt]
+                p = label_end[bt] ^ 1
+
+    # Each stage finds an augmenting path and increases the matching by one edge
+    while True:
+        if perfect:
+            # The free vertices without an augmenting path stay free for good
+            while roots and mate[roots[-1]] != -1:
+                roots.pop()
+            if not roots:
+                break
+        label[:] = [0] * (2 * n)
+        allowed[:] = [False] * number_edges
+        queue[:] = []
+        labeled[:] = []
+        free_edges[:] = []
+        inner_edges[:] = []
+        t_blossoms[:] = []
+        if perfect:
+            assign_label(roots.pop(), 1, -1)
+        else:
+            for v in range(n):
+                if mate[v] == -1 and label[in_blossom[v]] == 0:
+                    assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbor_ends[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allowed[k]:
+                        k_slack = slack(k)
+                        if k_slack <= 0:
+                            allowed[k] = True
+                    if allowed[k]:
+                        if (
+                            label[in_blossom[w]] == 0
+                            and mate[blossom_base[in_blossom[w]]] == -1
+                        ):
+                            # Out of the tree of the stage, so a new root that gives a path
+                            assign_label(w, 1, -1)
+                        if label[in_blossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[in_blossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == 1:
+                        heappush(inner_edges, (k_slack + 2 * total, k))
+                    elif label[w] == 0:
+                        heappush(free_edges, (k_slack + total, k))
+
+            if augmented:
+                break
+
+            # There is no augmenting path with the tight edges, the dual variables are updated
+            delta_type = -1
+            delta = delta_edge = delta_blossom = None
+            if not max_cardinality:
+                delta_type = 1
+                delta = min(dual[v] + pending(in_blossom[v]) for v in range(n))
+
+            # The stale candidates are dropped, or pushed again with their current slack
+            while free_edges:
+                key, k = free_edges[0]
+                i, j, _ = edges[k]
+                if sorted((label[in_blossom[i]], label[in_blossom[j]])) != [0, 1]:
+                    heappop(free_edges)
+                elif slack(k) != key - total:
+                    heapreplace(free_edges, (slack(k) + total, k))
+                else:
+                    if delta_type == -1 or key - total < delta:
+                        delta = key - total
+                        delta_type = 2
+                        delta_edge = k
+                    break
+            while inner_edges:
+                key, k = inner_edges[0]
+                i, j, _ = edges[k]
+                if (
+                    in_blossom[i] == in_blossom[j]
+                    or label[in_blossom[i]] != 1
+                    or label[in_blossom[j]] != 1
+                ):
+                    heappop(inner_edges)
+                else:
+                    if delta_type == -1 or (key - 2 * total) // 2 < delta:
+                        delta = (key - 2 * total) // 2
+                        delta_type = 3
+                        delta_edge = k
+                    break
+            while t_blossoms:
+                key, b = t_blossoms[0]
+                if (
+                    blossom_parent[b] != -1
+                    or label[b] != 2
+                    or key != dual[b] + since[b]
+                ):
+                    heappop(t_blossoms)
+                else:
+                    if delta_type == -1 or key - total < delta:
+                        delta = key - total
+                        delta_type = 4
+                        delta_blossom = b
+                    break
+            if delta_type == -1:
+                # Only with max_cardinality, there are no more augmenting paths
+                if perfect:
+                    break
+                delta_type = 1
+                delta = max(0, min(dual[v] + pending(in_blossom[v]) for v in range(n)))
+
+            total += delta
+
+            if delta_type == 1:
+                break
+            elif delta_type == 2:
+                heappop(free_edges)
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                if label[in_blossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                heappop(inner_edges)
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(i)
+            else:
+                expand_blossom(delta_blossom, False)
+
+        for b in set(labeled):
+            if blossom_parent[b] == -1:
+                apply_pending(b)
+        if not augmented and not perfect:
+            break
+
+        # The S-blossoms with a zero dual variable are expanded at the end of the stage
+        for b in set(labeled):
+            if b >= n and blossom_parent[b] == -1 and label[b] == 1 and dual[b] == 0:
+                expand_blossom(b, True)
+
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
+
+
+def _jump_start(endpoint, neighbor_ends, twice_weights, mate, dual):
+    """
+    Starts with a greedy matching of the edges that become tight when the dual variable of each
+    vertex is lowered as much as possible, improved with the augmenting paths of three tight edges.
+    The duals of the free vertices do not need to be equal when only the matchings of maximum
+    cardinality are considered, and as all of them start with the same value the slacks
+    keep being even.
+    """
+
+    def tight_ends(i):
+        return [
+            p
+            for p in neighbor_ends[i]
+            if dual[i] + dual[endpoint[p]] == twice_weights[p // 2]
+        ]
+
+    for i, ends in enumerate(neighbor_ends):
+        if mate[i] != -1 or not ends:
+            continue
+        dual[i] -= min(
+            dual[i] + dual[endpoint[p]] - twice_weights[p // 2] for p in ends
+        )
+        for p in tight_ends(i):
+            if mate[endpoint[p]] == -1:
+                mate[i] = p
+                mate[endpoint[p]] = p ^ 1
+                break
+
+    for i in range(len(mate)):
+        if mate[i] != -1:
+            continue
+        for p in tight_ends(i):
+            j = endpoint[p]
+            m = endpoint[mate[j]]
+            free = [
+                q for q in tight_ends(m) if mate[endpoint[q]] == -1 and endpoint[q] != i
+            ]
+            if free:
+                q = free[0]
+                mate[i], mate[j] = p, p ^ 1
+                mate[m], mate[endpoint[q]] = q, q ^ 1
+                break
+
+
+def greedy_matching(number_vertices, origins, destinations, costs):
+    """
+    Matches the edges by increasing cost when both of their vertices are still free.
+    It takes O(m log m), but the matching may be far from the minimum one.
+
+    :param number_vertices: number of vertices.
+    :param origins: array with the origin of each edge.
+    :param destinations: array with the destination of each edge.
+    :param costs: array with the cost of each edge.
+    :return: array with the vertex matched to each vertex, or -1 if it is not matched.
+    """
+    mate = [-1] * number_vertices
+    order = np.argsort(costs, kind="stable")
+    for origin, destination in zip(
+        origins[order].tolist(), destinations[order].tolist()
+    ):
+        if mate[origin] == -1 and mate[destination] == -1 and origin != destination:
+            mate[origin] = destination
+            mate[destination] = origin
+    return np.array(mate, dtype=np.int64)
+
+
+def improve_matching(mate, neighbors, batch, passes=3):
+    """
+    Improves a perfect matching with moves like the ones of 2-opt: the matched edges (a, b) and
+    (c, d), where c is a neighbour of a, are replaced by (a, c) and (b, d) or by (a, d) and (b, c)
+    when that is cheaper. All the moves are evaluated at once on each pass and the best ones
+    that do not share vertices are applied.
+
+    :param mate: array with the vertex matched to each vertex, it is modified in place.
+    :param neighbors: array of shape (n, k) with the candidate neighbours of each vertex.
+    :param batch: function that returns the costs of the edges given by two arrays of vertices.
+    :param passes: maximum number of passes, they stop before if there are no better moves.
+    :return: the number of moves applied.
+    """
+    n, k = neighbors.shape
+    a = np.repeat(np.arange(n), k)
+    c = neighbors.ravel().astype(np.int64)
+    moves = 0
+    for _ in range(passes):
+        b, d = mate[a], mate[c]
+        current = batch(a, b) + batch(c, d)
+        crossed = batch(a, c) + batch(b, d)
+        swapped = batch(a, d) + batch(b, c)
+        gains = current - np.minimum(crossed, swapped)
+        # The moves between the two vertices of the same edge do nothing
+        better = np.flatnonzero((gains > 1e-9 * current) & (c != b))
+        if len(better) == 0:
+            break
+
+        touched = bytearray(n)
+        order = better[np.argsort(-gains[better], kind="stable")]
+        for first, second, third, fourth, cross in zip(
+            a[order].tolist(),
+            b[order].tolist(),
+            c[order].tolist(),
+            d[order].tolist(),
+            (crossed[order] <= swapped[order]).tolist(),
+        ):
+            if touched[first] or touched[second] or touched[third] or touched[fourth]:
+                continue
+            touched[first] = touched[second] = touched[third] = touched[fourth] = 1
+            if not cross:
+                third, fourth = fourth, third
+            mate[first], mate[third] = third, first
+            mate[second], mate[fourth] = fourth, second
+            moves += 1
+    return moves
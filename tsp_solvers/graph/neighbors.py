@@ -0,0 +1,204 @@
+"""
+This file contains the functions used to calculate the candidate neighbours of each vertex.
+The neighbours are returned as an array of shape (n, k) with the positions of the k nearest
+vertices of each vertex, sorted by distance.
+"""
+
+# Import from libraries
+import numpy as np
+
+# Scipy is not a required requirement, it is only used to speed up the construction
+try:
+    from scipy.spatial import cKDTree
+except ModuleNotFoundError:
+    cKDTree = None
+
+# Import from internal modules
+from .spatial import PLANAR_METRICS, GridIndex
+
+# Maximum number of distances calculated at once when the neighbours are calculated by rows
+BLOCK_SIZE = 2**22
+# Number of nearest vertices, for each neighbour asked, among which the quadrant neighbours
+# are searched when the metric is planar
+QUADRANT_CANDIDATES = 5
+
+
+def nearest_neighbors(distances, k, coordinates=None, metric="EUCLIDEAN"):
+    """
+    Calculates the k nearest neighbours of each vertex.
+    For planar metrics a KD-tree is used when scipy is installed, which takes O(n log n),
+    or the grid spatial index when it is not. Otherwise the distances are scanned by blocks of rows.
+
+    :param distances: the distance storage of the graph.
+    :param k: number of neighbours of each vertex.
+    :param coordinates: the coordinates of the vertices.
+    :param metric: the metric of the distances.
+    :return: array of shape (n, k).
+    """
+    n = distances.number_vertices
+    k = min(k, n - 1)
+    if coordinates is not None and metric in PLANAR_METRICS:
+        if cKDTree is not None:
+            return _tree_neighbors(coordinates, k)
+        return _grid_neighbors(coordinates, k, metric)
+
+    neighbors = np.empty((n, k), dtype=np.int32)
+    step = max(1, BLOCK_SIZE // max(1, n))
+    for start in range(0, n, step):
+        block = np.arange(start, min(start + step, n))
+        rows = np.array(distances.rows(block), dtype=np.float64)
+        rows[np.arange(len(block)), block] = np.inf
+        neighbors[block] = _sorted_smallest(rows, k)
+    return neighbors
+
+
+def subset_neighbors(distances, positions, k, coordinates=None, metric="EUCLIDEAN"):
+    """
+    Calculates the k nearest neighbours of each of the given vertices among themselves.
+
+    :param distances: the distance storage of the graph.
+    :param positions: array with the positions of the vertices.
+    :param k: number of neighbours of each vertex.
+    :param coordinates: the coordinates of all the vertices of the graph.
+    :param metric: the metric of the distances.
+    :return: array of shape (len(positions), k) with indices on positions.
+    """
+    n = len(positions)
+    k = min(k, n - 1)
+    if coordinates is not None and metric in PLANAR_METRICS:
+        if cKDTree is not None:
+            return _tree_neighbors(coordinates[positions], k)
+        return _grid_neighbors(coordinates[positions], k, metric)
+
+    neighbors = np.empty((n, k), dtype=np.int32)
+    step = max(1, BLOCK_SIZE // max(1, distances.number_vertices))
+    for start in range(0, n, step):
+        block = np.arange(start, min(start + step, n))
+        rows = np.array(distances.rows(positions[block]), dtype=np.float64)
+        rows = rows[:, positions]
+        rows[np.arange(len(block)), block] = np.inf
+        neighbors[block] = _sorted_smallest(rows, k)
+    return neighbors
+
+
+def quadrant_neighbors(distances, k, coordinates, metric="EUCLIDEAN"):
+    """
+    Calculates k neighbours of each vertex taking the nearest k // 4 in each quadrant around it.
+    If a quadrant does not have enough vertices, the rest are taken from the nearest ones.
+    This keeps candidates in every direction on clustered instances.
+    For planar metrics the quadrants are only searched among the k * QUADRANT_CANDIDATES nearest
+    vertices, found with the KD-tree or the grid spatial index, so it takes O(n k log n)
+    and a quadrant that is empty within that radius is filled with the nearest vertices.
+    Otherwise the distances are scanned by blocks of rows, which takes O(n²).
+
+    :param distances: the distance storage of the graph.
+    :param k: number of neighbours of each vertex.
+    :param coordinates: the coordinates of the vertices.
+    :param metric: the metric of the distances.
+    :return: array of shape (n, k).
+    """
+    n = distances.number_vertices
+    k = min(k, n - 1)
+    neighbors = np.empty((n, k), dtype=np.int32)
+    if metric in PLANAR_METRICS:
+        size = min(n - 1, k * QUADRANT_CANDIDATES)
+        if cKDTree is not None:
+            candidates = _tree_neighbors(coordinates, size)
+        else:
+            candidates = _grid_neighbors(coordinates, size, metric)
+        step = max(1, BLOCK_SIZE // max(1, size))
+        for start in range(0, n, step):
+            block = np.arange(start, min(start + step, n))
+            columns = candidates[block].astype(np.int64)
+            rows = np.array(
+                distances.batch(block[:, np.newaxis], columns), dtype=np.float64
+            )
+            chosen = _quadrant_columns(rows, _quadrants(coordinates, block, columns), k)
+            neighbors[block] = np.take_along_axis(columns, chosen, axis=1)
+        return neighbors
+
+    step = max(1, BLOCK_SIZE // max(1, n))
+    for start in range(0, n, step):
+        block = np.arange(start, min(start + step, n))
+        rows = np.array(distances.rows(block), dtype=np.float64)
+        rows[np.arange(len(block)), block] = np.inf
+        columns = np.broadcast_to(np.arange(n), rows.shape)
+        neighbors[block] = _quadrant_columns(
+            rows, _quadrants(coordinates, block, columns), k
+        )
+    return neighbors
+
+
+def _quadrants(coordinates, block, columns):
+    """
+    Returns the quadrant, from 0 to 3, of each vertex of columns around the vertex of its row
+    """
+    dx = coordinates[columns, 0] - coordinates[block, np.newaxis, 0]
+    dy = coordinates[columns, 1] - coordinates[block, np.newaxis, 1]
+    return (dx < 0).astype(np.int8) * 2 + (dy < 0)
+
+
+def _quadrant_columns(rows, quadrants, k):
+    """
+    Returns the columns of the nearest k // 4 values of each quadrant of each row, completed
+    with the nearest other values up to k and sorted by value
+    """
+    per_quadrant = k // 4
+    selected = np.zeros(rows.shape, dtype=bool)
+    lines = np.arange(rows.shape[0])[:, np.newaxis]
+    for quadrant in range(4):
+        quadrant_rows = np.where(quadrants == quadrant, rows, np.inf)
+        nearest = _sorted_smallest(quadrant_rows, per_quadrant)
+        # The columns of an empty quadrant are arbitrary, so they must not unselect others
+        selected[lines, nearest] |= (
+            np.take_along_axis(quadrant_rows, nearest, axis=1) < np.inf
+        )
+
+    # The selected vertices are moved to the front and the rest are filled by distance
+    ordered = np.where(selected, -1.0, rows)
+    candidates = _sorted_smallest(ordered, k)
+    chosen = np.take_along_axis(rows, candidates, axis=1)
+    order = np.argsort(chosen, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def _sorted_smallest(rows, k):
+    """
+    Returns the columns of the k smallest values of each row sorted by value
+    """
+    if k == 0:
+        return np.empty((rows.shape[0], 0), dtype=np.int64)
+    if k < rows.shape[1]:
+        columns = np.argpartition(rows, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(rows.shape[1]), rows.shape)
+    values = np.take_along_axis(rows, columns, axis=1)
+    order = np.argsort(values, axis=1, kind="stable")
+    return np.take_along_axis(columns, order, axis=1)
+
+
+def _tree_neighbors(coordinates, k):
+    """
+    Queries a KD-tree for the k + 1 nearest points of each point and removes the point itself
+    """
+    n = coordinates.shape[0]
+    if k == 0:
+        return np.empty((n, 0), dtype=np.int32)
+    tree = cKDTree(coordinates)
+    _, columns = tree.query(coordinates, k + 1)
+    columns = columns.reshape(n, k + 1)
+    itself = columns == np.arange(n)[:, np.newaxis]
+    # With duplicated points the point itself may not be returned, the farthest one is dropped
+    itself[~itself.any(axis=1), -1] = True
+    return columns[~itself].reshape(n, k).astype(np.int32)
+
+
+def _grid_neighbors(coordinates, k, metric):
+    """
+    Queries the grid spatial index for the k nearest points of each point
+    """
+    index = GridIndex(coordinates, metric)
+    neighbors = np.empty((coordinates.shape[0], k), dtype=np.int32)
+    for position in range(coordinates.shape[0]):
+        neighbors[position] = index.nearest(position, k)
+    return neighbors
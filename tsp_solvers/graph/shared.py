@@ -0,0 +1,148 @@
+"""
+This file contains the class used to share the arrays of a graph between processes.
+The arrays are copied once into blocks of shared memory and the other processes attach
+to the blocks by name, so they use the same memory instead of a copy of the graph each.
+"""
+
+# Import from libraries
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+class SharedGraph:
+    """
+    Handle of the arrays of a graph published on shared memory.
+    When it is pickled, to be sent to another process, only the names of the blocks and
+    the shapes and dtypes of the arrays are sent, so its size does not depend on the graph.
+    The process that publishes the graph owns the blocks and has to unlink them when the
+    other processes are done, which is done at the end of a with statement.
+    """
+
+    def __init__(self, metadata, specification):
+        """
+        :param metadata: dict with the values needed to rebuild the graph.
+        :param specification: dict with the name of the block, the shape and the dtype
+          of each array.
+        """
+        self.metadata = metadata
+        self.specification = specification
+        self._blocks = dict()
+        self._owner = False
+
+    @classmethod
+    def publish(cls, metadata, arrays):
+        """
+        Copies the arrays into new blocks of shared memory.
+
+        :param metadata: dict with the values needed to rebuild the graph.
+        :param arrays: dict with the arrays to share.
+        :return: the SharedGraph that owns the blocks.
+        """
+        shared = cls(metadata, dict())
+        shared._owner = True
+        try:
+            for key, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                if array.dtype == object:
+                    raise ValueError("The array {} can not be shared".format(key))
+                # A block can not be empty
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                shared._blocks[key] = block
+                shared.specification[key] = (block.name, array.shape, array.dtype.str)
+                _view(block, array.shape, array.dtype)[...] = array
+        except Exception:
+            shared.unlink()
+            raise
+        return shared
+
+    def attach(self):
+        """
+        Returns the shared arrays, which are read-only views of the blocks.
+        The views hold an export of the buffer of their block, so the block can not be
+        closed while they are alive.
+
+        :return: dict with the arrays.
+        """
+        arrays = dict()
+        for key, (name, shape, dtype) in self.specification.items():
+            block = self._blocks.get(key)
+            if block is None:
+                block = _open_block(name)
+                self._blocks[key] = block
+            array = _view(block, shape, np.dtype(dtype))
+            array.flags.writeable = False
+            arrays[key] = array
+        return arrays
+
+    def close(self):
+        """
+        Closes the blocks on this process. The blocks that still have arrays using them are
+        kept open, so the arrays stay valid, and are closed by a later call.
+        """
+        blocks = dict()
+        for key, block in self._blocks.items():
+            try:
+                block.close()
+            except BufferError:
+                blocks[key] = block
+        self._blocks = blocks
+
+    def unlink(self):
+        """
+        Closes and frees the blocks. Only the process that published them can free them.
+        """
+        if not self._owner:
+            raise ValueError("Only the process that published the graph can unlink it")
+        for key, (name, _, _) in self.specification.items():
+            block = self._blocks.get(key)
+            if block is None:
+                # The block has already been closed on this process
+                block = _open_block(name)
+                self._blocks[key] = block
+            block.unlink()
+        self.close()
+        self._owner = False
+
+    @property
+    def nbytes(self):
+        return sum(
+            int(np.prod(shape)) * np.dtype(dtype).itemsize
+            for _, shape, dtype in self.specification.values()
+        )
+
+    def __getstate__(self):
+        return {"metadata": self.metadata, "specification": self.specification}
+
+    def __setstate__(self, state):
+        self.__init__(state["metadata"], state["specification"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+def _view(block, shape, dtype):
+    """
+    Returns the array of the given shape and dtype on the block. Unlike np.ndarray with
+    the buffer argument, np.frombuffer exports the buffer of the block, so closing the block
+    raises BufferError instead of unmapping the memory under the array
+    """
+    count = int(np.prod(shape))
+    return np.frombuffer(block.buf, dtype, count).reshape(shape)
+
+
+def _open_block(name):
+    """
+    Opens an existing block. From python 3.13 the block is not tracked, so the resource tracker
+    of a process that is not a child of the owner does not free it when that process ends
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
@@ -0,0 +1,88 @@
+"""
+This file contains the algorithms used to calculate minimum spanning trees.
+The trees are returned as an array with the parent of each vertex, by position,
+where the root has -1 as parent.
+"""
+
+# Import from libraries
+import numpy as np
+
+# Import from internal modules
+from .disjoint_set import DisjointSet
+
+
+def prim(distances, root=0):
+    """
+    Calculates the minimum spanning tree with Prim algorithm on the full distances.
+    Each step adds the nearest vertex to the tree and updates the distance of the rest
+    with one row of distances, so it takes O(n²) time and O(n) memory.
+
+    :param distances: the distance storage of the graph.
+    :param root: the position of the root of the tree.
+    :return: the array of parents.
+    """
+    n = distances.number_vertices
+    parents = np.full(n, -1, dtype=np.int64)
+    # Distance of each vertex to the tree, it is infinite once the vertex is on the tree
+    nearest = np.full(n, np.inf)
+    in_tree = np.zeros(n, dtype=bool)
+    current = root
+    for _ in range(n - 1):
+        in_tree[current] = True
+        row = distances.row(current)
+        better = (row < nearest) & ~in_tree
+        nearest[better] = row[better]
+        parents[better] = current
+        current = int(np.argmin(nearest))
+        nearest[current] = np.inf
+    return parents
+
+
+def kruskal(number_vertices, origins, destinations, costs):
+    """
+    Calculates the minimum spanning forest of the graph given by the edges with Kruskal algorithm.
+    On geometric instances the edges to the k nearest neighbours are enough to get the tree.
+
+    :param number_vertices: the number of vertices.
+    :param origins: the positions of the origins of the edges.
+    :param destinations: the positions of the destinations of the edges.
+    :param costs: the costs of the edges.
+    :return: a tuple with the origins and destinations of the edges of the forest.
+    """
+    components = DisjointSet(number_vertices)
+    chosen = []
+    order = np.argsort(costs, kind="stable")
+    for edge, origin, destination in zip(
+        order.tolist(), origins[order].tolist(), destinations[order].tolist()
+    ):
+        if components.union(origin, destination):
+            chosen.append(edge)
+            if components.count == 1:
+                break
+    chosen = np.array(chosen, dtype=np.int64)
+    return origins[chosen], destinations[chosen]
+
+
+def tree_parents(number_vertices, origins, destinations, root=0):
+    """
+    Returns the array of parents of the tree given by its edges
+    """
+    # Adjacency lists of the tree as an array sorted by vertex
+    ends = np.concatenate((origins, destinations))
+    others = np.concatenate((destinations, origins))
+    order = np.argsort(ends, kind="stable")
+    adjacent = others[order].tolist()
+    starts = np.searchsorted(ends[order], np.arange(number_vertices + 1)).tolist()
+
+    parents = np.full(number_vertices, -1, dtype=np.int64)
+    visited = np.zeros(number_vertices, dtype=bool)
+    visited[root] = True
+    stack = [root]
+    while stack:
+        vertex = stack.pop()
+        for other in adjacent[starts[vertex] : starts[vertex + 1]]:
+            if not visited[other]:
+                visited[other] = True
+                parents[other] = vertex
+                stack.append(other)
+    return parents
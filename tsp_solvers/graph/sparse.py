@@ -0,0 +1,214 @@
+"""
+This file contains the storage of the explicit edges of a sparse graph and the readers of edge lists.
+The edges are kept in compressed sparse row (CSR) form: the neighbours of the vertex at
+position i are indices[indptr[i]:indptr[i + 1]], sorted, and their weights are at the same places.
+The edge lists are records with the fields n1 and n2 for the ends of the edge and w for its weight,
+and they are read in one pass straight into columns.
+"""
+
+# Import from libraries
+import csv
+import heapq
+import json
+import os
+
+import numpy as np
+
+# Scipy is not a required requirement, it is only used to speed up the shortest paths
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+except ModuleNotFoundError:
+    csr_matrix = None
+
+EDGE_FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+}
+
+
+class SparseEdges:
+    """
+    Stores the edges of a graph by position of the vertices in CSR form.
+    Each undirected edge is stored once for each direction.
+    """
+
+    def __init__(self, indptr, indices, weights):
+        """
+        :param indptr: array of n + 1 values with the start of the edges of each vertex.
+        :param indices: array with the destination of each edge, sorted on each vertex.
+        :param weights: array with the weight of each edge.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.number_vertices = len(indptr) - 1
+        # The key of each edge is origin * n + destination, sorted on the whole array
+        self._keys = (
+            np.repeat(np.arange(self.number_vertices, dtype=np.int64), np.diff(indptr))
+            * self.number_vertices
+            + indices
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, number_vertices, origins, destinations, weights, symmetric=True
+    ):
+        """
+        Builds the storage from the columns of the edges. The loops are dropped and
+        when an edge is repeated the minimum weight is kept.
+
+        :param number_vertices: the number of vertices.
+        :param origins: array with the position of the origin of each edge.
+        :param destinations: array with the position of the destination of each edge.
+        :param weights: array with the weight of each edge.
+        :param symmetric: if True each edge can be travelled in both directions.
+        :return: a SparseEdges.
+        """
+        origins = np.asarray(origins, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if np.any(weights < 0):
+            raise ValueError("The weights of the edges can not be negative")
+        if symmetric:
+            origins, destinations = (
+                np.concatenate((origins, destinations)),
+                np.concatenate((destinations, origins)),
+            )
+            weights = np.concatenate((weights, weights))
+
+        keep = origins != destinations
+        keys = origins[keep] * number_vertices + destinations[keep]
+        weights = weights[keep]
+        order = np.argsort(keys, kind="stable")
+        keys, weights = keys[order], weights[order]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        keys = keys[starts]
+        weights = np.minimum.reduceat(weights, starts) if len(starts) else weights
+        origins, destinations = keys // number_vertices, keys % number_vertices
+
+        indptr = np.zeros(number_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origins, minlength=number_vertices), out=indptr[1:])
+        return cls(indptr, destinations, weights)
+
+    @property
+    def number_edges(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    def neighbors(self, i):
+        """
+        Returns the destinations of the edges of the vertex i and their weights
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def cost(self, i, j):
+        return self.batch(i, j).item()
+
+    def batch(self, origins, destinations):
+        """
+        Returns the weights of the given edges, infinite for the ones that do not exist
+        """
+        keys = np.asarray(origins, dtype=np.int64) * self.number_vertices + destinations
+        if len(self._keys) == 0:
+            return np.full(keys.shape, np.inf)
+        found = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[found] == keys, self.weights[found], np.inf)
+
+    def edges(self):
+        """
+        Returns the origins, destinations and weights of all the edges
+        """
+        return self._keys // self.number_vertices, self.indices, self.weights
+
+    def shortest_paths(self):
+        """
+        Calculates the length of the shortest path between every pair of vertices, which is the
+        metric closure of the graph. It uses scipy when it is installed and otherwise runs
+        Dijkstra algorithm from each vertex with a binary heap, in O(n m log n).
+
+        :return: array of shape (n, n), infinite for the vertices that are not connected.
+        """
+        n = self.number_vertices
+        if csr_matrix is not None:
+            # The matrix is built from the arrays, so the edges with zero weight are kept
+            graph = csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+            return dijkstra(graph, directed=True)
+
+        paths = np.full((n, n), np.inf)
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        weights = self.weights.tolist()
+        for source in range(n):
+            lengths = [np.inf] * n
+            lengths[source] = 0.0
+            heap = [(0.0, source)]
+            while heap:
+                length, vertex = heapq.heappop(heap)
+                if length > lengths[vertex]:
+                    continue
+                for position in range(indptr[vertex], indptr[vertex + 1]):
+                    candidate = length + weights[position]
+                    destination = indices[position]
+                    if candidate < lengths[destination]:
+                        lengths[destination] = candidate
+                        heapq.heappush(heap, (candidate, destination))
+            paths[source] = lengths
+        return paths
+
+
+def edge_columns(records):
+    """
+    Reads the records of an edge list into three lists in one pass.
+
+    :param records: iterable of mappings with the fields n1, n2 and w.
+    :return: a tuple with the lists of the ends of the edges and the array of their weights.
+    """
+    first, second, weights = [], [], []
+    for record in records:
+        first.append(record["n1"])
+        second.append(record["n2"])
+        weights.append(record["w"])
+    return first, second, np.array(weights, dtype=np.float64)
+
+
+def read_edges(path, file_format=None):
+    """
+    Reads an edge list from a JSON, NDJSON or CSV file. The JSON file can be a list of records
+    or an object with them on "edges". The NDJSON and CSV files are read line by line.
+
+    :param path: the path to the file.
+    :param file_format: "json", "ndjson" or "csv". By default it is given by the extension.
+    :return: a tuple with the lists of the ends of the edges and the array of their weights.
+    """
+    if file_format is None:
+        file_format = EDGE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format not in EDGE_FORMATS.values():
+        raise ValueError("The format has to be json, ndjson or csv")
+
+    with open(path, newline="") as f:
+        if file_format == "csv":
+            first, second, weights = edge_columns(csv.DictReader(f))
+            return _parse_ids(first), _parse_ids(second), weights
+        if file_format == "ndjson":
+            return edge_columns(json.loads(line) for line in f if line.strip())
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("edges", [])
+    return edge_columns(data)
+
+
+def _parse_ids(values):
+    """
+    Returns the ids read from a text file as integers when all of them are integers
+    """
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        return values
@@ -0,0 +1,210 @@
+"""
+This file contains the spatial index used to find the nearest vertices of a graph.
+The plane is split in a uniform grid of cells with a few vertices each and the queries
+only look at the cells around the vertex, in rings of growing size.
+Vertices can be removed from the index, so construction heuristics can remove
+the visited vertices and ask for the nearest unvisited one.
+"""
+
+# Import from libraries
+from math import ceil, floor, sqrt
+
+import numpy as np
+
+# Import from internal modules
+from .distances import distance, prepare_coordinates
+
+# Metrics that do not decrease when the euclidean distance grows, so the grid can be used
+PLANAR_METRICS = ("EUCLIDEAN", "EUC_2D", "CEIL_2D", "ATT")
+
+
+class GridIndex:
+    """
+    Uniform grid over the coordinates of the vertices.
+    The results of the queries are sorted by distance and ties are broken by position,
+    so they are the same as the ones obtained from the rows of the distance matrix.
+    """
+
+    def __init__(self, coordinates, metric="EUCLIDEAN", points_per_cell=2):
+        if metric not in PLANAR_METRICS:
+            raise ValueError(
+                "The spatial index needs one of the metrics: {}".format(
+                    ", ".join(PLANAR_METRICS)
+                )
+            )
+        self.metric = metric
+        self.coordinates = prepare_coordinates(coordinates, metric)
+        self.number_vertices = self.coordinates.shape[0]
+
+        minimum = self.coordinates.min(axis=0) if self.number_vertices else (0, 0)
+        maximum = self.coordinates.max(axis=0) if self.number_vertices else (0, 0)
+        self.origin = np.asarray(minimum, dtype=np.float64)
+        extent = float(max(maximum[0] - minimum[0], maximum[1] - minimum[1]))
+        self.size = max(1, ceil(sqrt(self.number_vertices / points_per_cell)))
+        self.cell_size = extent / self.size if extent > 0 else 1.0
+
+        self.cells = self._cells_of(self.coordinates)
+        cell_ids = self.cells[:, 0] * self.size + self.cells[:, 1]
+        order = np.argsort(cell_ids, kind="stable")
+        starts = np.searchsorted(cell_ids[order], np.arange(self.size * self.size + 1))
+
+        # The queries visit few vertices each, so they work on python lists
+        self._x = self.coordinates[:, 0].tolist()
+        self._y = self.coordinates[:, 1].tolist()
+        self._cell = cell_ids.tolist()
+        order = order.tolist()
+        self._members = [
+            order[first:last]
+            for first, last in zip(starts[:-1].tolist(), starts[1:].tolist())
+        ]
+        self._cell_count = np.diff(starts).tolist()
+        self._alive = bytearray(b"\x01") * self.number_vertices
+        self._compact = np.arange(self.number_vertices)
+        self.count = self.number_vertices
+
+    def copy(self):
+        """
+        Returns a copy that shares the grid, so removing vertices on it does not affect this one
+        """
+        new = object.__new__(GridIndex)
+        new.__dict__.update(self.__dict__)
+        new._cell_count = list(self._cell_count)
+        new._alive = bytearray(self._alive)
+        new._compact = self._compact.copy()
+        return new
+
+    def __len__(self):
+        return self.count
+
+    def remove(self, position):
+        if not self._alive[position]:
+            return
+        self._alive[position] = 0
+        self._cell_count[self._cell[position]] -= 1
+        self.count -= 1
+
+    def nearest(self, position, k=1):
+        """
+        Returns the positions of the k nearest vertices still on the index, excluding itself.
+
+        :param position: position of the vertex.
+        :param k: number of vertices.
+        :return: array with at most k positions sorted by distance.
+        """
+        x, y = self._x[position], self._y[position]
+        cx, cy = self._cell[position] // self.size, self._cell[position] % self.size
+        last = self.size - 1
+        size = self.size
+        alive, members, counts = self._alive, self._members, self._cell_count
+        xs, ys = self._x, self._y
+        measure = _METRIC_FUNCTIONS[self.metric]
+        found = []
+
+        for ring in range(max(cx, cy, last - cx, last - cy) + 1):
+            if 8 * ring > self.count:
+                # The rings are already bigger than the vertices left, so they are all checked
+                return self._select(position, self._alive_positions(), k)
+
+            for gx, gy in _ring(cx, cy, ring, last):
+                cell = gx * size + gy
+                if not counts[cell]:
+                    continue
+                for other in members[cell]:
+                    if alive[other] and other != position:
+                        found.append((measure(xs[other] - x, ys[other] - y), other))
+
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                # Any vertex outside of the rings checked is at least this far away
+                if found[-1][0] < measure(ring * self.cell_size, 0.0):
+                    break
+        else:
+            found.sort()
+            del found[k:]
+
+        return np.array([other for _, other in found], dtype=np.intp)
+
+    def within(self, position, radius):
+        """
+        Returns the positions of the vertices still on the index that are at a distance
+        of at most radius of the given vertex, excluding itself, sorted by distance.
+        """
+        point = self.coordinates[position]
+        # The rounded metrics can be below the radius for euclidean distances a bit above it
+        reach = radius
+        if self.metric == "ATT":
+            reach = sqrt(10.0) * (radius + 1.0)
+        elif self.metric != "EUCLIDEAN":
+            reach = radius + 1.0
+        low = self._cells_of((point - reach)[np.newaxis, :])[0].tolist()
+        high = self._cells_of((point + reach)[np.newaxis, :])[0].tolist()
+        candidates = [
+            other
+            for gx in range(low[0], high[0] + 1)
+            for gy in range(low[1], high[1] + 1)
+            for other in self._members[gx * self.size + gy]
+            if self._alive[other] and other != position
+        ]
+        candidates = np.array(candidates, dtype=np.intp)
+        distances = distance(point, self.coordinates[candidates], self.metric)
+        inside = distances <= radius
+        return _smallest(candidates[inside], distances[inside], len(candidates))
+
+    def _select(self, position, candidates, k):
+        candidates = candidates[candidates != position]
+        distances = distance(
+            self.coordinates[position], self.coordinates[candidates], self.metric
+        )
+        return _smallest(candidates, distances, k)
+
+    def _alive_positions(self):
+        alive = np.frombuffer(self._alive, dtype=bool)
+        if len(self._compact) > 2 * self.count:
+            self._compact = self._compact[alive[self._compact]]
+        return self._compact[alive[self._compact]]
+
+    def _cells_of(self, coordinates):
+        cells = np.floor((coordinates - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.size - 1)
+
+
+def _ring(cx, cy, ring, last):
+    """
+    Yields the cells of the grid at the given ring around the cell (cx, cy)
+    """
+    if ring == 0:
+        yield cx, cy
+        return
+    low_x, high_x = max(cx - ring, 0), min(cx + ring, last)
+    low_y, high_y = max(cy - ring + 1, 0), min(cy + ring - 1, last)
+    for gy in (cy - ring, cy + ring):
+        if 0 <= gy <= last:
+            for gx in range(low_x, high_x + 1):
+                yield gx, gy
+    for gx in (cx - ring, cx + ring):
+        if 0 <= gx <= last:
+            for gy in range(low_y, high_y + 1):
+                yield gx, gy
+
+
+def _att(dx, dy):
+    real = sqrt((dx * dx + dy * dy) / 10.0)
+    rounded = floor(real + 0.5)
+    return float(rounded + 1 if rounded < real else rounded)
+
+
+# Same distance functions as the ones of the distances module for a single pair of vertices
+_METRIC_FUNCTIONS = {
+    "EUCLIDEAN": lambda dx, dy: sqrt(dx * dx + dy * dy),
+    "EUC_2D": lambda dx, dy: float(floor(sqrt(dx * dx + dy * dy) + 0.5)),
+    "CEIL_2D": lambda dx, dy: float(ceil(sqrt(dx * dx + dy * dy))),
+    "ATT": _att,
+}
+
+
+def _smallest(positions, distances, k):
+    """
+    Returns the k positions with the smallest distance, breaking ties by position
+    """
+    return positions[np.lexsort((positions, distances))[:k]]
@@ -0,0 +1,122 @@
+"""
+This file contains the array based representation of a tour used by the solvers.
+The tour is stored as the order in which the vertices are visited, given by their position
+on the graph, and the inverse array with the index of each vertex on the order,
+so the successor or predecessor of a vertex are found in constant time.
+"""
+
+# Import from libraries
+import numpy as np
+
+
+class Tour:
+    """
+    A closed tour over the positions of the vertices of a graph.
+    The indices used by the methods are indices on the order, while next, prev and between
+    take the positions of the vertices.
+    """
+
+    def __init__(self, order):
+        """
+        :param order: the positions of the vertices in the order they are visited.
+        """
+        self.order = np.array(order, dtype=np.int32)
+        self.index = np.empty(len(self.order), dtype=np.int32)
+        self.index[self.order] = np.arange(len(self.order), dtype=np.int32)
+
+    @classmethod
+    def from_path(cls, graph, path):
+        """
+        Creates the tour of a list of vertices of the graph
+        """
+        return cls(graph.get_positions(path))
+
+    def to_path(self, graph):
+        """
+        Returns the list of vertices of the graph in the order of the tour
+        """
+        return [graph.vertices[position] for position in self.order.tolist()]
+
+    def copy(self):
+        tour = object.__new__(Tour)
+        tour.order = self.order.copy()
+        tour.index = self.index.copy()
+        return tour
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.order[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, Tour):
+            return False
+        return np.array_equal(self.order, other.order)
+
+    def __repr__(self):
+        return "Tour({})".format(self.order.tolist())
+
+    def cost(self, graph):
+        return graph.get_tour_costs(self.order)
+
+    def next(self, vertex):
+        """
+        Returns the vertex visited after the given one
+        """
+        i = self.index.item(vertex) + 1
+        return self.order.item(i if i < len(self.order) else 0)
+
+    def prev(self, vertex):
+        """
+        Returns the vertex visited before the given one
+        """
+        return self.order.item(self.index.item(vertex) - 1)
+
+    def between(self, a, b, c):
+        """
+        Returns True if b is on the path that goes forward from a to c, both included
+        """
+        i, j, k = self.index.item(a), self.index.item(b), self.index.item(c)
+        if i <= k:
+            return i <= j <= k
+        return j >= i or j <= k
+
+    def reverse(self, i, j):
+        """
+        Reverses the segment of the order from the index i to the index j, both included.
+        If i > j the segment wraps around the end of the order.
+        The resulting tour is the same if the rest of the order is reversed instead, so the
+        shorter of both sides is the one reversed and the cost of the move is at most n / 2.
+        """
+        n = len(self.order)
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        if length < 2:
+            return
+
+        if i <= j:
+            indices = np.arange(i, j + 1)
+        else:
+            indices = np.arange(i, i + length) % n
+        segment = self.order[indices[::-1]]
+        self.order[indices] = segment
+        self.index[segment] = indices
+
+    def swap(self, i, j):
+        """
+        Swaps the vertices at the indices i and j
+        """
+        a, b = self.order.item(i), self.order.item(j)
+        self.order[i], self.order[j] = b, a
+        self.index[a], self.index[b] = j, i
+
+    def exchange(self, i, j, k):
+        """
+        Exchanges the consecutive segments of the order [i, j) and [j, k), with i < j < k
+        """
+        segment = np.concatenate((self.order[j:k], self.order[i:j]))
+        self.order[i:k] = segment
+        self.index[segment] = np.arange(i, k)
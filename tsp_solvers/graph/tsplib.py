@@ -0,0 +1,188 @@
+"""
+This file contains the reader for the TSPLIB format.
+The file is read line by line and the data is stored straight into arrays,
+so the memory used is close to the size of the data itself.
+"""
+
+# Import from libraries
+import numpy as np
+
+# Import from internal modules
+from .distances import METRICS
+
+# Formats of the explicit weights. Each one gives the indices of the matrix in the order
+# they appear in the file. The symmetric formats by column are equivalent to the
+# opposite triangle by row.
+EDGE_WEIGHT_FORMATS = {
+    "FULL_MATRIX": None,
+    "UPPER_ROW": lambda n: np.triu_indices(n, 1),
+    "LOWER_ROW": lambda n: np.tril_indices(n, -1),
+    "UPPER_DIAG_ROW": lambda n: np.triu_indices(n, 0),
+    "LOWER_DIAG_ROW": lambda n: np.tril_indices(n, 0),
+    "UPPER_COL": lambda n: np.tril_indices(n, -1),
+    "LOWER_COL": lambda n: np.triu_indices(n, 1),
+    "UPPER_DIAG_COL": lambda n: np.tril_indices(n, 0),
+    "LOWER_DIAG_COL": lambda n: np.triu_indices(n, 0),
+}
+
+SECTIONS = ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION", "EDGE_WEIGHT_SECTION")
+
+
+class TSPLibInstance:
+    """
+    The data read from a TSPLIB file.
+    The coordinates are an array of shape (n, 2) and the ids are the number of each node,
+    the weights are the full matrix when the weights are given explicitly.
+    """
+
+    def __init__(self):
+        self.specification = dict()
+        self.ids = None
+        self.coordinates = None
+        self.weights = None
+
+    @property
+    def name(self):
+        return self.specification.get("NAME")
+
+    @property
+    def dimension(self):
+        return int(self.specification["DIMENSION"])
+
+    @property
+    def edge_weight_type(self):
+        return self.specification.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+
+    @property
+    def edge_weight_format(self):
+        return self.specification.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX")
+
+
+def read_tsplib(path):
+    """
+    Reads a TSPLIB file with the coordinates of the nodes or the explicit weights of the edges.
+
+    :param path: the path to the file.
+    :return: a TSPLibInstance.
+    """
+    instance = TSPLibInstance()
+    section = None
+    count = 0
+    values = None
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            if line[0].isalpha():
+                _end_section(instance, section, values, count)
+                section = None
+                count = 0
+
+                key, _, value = line.partition(":")
+                key = key.strip()
+                if key == "EOF":
+                    break
+                elif key in SECTIONS:
+                    section = key
+                    values = _start_section(instance, section)
+                elif value:
+                    instance.specification[key] = value.strip()
+                # Sections that are not needed (tours, demands, etc.) are skipped
+                continue
+
+            if section is None:
+                continue
+
+            parts = line.split()
+            if section == "EDGE_WEIGHT_SECTION":
+                if count + len(parts) > len(values):
+                    raise ValueError(
+                        "EDGE_WEIGHT_SECTION has more values than expected"
+                    )
+                values[count : count + len(parts)] = parts
+                count += len(parts)
+            else:
+                if count == instance.dimension:
+                    raise ValueError(
+                        "{} has more nodes than its dimension".format(section)
+                    )
+                instance.ids[count] = int(parts[0])
+                values[count] = (float(parts[1]), float(parts[2]))
+                count += 1
+
+    _end_section(instance, section, values, count)
+
+    if instance.edge_weight_type != "EXPLICIT":
+        if instance.edge_weight_type not in METRICS:
+            raise ValueError(
+                "EDGE_WEIGHT_TYPE {} is not supported".format(instance.edge_weight_type)
+            )
+        if instance.coordinates is None:
+            raise ValueError("The file does not have a NODE_COORD_SECTION")
+    elif instance.weights is None:
+        raise ValueError("The file does not have an EDGE_WEIGHT_SECTION")
+
+    if instance.ids is None:
+        instance.ids = np.arange(1, instance.dimension + 1)
+
+    return instance
+
+
+def _start_section(instance, section):
+    """
+    Allocates the array where the values of the section are going to be stored
+    """
+    n = instance.dimension
+    if section == "EDGE_WEIGHT_SECTION":
+        fmt = instance.edge_weight_format
+        if fmt not in EDGE_WEIGHT_FORMATS:
+            raise ValueError("EDGE_WEIGHT_FORMAT {} is not supported".format(fmt))
+        if fmt == "FULL_MATRIX":
+            size = n * n
+        elif "DIAG" in fmt:
+            size = n * (n + 1) // 2
+        else:
+            size = n * (n - 1) // 2
+        return np.empty(size, dtype=np.float64)
+
+    # The display data is only used as coordinates if there are no node coordinates
+    if section == "NODE_COORD_SECTION" or instance.coordinates is None:
+        instance.ids = np.empty(n, dtype=np.int64)
+        instance.coordinates = np.empty((n, 2), dtype=np.float64)
+        return instance.coordinates
+    return np.empty((n, 2), dtype=np.float64)
+
+
+def _end_section(instance, section, values, count):
+    """
+    Checks that the section is complete and builds the weights matrix if it is the EDGE_WEIGHT_SECTION
+    """
+    if section is None:
+        return
+    if count != len(values):
+        raise ValueError(
+            "{} has {} values and {} were expected".format(section, count, len(values))
+        )
+    if section == "EDGE_WEIGHT_SECTION":
+        instance.weights = _build_weights(instance, values)
+
+
+def _build_weights(instance, values):
+    """
+    Builds the full matrix from the values of the EDGE_WEIGHT_SECTION
+    """
+    n = instance.dimension
+    # The weights are integer values on TSPLIB
+    values += 0.5
+    np.floor(values, out=values)
+    if instance.edge_weight_format == "FULL_MATRIX":
+        return values.reshape(n, n)
+
+    rows, columns = EDGE_WEIGHT_FORMATS[instance.edge_weight_format](n)
+    weights = np.zeros((n, n), dtype=np.float64)
+    weights[rows, columns] = values
+    weights[columns, rows] = values
+    return weights
@@ -1,2 +1,7 @@
 from .nearest_neighbor import NearestNeighbor
 from .random import RandomInitializer
+from .greedy import GreedyEdge
+from .insertion import Insertion
+from .savings import Savings
+from .space_filling_curve import SpaceFillingCurve
+from .factory import INITIALIZERS, create_initializer
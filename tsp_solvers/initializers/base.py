@@ -0,0 +1,41 @@
+"""
+This class implements common methods for all initializers
+"""
+
+import random
+
+import numpy as np
+
+
+class BaseInitializer:
+    def __init__(self, graph, population: int = 1):
+        self.graph = graph
+        self.population = population
+
+    def get_init(self):
+        list_vertices = self.graph.vertices
+        return [
+            [list_vertices[position] for position in tour]
+            for tour in self.get_tours().tolist()
+        ]
+
+    def get_tours(self):
+        """
+        Has to be implemented in subclass
+
+        :return: array of shape (population, n) with the positions of the vertices of each tour.
+        """
+        raise NotImplementedError
+
+    def _get_starts(self):
+        """
+        Returns the positions of the start of each tour. The starts are different while the
+        population is not bigger than the number of vertices.
+        """
+        n = self.graph.number_vertices
+        starts = []
+        while len(starts) < self.population:
+            starts.extend(
+                random.sample(range(n), min(n, self.population - len(starts)))
+            )
+        return np.array(starts, dtype=np.int64)
@@ -0,0 +1,40 @@
+from .greedy import GreedyEdge
+from .insertion import Insertion
+from .nearest_neighbor import NearestNeighbor
+from .random import RandomInitializer
+from .savings import Savings
+from .space_filling_curve import SpaceFillingCurve
+
+# Names accepted by the init argument of the methods
+INITIALIZERS = (
+    "random",
+    "nearest",
+    "greedy",
+    "hilbert",
+    "savings",
+    "cheapest",
+    "farthest",
+)
+
+
+def create_initializer(init, graph, population=1):
+    """
+    Creates the initializer with the given name.
+
+    :param init: one of the names on INITIALIZERS.
+    :param graph: the graph.
+    :param population: the number of tours.
+    """
+    if init == "random":
+        return RandomInitializer(graph, population)
+    if init == "nearest":
+        return NearestNeighbor(graph, population)
+    if init == "greedy":
+        return GreedyEdge(graph, population)
+    if init == "hilbert":
+        return SpaceFillingCurve(graph, population)
+    if init == "savings":
+        return Savings(graph, population)
+    if init in ("cheapest", "farthest"):
+        return Insertion(graph, population, method=init)
+    raise ValueError("The init has to be one of {}".format(", ".join(INITIALIZERS)))
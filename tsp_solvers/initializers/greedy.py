@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+
+from tsp_solvers.graph.disjoint_set import DisjointSet
+from tsp_solvers.graph.neighbors import subset_neighbors
+
+from .base import BaseInitializer
+
+
+class GreedyEdge(BaseInitializer):
+    """
+    Greedy edge construction: the candidate edges are taken from the shortest one and each
+    edge is kept if both ends have less than two edges and it does not close a cycle.
+    The first tour is the greedy one and the others are built with the costs of the edges
+    randomly increased by up to noise, so the population is not made of copies of one tour.
+    """
+
+    def __init__(self, graph, population: int = 1, k=10, noise=0.1):
+        """
+        :param k: number of candidate neighbours of each vertex.
+        :param noise: maximum relative increase of the costs of the edges of the other tours.
+        """
+        super().__init__(graph, population)
+        self.k = k
+        self.noise = noise
+
+    def get_tours(self):
+        n = self.graph.number_vertices
+        tours = np.empty((self.population, n), dtype=np.int64)
+        for row in range(self.population):
+            tours[row] = greedy_path(
+                self.graph, self.k, noise=self.noise if row > 0 else 0.0
+            )
+        return tours
+
+
+def greedy_path(graph, k=10, hub=None, noise=0.0):
+    """
+    Joins the vertices of the graph into one path by taking the candidate edges in order of score.
+    An edge is kept if both ends have less than two edges and it joins two different fragments,
+    which is checked with union-find. The candidates are the k nearest neighbours of each vertex
+    and, while there is more than one fragment, new candidates are calculated between
+    the ends of the fragments, with more neighbours each time no fragments are joined.
+    The candidates are sorted once on each round, so it takes O(n k log n).
+
+    :param graph: the graph.
+    :param k: number of candidate neighbours of each vertex.
+    :param hub: position of a vertex left out of the path. The score of an edge is then its cost
+      minus the cost of reaching its ends from the hub, so the edges with the largest
+      savings are taken first.
+    :param noise: the scores are multiplied by a random factor between 1 and 1 + noise.
+    :return: array with the positions of the vertices of the path.
+    """
+    n = graph.number_vertices
+    degree = [0] * n
+    adjacency = [[] for _ in range(n)]
+    sets = DisjointSet(n)
+    targets = 1
+    if hub is not None:
+        # The hub is a fragment by itself that can not be joined
+        degree[hub] = 2
+        targets = 2
+    generator = np.random.default_rng(random.getrandbits(32)) if noise else None
+
+    while sets.count > targets:
+        ends = np.flatnonzero(np.array(degree) < 2)
+        size = min(k, len(ends) - 1)
+        if len(ends) == n:
+            neighbors = graph.get_neighbors(size)
+        else:
+            neighbors = ends[
+                subset_neighbors(
+                    graph.distances, ends, size, graph.coordinates, graph.metric
+                )
+            ]
+
+        # Each edge is taken once, from its end with the lowest position
+        origins = np.repeat(ends, neighbors.shape[1])
+        destinations = neighbors.ravel().astype(np.int64)
+        keys = np.unique(
+            np.minimum(origins, destinations) * n + np.maximum(origins, destinations)
+        )
+        origins, destinations = keys // n, keys % n
+        scores = graph.distances.batch(origins, destinations)
+        if hub is not None:
+            scores = (
+                scores
+                - graph.distances.batch(hub, origins)
+                - graph.distances.batch(hub, destinations)
+            )
+        if generator is not None:
+            scores = scores * (1 + noise * generator.random(len(scores)))
+        order = np.argsort(scores, kind="stable")
+
+        count = sets.count
+        for a, b in zip(origins[order].tolist(), destinations[order].tolist()):
+            if degree[a] < 2 and degree[b] < 2 and sets.union(a, b):
+                degree[a] += 1
+                degree[b] += 1
+                adjacency[a].append(b)
+                adjacency[b].append(a)
+                if sets.count == targets:
+                    break
+        if sets.count == count:
+            k *= 2
+
+    ends = [i for i in range(n) if degree[i] < 2]
+    return walk_path(adjacency, ends[0], n if hub is None else n - 1)
+
+
+def walk_path(adjacency, start, size):
+    """
+    Returns the positions of the vertices of the path that starts at start.
+
+    :param adjacency: list with the neighbours on the path of each vertex.
+    :param start: position of an end of the path.
+    :param size: the number of vertices of the path.
+    """
+    path = np.empty(size, dtype=np.int64)
+    previous, current = -1, start
+    for step in range(size):
+        path[step] = current
+        following = [i for i in adjacency[current] if i != previous]
+        previous, current = current, following[0] if following else -1
+    return path
@@ -0,0 +1,175 @@
+import heapq
+
+import numpy as np
+
+from .base import BaseInitializer
+
+
+class Insertion(BaseInitializer):
+    """
+    Insertion construction: the tour starts with one vertex and the others are inserted one by one
+    between the two consecutive vertices where they increase its cost the least.
+    With the cheapest method the vertex inserted is the one with the cheapest insertion,
+    and only the edges of the tour next to its k nearest neighbours are considered, so the
+    candidates are kept on a heap and it takes O(n k log n).
+    With the farthest method the vertex inserted is the farthest one from the tour,
+    and the distances to the tour and the costs of insertion are updated by rows in O(n) each step.
+    Each tour starts from a different vertex.
+    """
+
+    def __init__(self, graph, population: int = 1, method="cheapest", k=10):
+        """
+        :param method: "cheapest" or "farthest".
+        :param k: number of candidate neighbours of each vertex for the cheapest method.
+        """
+        super().__init__(graph, population)
+        if method not in ("cheapest", "farthest"):
+            raise ValueError("The method has to be cheapest or farthest")
+        self.method = method
+        self.k = k
+
+    def get_tours(self):
+        n = self.graph.number_vertices
+        starts = self._get_starts()
+        tours = np.empty((len(starts), n), dtype=np.int64)
+        for row, start in enumerate(starts.tolist()):
+            if self.method == "cheapest":
+                following = self._get_cheapest(start)
+            else:
+                following = self._get_farthest(start)
+            tours[row] = _walk(following, start)
+        return tours
+
+    def _get_cheapest(self, start):
+        n = self.graph.number_vertices
+        distances = self.graph.distances
+        neighbors = self.graph.get_neighbors(self.k).astype(np.int64)
+        # The vertices that have each vertex as a neighbour, in CSR form
+        order = np.argsort(neighbors.ravel(), kind="stable")
+        reverse = order // neighbors.shape[1]
+        indptr = np.searchsorted(neighbors.ravel()[order], np.arange(n + 1))
+
+        following = np.full(n, -1, dtype=np.int64)
+        previous = np.full(n, -1, dtype=np.int64)
+        following[start] = previous[start] = start
+        heap = []
+
+        def push(candidates, origins):
+            """
+            Pushes the insertion of each candidate after each origin
+            """
+            if len(candidates) == 0:
+                return
+            destinations = following[origins]
+            costs = (
+                distances.batch(origins, candidates)
+                + distances.batch(candidates, destinations)
+                - distances.batch(origins, destinations)
+            )
+            for entry in zip(
+                costs.tolist(),
+                candidates.tolist(),
+                origins.tolist(),
+                destinations.tolist(),
+            ):
+                heapq.heappush(heap, entry)
+
+        def push_best(candidate):
+            """
+            Pushes the best insertion of a vertex next to its neighbours on the tour,
+            or anywhere on the tour if none of them is on it
+            """
+            tour = neighbors[candidate][following[neighbors[candidate]] >= 0]
+            if len(tour) == 0:
+                tour = np.flatnonzero(following >= 0)
+            origins = np.unique(np.concatenate((tour, previous[tour])))
+            destinations = following[origins]
+            costs = (
+                distances.batch(origins, candidate)
+                + distances.batch(candidate, destinations)
+                - distances.batch(origins, destinations)
+            )
+            best = int(np.argmin(costs))
+            heapq.heappush(
+                heap,
+                (
+                    float(costs[best]),
+                    candidate,
+                    int(origins[best]),
+                    int(destinations[best]),
+                ),
+            )
+
+        vertex = start
+        for _ in range(n - 1):
+            # The vertices near the last one inserted can be inserted next to it
+            candidates = np.unique(
+                np.concatenate(
+                    (neighbors[vertex], reverse[indptr[vertex] : indptr[vertex + 1]])
+                )
+            )
+            candidates = candidates[following[candidates] < 0]
+            push(
+                np.tile(candidates, 2),
+                np.repeat([previous[vertex], vertex], len(candidates)),
+            )
+
+            while True:
+                if not heap:
+                    push_best(int(np.flatnonzero(following < 0)[0]))
+                _, vertex, origin, destination = heapq.heappop(heap)
+                if following[vertex] >= 0:
+                    continue
+                if following[origin] != destination:
+                    # The edge has been split by another vertex
+                    push_best(vertex)
+                    continue
+                break
+
+            following[origin], previous[vertex] = vertex, origin
+            following[vertex], previous[destination] = destination, vertex
+        return following
+
+    def _get_farthest(self, start):
+        n = self.graph.number_vertices
+        distances = self.graph.distances
+        following = np.full(n, -1, dtype=np.int64)
+        following[start] = start
+        # The distance from each vertex to the tour
+        nearest = distances.row(start).astype(np.float64)
+        nearest[start] = -np.inf
+        # The origins of the edges of the tour, in order of insertion, and the cost of each edge
+        origins = np.empty(n, dtype=np.int64)
+        lengths = np.empty(n, dtype=np.float64)
+        origins[0], lengths[0] = start, 0.0
+
+        for size in range(1, n):
+            vertex = int(np.argmax(nearest))
+            tour = origins[:size]
+            destinations = following[tour]
+            costs = (
+                distances.batch(tour, vertex)
+                + distances.batch(vertex, destinations)
+                - lengths[:size]
+            )
+            best = int(np.argmin(costs))
+            origin, destination = int(tour[best]), int(destinations[best])
+
+            following[origin], following[vertex] = vertex, destination
+            lengths[best] = distances.cost(origin, vertex)
+            origins[size], lengths[size] = vertex, distances.cost(vertex, destination)
+            np.minimum(nearest, distances.row(vertex), out=nearest)
+            nearest[vertex] = -np.inf
+        return following
+
+
+def _walk(following, start):
+    """
+    Returns the positions of the vertices of the tour given by the vertex after each one
+    """
+    tour = np.empty(len(following), dtype=np.int64)
+    vertex = start
+    for step in range(len(following)):
+        tour[step] = vertex
+        vertex = following[vertex]
+    return tour
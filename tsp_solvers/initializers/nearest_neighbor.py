@@ -1,37 +1,66 @@
-import random
-
-
-class NearestNeighbor:
-    def __init__(self, graph, population: int = 1):
-        self.graph = graph
-        self.population = population
-
-    def get_init(self):
-        random_paths = []
-        list_vertices = self.graph.vertices
-
-        for _ in range(self.population):
-            random_start = random.sample(list_vertices, 1)[0]
-            aux_list = list(list_vertices)
-            aux_list.remove(random_start)
-            random_list = [random_start]
-            while len(aux_list) > 0:
-                min_cost = float("Inf")
-                next_node = None
-
-                for i in aux_list:
-                    if (
-                        self.graph.edges_collection[(random_list[-1].idx, i.idx)].cost
-                        < min_cost
-                    ):
-                        min_cost = self.graph.edges_collection[
-                            (random_list[-1].idx, i.idx)
-                        ].cost
-                        next_node = i
-
-                random_list.append(next_node)
-                aux_list.remove(next_node)
-
-            random_paths.append(random_list)
-
-        return random_paths
+import numpy as np
+
+from .base import BaseInitializer
+
+# Above this number of vertices the tours are built with the spatial index, when the graph
+# has one, instead of scanning full rows of distances on each step
+SPATIAL_LIMIT = 5000
+# Maximum number of distances gathered on each step when the starts are built together
+BLOCK_SIZE = 2**22
+
+
+class NearestNeighbor(BaseInitializer):
+    def get_tours(self):
+        """
+        Builds the nearest neighbour tours from different starts. The starts are built together:
+        on each step the rows of distances of the current vertex of every start are read at once
+        and the next vertices are found with one masked argmin.
+
+        :return: array of shape (population, n) with the positions of the vertices of each tour.
+        """
+        n = self.graph.number_vertices
+        starts = self._get_starts()
+        tours = np.empty((len(starts), n), dtype=np.int64)
+        index = self.graph.get_spatial_index() if n > SPATIAL_LIMIT else None
+
+        if index is not None:
+            for row, start in enumerate(starts.tolist()):
+                tours[row] = self._get_index_tour(index, start)
+        else:
+            step = max(1, BLOCK_SIZE // max(n, 1))
+            for first in range(0, len(starts), step):
+                tours[first : first + step] = self._get_batch_tours(
+                    starts[first : first + step]
+                )
+        return tours
+
+    def _get_batch_tours(self, starts):
+        n = self.graph.number_vertices
+        rows = np.arange(len(starts))
+        tours = np.empty((len(starts), n), dtype=np.int64)
+        # The visited vertices are masked by adding an infinite cost to them
+        penalty = np.zeros((len(starts), n), dtype=np.float64)
+        costs = np.empty_like(penalty)
+        current = starts
+        tours[:, 0] = current
+        penalty[rows, current] = np.inf
+        for step in range(1, n):
+            np.add(self.graph.distances.rows(current), penalty, out=costs)
+            current = np.argmin(costs, axis=1)
+            penalty[rows, current] = np.inf
+            tours[:, step] = current
+        return tours
+
+    def _get_index_tour(self, index, start):
+        n = self.graph.number_vertices
+        tour = np.empty(n, dtype=np.int64)
+        tour[0] = start
+        # The visited vertices are removed from a copy of the index
+        unvisited = index.copy()
+        unvisited.remove(start)
+        current = start
+        for step in range(1, n):
+            current = int(unvisited.nearest(current)[0])
+            unvisited.remove(current)
+            tour[step] = current
+        return tour
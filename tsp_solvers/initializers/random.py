@@ -1,17 +1,17 @@
 import random
 
+import numpy as np
 
-class RandomInitializer:
-    def __init__(self, graph, population: int = 1):
-        self.graph = graph
-        self.population = population
+from .base import BaseInitializer
 
-    def get_init(self):
-        random_paths = []
-        list_vertices = self.graph.vertices
 
-        for _ in range(self.population):
-            random_list = random.sample(list_vertices, len(list_vertices))
-            random_paths.append(random_list)
-
-        return random_paths
+class RandomInitializer(BaseInitializer):
+    def get_tours(self):
+        """
+        :return: array of shape (population, n) with the positions of the vertices of each tour.
+        """
+        n = self.graph.number_vertices
+        tours = np.empty((self.population, n), dtype=np.int64)
+        for row in range(self.population):
+            tours[row] = random.sample(range(n), n)
+        return tours
@@ -0,0 +1,30 @@
+import numpy as np
+
+from .base import BaseInitializer
+from .greedy import greedy_path
+
+
+class Savings(BaseInitializer):
+    """
+    Clarke and Wright savings construction. Every vertex starts on its own route from a hub and
+    the routes are merged along the edges that save the most over going back to the hub,
+    which is the greedy edge construction with the savings as score.
+    Each tour uses a different hub.
+    """
+
+    def __init__(self, graph, population: int = 1, k=10):
+        """
+        :param k: number of candidate neighbours of each vertex.
+        """
+        super().__init__(graph, population)
+        self.k = k
+
+    def get_tours(self):
+        n = self.graph.number_vertices
+        starts = self._get_starts()
+        tours = np.empty((len(starts), n), dtype=np.int64)
+        for row, hub in enumerate(starts.tolist()):
+            tours[row, 0] = hub
+            if n > 1:
+                tours[row, 1:] = greedy_path(self.graph, self.k, hub=hub)
+        return tours
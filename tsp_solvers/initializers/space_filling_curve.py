@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from .base import BaseInitializer
+
+# Number of bits of each coordinate on the grid of the curve
+ORDER = 16
+
+
+class SpaceFillingCurve(BaseInitializer):
+    """
+    Visits the vertices in the order of a Hilbert curve over their coordinates, which only
+    needs a sort and takes O(n log n). The first tour follows the curve over the coordinates
+    and the others over the coordinates rotated by a random angle.
+    """
+
+    def get_tours(self):
+        if self.graph.metric == "EXPLICIT":
+            raise ValueError(
+                "The space filling curve needs the coordinates of the vertices"
+            )
+        coordinates = self.graph.coordinates
+        tours = np.empty((self.population, len(coordinates)), dtype=np.int64)
+        for row in range(self.population):
+            if row > 0:
+                angle = random.uniform(0, 2 * np.pi)
+                rotation = np.array(
+                    [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+                )
+                coordinates = self.graph.coordinates @ rotation
+            tours[row] = np.argsort(hilbert_keys(coordinates), kind="stable")
+        return tours
+
+
+def hilbert_keys(coordinates, order=ORDER):
+    """
+    Returns the position of each point along a Hilbert curve that covers its bounding square.
+
+    :param coordinates: array of shape (n, 2).
+    :param order: the number of bits of each coordinate on the grid of the curve.
+    :return: array of n integers.
+    """
+    side = 2**order
+    low = coordinates.min(axis=0)
+    span = max(float((coordinates.max(axis=0) - low).max()), np.finfo(float).tiny)
+    cells = ((coordinates - low) / span * (side - 1)).astype(np.int64)
+    x, y = cells[:, 0], cells[:, 1]
+    keys = np.zeros(len(coordinates), dtype=np.int64)
+    s = side // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+        # Rotates the quadrant so the curve inside it has the orientation of the whole curve
+        flip = rx & ~ry
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s //= 2
+    return keys
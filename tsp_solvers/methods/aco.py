@@ -5,12 +5,14 @@ This file contains the main logic for the Ant Colony Optimization method
 
 # Import from libraries
 import datetime
-import math
 import random
 import sys
-from itertools import accumulate
+
+import numpy as np
 
 # Import from internal modules
+from ..graph import Tour
+from ..graph.distances import BLOCK_SIZE
 from .base import BaseSolver
 
 
@@ -19,73 +21,56 @@ class Ant:
     The class for the individual ants
     """
 
-    def __init__(self, alpha=0, beta=0, graph=None):
-        """ """
+    def __init__(self, alpha=0, beta=0, graph=None, pheromone=None, visibility=None):
+        """
+        :param alpha: the exponent of the pheromone.
+        :param beta: the exponent of the visibility.
+        :param graph: the graph to solve, it is only read.
+        :param pheromone: the pheromone matrix of the colony, by position of the vertices.
+        :param visibility: the matrix with the visibility of each edge raised to beta.
+        """
         self.alpha = alpha
         self.beta = beta
         self.number_vertices = graph.number_vertices
         self.graph = graph
+        self.pheromone = pheromone
+        self.visibility = visibility
         self.solution = list()
+        self.tour = None
         self.cost = 0
-        self.unvisited_nodes = list(self.graph.vertices)
-
-    def _select_node(self):
-        """ """
-
-        pheromone = [
-            self.graph.edges_collection[
-                (self.solution[-1].idx, unvisited.idx)
-            ].pheromone
-            for unvisited in self.unvisited_nodes
-        ]
-
-        # pheromone = []
-        # for unvisited in self.unvisited_nodes:
-        #     aux = self.graph.edges_collection[
-        #         (self.solution[-1].idx, unvisited.idx)
-        #     ].pheromone
-        #     pheromone.append(aux)
-
-        pheromone = list(map(lambda x: math.pow(x, self.alpha), pheromone))
-        # pheromone = [math.pow(x, self.alpha) for x in pheromone]
-
-        visibility = [
-            self.graph.edges_collection[(self.solution[-1].idx, unvisited.idx)].cost
-            for unvisited in self.unvisited_nodes
-        ]
-
-        visibility = [v if v != 0 else 0.1 for v in visibility]
-        visibility = list(map(lambda x: math.pow(1 / x, self.beta), visibility))
-        # visibility = [math.pow(1 / x, self.beta) for x in visibility]
+        self.unvisited = None
 
-        denominator = sum([x * y for x, y in zip(pheromone, visibility)])
-        cumulative_probability = list(
-            accumulate([p * v / denominator for p, v in zip(pheromone, visibility)])
-        )
+    def _select_node(self, current):
+        """
+        Chooses the next vertex among the unvisited ones with probability proportional to
+        the pheromone raised to alpha times the visibility of the edge
+        """
+        weights = np.power(self.pheromone[current, self.unvisited], self.alpha)
+        weights *= self.visibility[current, self.unvisited]
+        cumulative = np.cumsum(weights)
 
         random_value = random.uniform(0, 1)
+        added = int(np.searchsorted(cumulative, random_value * cumulative[-1]))
+        added = min(added, len(self.unvisited) - 1)
 
-        added_idx = next(
-            idx
-            for idx, value in enumerate(cumulative_probability)
-            if value >= random_value
-        )
-
-        added = self.unvisited_nodes[added_idx]
-        self.unvisited_nodes.remove(added)
-        return added
+        position = self.unvisited[added]
+        self.unvisited = np.delete(self.unvisited, added)
+        return position
 
     def find_solution(self):
         """ """
-        self.solution = random.sample(self.graph.vertices, 1)
-        self.unvisited_nodes = list(self.graph.vertices)
-        self.unvisited_nodes.remove(self.solution[0])
-        while len(self.solution) < self.number_vertices:
-            self.solution.append(self._select_node())
+        first = random.sample(self.graph.vertices, 1)[0]
+        start = self.graph.vertices_position[first.idx]
+        order = [start]
+        self.unvisited = np.delete(np.arange(self.number_vertices), start)
+        while len(order) < self.number_vertices:
+            order.append(int(self._select_node(order[-1])))
+        self.tour = Tour(order)
+        self.solution = self.tour.to_path(self.graph)
         return self.solution
 
     def get_cost(self):
-        self.cost = self.graph.get_solution_cost(self.solution)
+        self.cost = self.graph.get_tour_costs(self.tour.order)
         return self.cost
 
 
@@ -128,25 +113,64 @@ class AntColonyOptimization(BaseSolver):
 
         self.time = None
 
-        for edge in self.graph.edges_collection:
-            self.graph.update_pheromone(edge, initial_pheromone)
+        # The pheromone of each edge, by position of the vertices, belongs to the colony
+        # so the graph is only read and can be shared
+        self.pheromone = np.full(
+            (self.number_vertices, self.number_vertices), float(initial_pheromone)
+        )
+        self.visibility = self._get_visibility()
 
-        self.ants = [Ant(alpha, beta, self.graph) for _ in range(self.population_size)]
+        self.ants = [
+            Ant(alpha, beta, self.graph, self.pheromone, self.visibility)
+            for _ in range(self.population_size)
+        ]
 
         self.best_solution = None
         self.best_cost = float("inf")
 
-    def _add_pheromone(self, solution, cost, weight=1):
-        pheromone_to_add = self.pheromone_deposit / cost
-        for i in range(self.number_vertices):
-            self.graph.edges_collection[
-                (solution[i].idx, solution[(i + 1) % self.number_vertices].idx)
-            ].pheromone = (
-                self.graph.edges_collection[
-                    (solution[i].idx, solution[(i + 1) % self.number_vertices].idx)
-                ].pheromone
-                + weight * pheromone_to_add
-            )
+    def _get_visibility(self):
+        """
+        Calculates the visibility of each edge raised to beta by blocks of rows read from the
+        storage of the distances, so the full distance matrix is never copied
+        """
+        n = self.number_vertices
+        if self.graph.distances is None:
+            distances = self.graph.get_distance_matrix().astype(np.float64)
+            distances[distances == 0] = 0.1
+            return np.power(1 / distances, self.beta)
+
+        visibility = np.empty((n, n))
+        step = max(1, BLOCK_SIZE // max(1, n))
+        for start in range(0, n, step):
+            block = self.graph.distances.rows(np.arange(start, min(start + step, n)))
+            block = np.where(block == 0, 0.1, block)
+            np.divide(1, block, out=block)
+            np.power(block, self.beta, out=visibility[start : start + step])
+        return visibility
+
+    def _add_pheromone(self, tours, costs, weight=1):
+        """
+        Adds the pheromone of the given tours on their edges with one scatter-add
+
+        :param tours: array of shape (m, n) with the positions of the vertices of each tour.
+        :param costs: array with the cost of each tour.
+        :param weight: the weight of the deposit.
+        """
+        tours = np.atleast_2d(tours)
+        deposits = weight * self.pheromone_deposit / np.asarray(costs, dtype=np.float64)
+        np.add.at(
+            self.pheromone,
+            (tours, np.roll(tours, -1, axis=1)),
+            deposits[:, np.newaxis],
+        )
+
+    def _calculate_costs(self):
+        """
+        Calculates the cost of the solutions of all the ants at once
+        """
+        costs = self.graph.get_tour_costs([ant.tour.order for ant in self.ants])
+        for ant, cost in zip(self.ants, costs.tolist()):
+            ant.cost = cost
 
     def get_best(self):
         best = self.ants[0]
@@ -186,15 +210,18 @@ class AntColonyOptimization(BaseSolver):
                 frac += 0.1
 
             if i != 0:
-                for edge in self.graph.edges_collection:
-                    self.graph.edges_collection[
-                        edge
-                    ].pheromone = self.graph.edges_collection[edge].pheromone * (
-                        1 - self.rho
-                    )
+                self.pheromone *= 1 - self.rho
 
             for ant in self.ants:
-                self._add_pheromone(ant.find_solution(), ant.get_cost(), 2)
+                ant.find_solution()
+            self._calculate_costs()
+
+            self._add_pheromone(
+                [ant.tour.order for ant in self.ants],
+                [ant.cost for ant in self.ants],
+                2,
+            )
+            for ant in self.ants:
                 if ant.cost < self.best_cost:
                     self.best_solution = ant.solution
                     self.best_cost = ant.cost
@@ -262,7 +289,7 @@ class AntColonyOptimization(BaseSolver):
             )
             self.graph.plot_solution(
                 self.best_solution,
-                pheromones=True,
+                pheromones=self.pheromone,
                 filename=filename,
                 title=title,
             )
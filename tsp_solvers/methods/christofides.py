@@ -1,44 +1,124 @@
 """
-
+This file contains the main logic for the Christofides heuristic.
+Each stage works on arrays of positions of the graph: the parents of the minimum spanning tree,
+the vertices with odd degree on it, the edges of their matching and the Euler tour,
+so the graph is never copied.
 """
 
-import copy
+# Import from libraries
+import datetime
+
+import numpy as np
 
-from .base import BaseSolver
+# Import from internal modules
+from tsp_solvers.graph import Tour
+from tsp_solvers.graph.euler import euler_tour, shortcut
+from tsp_solvers.graph.graph import MATCHING_METHODS
+from tsp_solvers.methods.base import BaseSolver
+
+# Maximum number of odd vertices for which the exact matching is used by default
+# and the greedy matching is compared with the exact one. It takes a few seconds at the limit.
+EXACT_LIMIT = 500
 
 
 class Christofides(BaseSolver):
     # Only works on symmetric and completed graphs
-    def __init__(self, graph, verbose=0):
+    def __init__(self, graph, tree="prim", k=10, matching=None, passes=3, verbose=0):
+        """
+        :param graph: the graph to solve.
+        :param tree: the method of the minimum spanning tree, "prim" or "kruskal".
+          See Graph.get_minimum_spanning_tree.
+        :param k: the number of neighbours of the candidate edges of the matching and of kruskal.
+        :param matching: the method of the matching, "exact", "blossom" or "greedy".
+          See Graph.get_minimum_weight_perfect_matching. By default it is "exact" when there are
+          at most EXACT_LIMIT odd vertices and "blossom" otherwise. Only the exact matching keeps
+          the guarantee of a tour at most 1.5 times the optimal one, "blossom" and "greedy" only
+          search the candidate edges and give it up for speed. With "greedy" the cost of
+          the exact matching is also calculated when there are at most EXACT_LIMIT odd vertices.
+        :param passes: the maximum number of improvement passes of the greedy matching.
+        :param verbose: if True the solution is printed at the end.
+        """
+        if matching is not None and matching not in MATCHING_METHODS:
+            raise ValueError(
+                "The matching has to be one of {}".format(", ".join(MATCHING_METHODS))
+            )
         super().__init__()
         self.graph = graph
+        self.tree = tree
+        self.k = k
+        self.matching_method = matching
+        self.passes = passes
         self.verbose = verbose
+        self.cost = float("Inf")
         self.solution = None
-        self.MST = None  # T
+        self.tour = None
+        self.parents = None  # T
         self.odd_vertices = None  # O
-        self.MWPM = None  # M
+        self.matching = None  # M
+        self.matching_cost = None
+        self.exact_matching_cost = None
+
+    def get_best(self):
+        print("\nChristofides:")
+        print(f"Best solution: {self.cost} \t|\t Time: {self.time}")
+        if self.exact_matching_cost is not None:
+            print(
+                f"Matching: {self.matching_cost} \t|\t Exact matching: {self.exact_matching_cost}"
+            )
 
     def run(self):
-        # Calculate minimum spanning tree (MST)
-        # Subset O vertices of odd degree and calculate full graph
-        # TODO: Construct minim weight perfect matching M
-        # TODO: Unite graphs
-        # TODO: Calculate Euler tour
-        # TODO: Fix euler tour
+        initial_time = datetime.datetime.utcnow()
         self._get_minimum_spanning_tree()
-        self._get_odd_graph()
+        self._get_odd_vertices()
         self._get_minimum_weight_perfect_matching()
-        pass
+        self._get_tour()
+        self.time = datetime.datetime.utcnow() - initial_time
+        if self.verbose:
+            self.get_best()
+
+    def save(self, file):
+        text = "Christofides. Best solution: " + str(self.cost) + "\n"
+        with open(file, "a") as f:
+            f.write(text)
 
     def _get_minimum_spanning_tree(self):
-        self.MST = copy.deepcopy(self.graph)
-        self.MST.create_minimum_spanning_tree()
+        self.parents = self.graph.get_minimum_spanning_tree(self.tree, self.k)
 
-    def _get_odd_graph(self):
-        self.odd_vertices = copy.deepcopy(self.MST)
-        self.odd_vertices.create_full_odd_graph()
-        self.odd_vertices.plot_edges()
+    def _get_odd_vertices(self):
+        children = np.flatnonzero(self.parents >= 0)
+        degrees = np.bincount(
+            np.concatenate((children, self.parents[children])),
+            minlength=self.graph.number_vertices,
+        )
+        self.odd_vertices = np.flatnonzero(degrees % 2)
 
     def _get_minimum_weight_perfect_matching(self):
-        self.MWPM = copy.deepcopy(self.odd_vertices)
-        self.MWPM.create_minimum_weight_perfect_matching()
+        method = self.matching_method
+        if method is None:
+            method = "exact" if len(self.odd_vertices) <= EXACT_LIMIT else "blossom"
+        self.matching = self.graph.get_minimum_weight_perfect_matching(
+            self.odd_vertices, method, self.k, self.passes
+        )
+        self.matching_cost = self._get_matching_cost(self.matching)
+        if method == "greedy" and len(self.odd_vertices) <= EXACT_LIMIT:
+            exact = self.graph.get_minimum_weight_perfect_matching(
+                self.odd_vertices, "exact"
+            )
+            self.exact_matching_cost = self._get_matching_cost(exact)
+        elif method == "exact":
+            self.exact_matching_cost = self.matching_cost
+
+    def _get_matching_cost(self, matching):
+        return float(self.graph.distances.batch(*matching).sum())
+
+    def _get_tour(self):
+        # The tree and the matching together have all the degrees even
+        children = np.flatnonzero(self.parents >= 0)
+        walk = euler_tour(
+            self.graph.number_vertices,
+            np.concatenate((children, self.matching[0])),
+            np.concatenate((self.parents[children], self.matching[1])),
+        )
+        self.tour = Tour(shortcut(walk))
+        self.solution = self.tour.to_path(self.graph)
+        self.cost = self.graph.get_cost(self.solution)
@@ -9,8 +9,10 @@ import datetime
 import random
 import sys
 
+import numpy as np
+
 # Import from internal modules
-from tsp_solvers.initializers import NearestNeighbor, RandomInitializer
+from tsp_solvers.initializers import create_initializer
 from tsp_solvers.methods.base import BaseSolver
 
 
@@ -115,23 +117,18 @@ class GeneticAlgorithm(BaseSolver):
                     "Matplotlib has to be installed to be able to plot!"
                 )
         self.init = init
-        self.initializer = None
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph, self.population_size)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph, self.population_size)
+        self.initializer = create_initializer(
+            self.init, self.graph, self.population_size
+        )
 
         solutions = self.initializer.get_init()
         self.generation = 0
 
         self.individuals = [
-            Individual(
-                genes=solution,
-                cost=self.graph.get_solution_cost(solution),
-                idx=counter + self.id,
-            )
+            Individual(genes=solution, idx=counter + self.id)
             for counter, solution in enumerate(solutions)
         ]
+        self._calculate_costs(self.individuals)
         self.id += len(solutions)
 
     def get_best(self):
@@ -162,31 +159,25 @@ class GeneticAlgorithm(BaseSolver):
 
     def _best_insertion(self, child, sub_solution):
         """"""
-        start = sub_solution[0]
-        end = sub_solution[-1]
+        start = self.graph.vertices_position[sub_solution[0].idx]
+        end = self.graph.vertices_position[sub_solution[-1].idx]
+        genes = self.graph.get_positions(child.genes)
+        following = np.roll(genes, -1)
+
+        # The payoff of inserting the sub solution after each gene, the last one closes the tour
+        payoffs = (
+            self.graph.distances.batch(genes, following)
+            - self.graph.distances.batch(genes, start)
+            - self.graph.distances.batch(end, following)
+        )
+
         best_payoff = float("-inf")
         j = 0
-        for i in range(0, len(child.genes) - 1):
-            payoff = (
-                self.graph.edges_collection[
-                    (child.genes[i].idx, child.genes[i + 1].idx)
-                ].cost
-                - self.graph.edges_collection[(child.genes[i].idx, start.idx)].cost
-                - self.graph.edges_collection[(end.idx, child.genes[i + 1].idx)].cost
-            )
-
-            if payoff > best_payoff:
-                best_payoff = payoff
-                j = i
-
-        payoff = (
-            self.graph.edges_collection[(child.genes[-1].idx, child.genes[0].idx)].cost
-            - self.graph.edges_collection[(child.genes[-1].idx, start.idx)].cost
-            - self.graph.edges_collection[(end.idx, child.genes[0].idx)].cost
-        )
+        if len(genes) > 1:
+            j = int(np.argmax(payoffs[:-1]))
+            best_payoff = payoffs[j]
 
-        if payoff > best_payoff:
-            best_payoff = payoff
+        if payoffs[-1] > best_payoff:
             j = -1
 
         return j
@@ -209,7 +200,6 @@ class GeneticAlgorithm(BaseSolver):
 
             n = self._best_insertion(child, sub_solution)
             child.insert_sub_solution(sub_solution, n)
-            child.cost = self.graph.get_solution_cost(child.genes)
             self.children.append(child)
 
     def _selection(self):
@@ -227,9 +217,21 @@ class GeneticAlgorithm(BaseSolver):
             prob = random.uniform(0, 1)
             if prob < self.mutation_probability:
                 self.children[i].mutate()
-                self.children[i].cost = self.graph.get_solution_cost(
-                    self.children[i].genes
-                )
+        self._calculate_costs(self.children)
+
+    def _calculate_costs(self, individuals):
+        """
+        Calculates the cost of all the individuals at once
+        """
+        if not individuals:
+            return
+        tours = [
+            self.graph.get_positions(individual.genes)
+            for individual in individuals
+        ]
+        costs = self.graph.get_tour_costs(tours)
+        for individual, cost in zip(individuals, costs.tolist()):
+            individual.set_cost(cost)
 
     def _substitution(self):
         """"""
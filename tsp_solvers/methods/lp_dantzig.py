@@ -10,6 +10,7 @@ from pulp import (
 )
 from pytups import SuperDict
 
+from tsp_solvers.graph.disjoint_set import connected_components
 from tsp_solvers.methods.base import BaseSolver
 
 
@@ -109,34 +110,19 @@ class LinearIntegerDantzig(BaseSolver):
             )
 
     def find_subtours(self, travels):
-        unvisited = [vertex.idx for vertex in self.vertices_list]
-        temp = list(travels)
-        start = temp[0][0]
-        end = temp[0][1]
-        temp = temp[1:]
-        unvisited.remove(start)
-        subtour = [start]
-        subtours = []
-        while unvisited:
-            check = False
-            for travel in temp:
-                if travel[0] == end:
-                    start = travel[0]
-                    end = travel[1]
-                    unvisited.remove(start)
-                    subtour.append(start)
-                    temp.remove(travel)
-                    check = True
-                    break
-            if check is False:
-                subtours.append(subtour)
-                start = temp[0][0]
-                end = temp[0][1]
-                temp = temp[1:]
-                unvisited.remove(start)
-                subtour = [start]
-        subtours.append(subtour)
-        return subtours
+        """
+        Returns the lists with the idx of the vertices of each subtour of the travels
+        """
+        positions = self.graph.vertices_position
+        components = connected_components(
+            len(self.vertices_list),
+            [positions[origin] for origin, _ in travels],
+            [positions[destination] for _, destination in travels],
+        )
+        return [
+            [self.vertices_list[position].idx for position in component]
+            for component in components
+        ]
 
     def add_subtour_constraint(self, subtours):
         for subtour in subtours:
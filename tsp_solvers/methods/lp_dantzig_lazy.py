@@ -5,6 +5,7 @@ from gurobipy import GRB
 import gurobipy as gp
 from pulp import LpProblem, LpMinimize, GUROBI, value
 
+from tsp_solvers.graph.disjoint_set import connected_components
 from tsp_solvers.methods.lp_dantzig import LinearIntegerDantzig
 
 import logging
@@ -77,19 +78,16 @@ def eliminate_subtours(model):
 
     edges = [v for k, v in vars.items() if values[k] > 0.5]
 
-    unvisited = list(set(value for tpl in vars.values() for value in tpl))
-    cycles = []
-
-    while unvisited:
-        temp_cycle = []
-        neighbors = unvisited
-        while neighbors:
-            current = neighbors[0]
-            temp_cycle.append(current)
-            unvisited.remove(current)
-            neighbors = [j for i, j in edges if i == current and j in unvisited]
-
-        cycles.append(temp_cycle)
+    vertices = sorted(set(value for tpl in vars.values() for value in tpl))
+    positions = {vertex: position for position, vertex in enumerate(vertices)}
+    components = connected_components(
+        len(vertices),
+        [positions[i] for i, _ in edges],
+        [positions[j] for _, j in edges],
+    )
+    cycles = [
+        [vertices[position] for position in component] for component in components
+    ]
 
     obj_value = model.cbGet(GRB.Callback.MIPSOL_OBJ)
     obj_bst = model.cbGet(GRB.Callback.MIPSOL_OBJBST)
@@ -104,7 +102,8 @@ def eliminate_subtours(model):
 
     # cycle = cycles[0]
     for cycle in cycles:
-        edges_on_cycle = [(x, y) for x, y in zip(cycle, cycle[1:] + [cycle[0]])]
+        members = set(cycle)
+        edges_on_cycle = [(x, y) for x, y in edges if x in members]
         model.cbLazy(
             gp.quicksum(vars_list[vars_reverse[edge]] for edge in edges_on_cycle)
             <= len(cycle) - 1
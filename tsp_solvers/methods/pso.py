@@ -1,16 +1,23 @@
-import copy
 import datetime
 import random
 import sys
 
-from ..initializers import NearestNeighbor, RandomInitializer
+from ..graph import Tour
+from ..initializers import create_initializer
 
 
 class Particle:
-    def __init__(self, solution, cost):
-        self.solution = solution
+    def __init__(self, tour, cost, graph):
+        """
+        :param tour: the Tour of the particle.
+        :param cost: the cost of the tour.
+        :param graph: the graph of the tour, used to give the solutions as lists of vertices.
+        """
+        self.tour = tour
+        self.solution = tour.to_path(graph)
         self.cost = cost
-        self.best_solution = solution
+        self.best_tour = tour.copy()
+        self.best_solution = self.solution
         self.best_cost = cost
 
         self.velocity = []
@@ -49,17 +56,15 @@ class ParticleSwarmOptimization:
         self.init = init
         self.initializer = None
 
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph, self.population_size)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph, self.population_size)
+        self.initializer = create_initializer(
+            self.init, self.graph, self.population_size
+        )
 
-        solutions = self.initializer.get_init()
+        tours = [Tour(order) for order in self.initializer.get_tours()]
 
-        for solution in solutions:
-            particle = Particle(
-                solution=solution, cost=graph.get_solution_cost(solution)
-            )
+        costs = graph.get_tour_costs([tour.order for tour in tours])
+        for tour, cost in zip(tours, costs.tolist()):
+            particle = Particle(tour=tour, cost=cost, graph=graph)
             self.particles.append(particle)
 
         self.population_size = len(self.particles)
@@ -70,7 +75,12 @@ class ParticleSwarmOptimization:
             if particle.cost < best.cost:
                 best = particle
         print("\nPSO:")
-        print("Best solution: ", str(best.solution), "\t|\tcost: ", str(best.cost))
+        print(
+            "Best solution: ",
+            str(best.solution),
+            "\t|\tcost: ",
+            str(best.cost),
+        )
 
     def show(self):
         print("\nSOLUTION:")
@@ -117,54 +127,40 @@ class ParticleSwarmOptimization:
             for particle in self.particles:
                 particle.reset_velocity()
                 temp_velocity = []
-                best_population = copy.copy(self.best.best_solution)
-                best_particle = particle.best_solution
-                solution_particle = particle.solution
-
-                for v in range(self.graph.number_vertices):
-                    if solution_particle[v] != best_particle[v]:
-                        swap = (
-                            v,
-                            best_particle.index(solution_particle[v]),
-                            self.alpha,
-                        )
-
-                        temp_velocity.append(swap)
-
-                        aux = best_particle[swap[0]]
-                        best_particle[swap[0]] = best_particle[swap[1]]
-                        best_particle[swap[1]] = aux
-
-                for v in range(self.graph.number_vertices):
-                    if solution_particle[v] != best_population[v]:
-                        swap = (
-                            v,
-                            best_population.index(solution_particle[v]),
-                            self.beta,
-                        )
-
-                        temp_velocity.append(swap)
-
-                        aux = best_population[swap[0]]
-                        best_population[swap[0]] = best_population[swap[1]]
-                        best_population[swap[1]] = aux
+                best_population = self.best.best_tour.copy()
+                best_particle = particle.best_tour.copy()
+                tour_particle = particle.tour
+                vertices = tour_particle.order.tolist()
+
+                # The index of each vertex on the best solutions is taken from their tours
+                for best, weight in (
+                    (best_particle, self.alpha),
+                    (best_population, self.beta),
+                ):
+                    for v in range(self.graph.number_vertices):
+                        if vertices[v] != best.order.item(v):
+                            swap = (v, best.index.item(vertices[v]), weight)
+                            temp_velocity.append(swap)
+                            best.swap(swap[0], swap[1])
 
                 particle.velocity = temp_velocity
 
                 for w in temp_velocity:
                     if random.random() <= w[2]:
-                        aux = solution_particle[w[0]]
-                        solution_particle[w[0]] = solution_particle[w[1]]
-                        solution_particle[w[1]] = aux
+                        tour_particle.swap(w[0], w[1])
 
-                particle.solution = solution_particle
+                particle.tour = tour_particle
+                particle.solution = tour_particle.to_path(self.graph)
 
-                current_cost = self.graph.get_solution_cost(solution_particle)
+            # The new solutions of all the particles are evaluated at once
+            costs = self.graph.get_tour_costs([p.tour.order for p in self.particles])
+            for particle, current_cost in zip(self.particles, costs.tolist()):
                 particle.cost = current_cost
 
                 if current_cost < particle.best_cost:
                     particle.best_cost = current_cost
-                    particle.best_solution = solution_particle
+                    particle.best_tour = particle.tour.copy()
+                    particle.best_solution = particle.solution
 
             if self.plot:
                 if (i + 1) in plot_interval:
@@ -182,7 +178,9 @@ class ParticleSwarmOptimization:
                         + str(round(particle.best_cost, 2))
                     )
                     self.graph.plot_solution(
-                        particle.best_solution, filename=filename, title=title
+                        particle.best_solution,
+                        filename=filename,
+                        title=title,
                     )
 
             if (datetime.datetime.utcnow() - initial_time).seconds > self.max_time:
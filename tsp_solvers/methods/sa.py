@@ -1,6 +1,6 @@
 import sys
 
-from ..initializers import RandomInitializer, NearestNeighbor
+from ..initializers import create_initializer
 
 
 class SimulatedAnnealing:
@@ -21,10 +21,7 @@ class SimulatedAnnealing:
                     "Matplotlib has to be installed to be able to plot!"
                 )
 
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph, 1)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph, 1)
+        self.initializer = create_initializer(self.init, self.graph, 1)
 
         self.solution = self.initializer.get_init()[0]
         self.cost = self.graph.get_solution_cost(self.solution)
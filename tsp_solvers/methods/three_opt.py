@@ -1,7 +1,8 @@
 import sys
 from datetime import datetime
 
-from tsp_solvers.initializers import NearestNeighbor, RandomInitializer
+from tsp_solvers.graph import Tour
+from tsp_solvers.initializers import create_initializer
 from tsp_solvers.methods.base import BaseSolver
 
 
@@ -21,12 +22,10 @@ class ThreeOpt(BaseSolver):
         self.initializer = None
         self.cost = float("Inf")
         self.count = 0
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph)
+        self.initializer = create_initializer(self.init, self.graph)
 
         self.solution = self.initializer.get_init()[0]
+        self.tour = Tour.from_path(self.graph, self.solution)
         self.cost = self.graph.get_cost(self.solution)
 
     def get_best(self):
@@ -45,69 +44,51 @@ class ThreeOpt(BaseSolver):
             break
 
         self.time = datetime.utcnow() - initial_time
+        self.solution = self.tour.to_path(self.graph)
         self.cost = self.graph.get_cost(self.solution)
 
     def reverse_if_better(self, i, j, k):
+        order = self.tour.order.item
         a, b, c, d, e, f = (
-            self.solution[i - 1],
-            self.solution[i],
-            self.solution[j - 1],
-            self.solution[j],
-            self.solution[k - 1],
-            self.solution[k % len(self.solution)],
+            order(i - 1),
+            order(i),
+            order(j - 1),
+            order(j),
+            order(k - 1),
+            order(k % len(self.tour)),
         )
+        cost = self.graph.distances.cost
 
-        d0 = (
-            self.graph.calculate_cost(a, b)
-            + self.graph.calculate_cost(c, d)
-            + self.graph.calculate_cost(e, f)
-        )
+        d0 = cost(a, b) + cost(c, d) + cost(e, f)
 
-        d1 = (
-            self.graph.calculate_cost(a, c)
-            + self.graph.calculate_cost(b, d)
-            + self.graph.calculate_cost(e, f)
-        )
+        d1 = cost(a, c) + cost(b, d) + cost(e, f)
 
-        d2 = (
-            self.graph.calculate_cost(a, b)
-            + self.graph.calculate_cost(c, e)
-            + self.graph.calculate_cost(d, f)
-        )
+        d2 = cost(a, b) + cost(c, e) + cost(d, f)
 
-        d3 = (
-            self.graph.calculate_cost(a, d)
-            + self.graph.calculate_cost(e, b)
-            + self.graph.calculate_cost(c, f)
-        )
+        d3 = cost(a, d) + cost(e, b) + cost(c, f)
 
-        d4 = (
-            self.graph.calculate_cost(f, b)
-            + self.graph.calculate_cost(c, d)
-            + self.graph.calculate_cost(e, a)
-        )
+        d4 = cost(f, b) + cost(c, d) + cost(e, a)
 
         if d0 > d1:
-            self.solution[i:j] = reversed(self.solution[i:j])
+            self.tour.reverse(i, j - 1)
             self.count += 1
             self.plot_solution()
             return -d0 + d1
 
         elif d0 > d2:
-            self.solution[j:k] = reversed(self.solution[j:k])
+            self.tour.reverse(j, k - 1)
             self.count += 1
             self.plot_solution()
             return -d0 + d2
 
         elif d0 > d4:
-            self.solution[i:k] = reversed(self.solution[i:k])
+            self.tour.reverse(i, k - 1)
             self.count += 1
             self.plot_solution()
             return -d0 + d4
 
         elif d0 > d3:
-            tmp = self.solution[j:k] + self.solution[i:j]
-            self.solution[i:k] = tmp
+            self.tour.exchange(i, j, k)
             self.count += 1
             self.plot_solution()
             return -d0 + d3
@@ -126,6 +107,7 @@ class ThreeOpt(BaseSolver):
     def plot_solution(self):
         if self.plot:
             filename = f"plots/three_opt_{self.graph.number_vertices}_{self.count}.png"
+            self.solution = self.tour.to_path(self.graph)
             self.cost = self.graph.get_cost(self.solution)
             title = "Three opt " + "\n Solution cost: " + str(round(self.cost, 2))
             self.graph.plot_solution(
@@ -5,19 +5,56 @@ This file contains the main logic for the two opt heuristic
 # Import from libraries
 import datetime
 import sys
+from collections import deque
+
+import numpy as np
 
 # Import from internal modules
-from tsp_solvers.initializers import NearestNeighbor, RandomInitializer
+from tsp_solvers.graph import Tour
+from tsp_solvers.initializers import create_initializer
 from tsp_solvers.methods.base import BaseSolver
 
+METHODS = ("neighbors", "best", "exhaustive")
+# Minimum gain of a move, so rounding errors do not make the search cycle
+EPSILON = 1e-9
+# Number of vertices processed between two checks of the time
+CHECK_INTERVAL = 256
+# Maximum number of gains calculated at once by the best method
+BLOCK_SIZE = 2**15
+
 
 class TwoOpt(BaseSolver):
-    def __init__(self, graph, max_time, init="random", plot=False):
+    """
+    2-opt local search, which reverses segments of the tour while that makes it shorter.
+    With the neighbors method only the moves that add an edge from a vertex to one of its k
+    nearest neighbours are tried, and the vertices are processed from a queue with the ones
+    next to the last moves, so the vertices that did not have an improving move are not tried
+    again until one of their edges changes (don't look bits). It runs to a local optimum.
+    With the best method, for each edge of the tour the gains of the moves with all the edges
+    after it are calculated at once with arrays and the best one is applied, on passes over
+    the tour until a pass does not improve it.
+    With the exhaustive method all the pairs of edges of the tour are tried on each pass,
+    until a pass does not improve the tour.
+    """
+
+    def __init__(
+        self, graph, max_time, init="random", plot=False, method="neighbors", k=10
+    ):
+        """
+        :param method: "neighbors", "best" or "exhaustive".
+        :param k: number of candidate neighbours of each vertex for the neighbors method.
+        """
         super().__init__()
+        if method not in METHODS:
+            raise ValueError(
+                "The method has to be one of {}".format(", ".join(METHODS))
+            )
         self.graph = graph
         self.max_time = max_time
         self.init = init
         self.plot = plot
+        self.method = method
+        self.k = k
         if self.plot:
             if "matplotlib" not in sys.modules:
                 raise ModuleNotFoundError(
@@ -27,12 +64,10 @@ class TwoOpt(BaseSolver):
         self.initializer = None
         self.cost = float("Inf")
         self.count = 0
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph)
+        self.initializer = create_initializer(self.init, self.graph)
 
         self.solution = self.initializer.get_init()[0]
+        self.tour = Tour.from_path(self.graph, self.solution)
         self.cost = self.graph.get_cost(self.solution)
 
     def get_best(self):
@@ -43,14 +78,135 @@ class TwoOpt(BaseSolver):
 
     def run(self):
         initial_time = datetime.datetime.utcnow()
-        count = 0
-        while (datetime.datetime.utcnow() - initial_time).seconds <= self.max_time:
-            delta = 0
-            for a, b in self.all_segments(len(self.solution)):
-                delta += self.reverse_if_better(a, b)
-            break
+        if self.method == "neighbors":
+            self._run_neighbors(initial_time)
+        elif self.method == "best":
+            self._run_best(initial_time)
+        else:
+            while (datetime.datetime.utcnow() - initial_time).seconds <= self.max_time:
+                delta = 0
+                for a, b in self.all_segments(len(self.solution)):
+                    delta += self.reverse_if_better(a, b)
+                if delta == 0:
+                    break
         self.time = datetime.datetime.utcnow() - initial_time
-        self.cost = self.graph.get_cost(self.solution)
+        self.solution = self.tour.to_path(self.graph)
+
+    def _run_neighbors(self, initial_time):
+        tour = self.tour
+        cost = self.graph.distances.cost
+        neighbors = self.graph.get_neighbors(self.k).tolist()
+        queue = deque(tour.order.tolist())
+        queued = [True] * len(tour)
+        processed = 0
+
+        while queue:
+            processed += 1
+            if processed % CHECK_INTERVAL == 0:
+                elapsed = datetime.datetime.utcnow() - initial_time
+                if elapsed.seconds > self.max_time:
+                    break
+            a = queue.popleft()
+            queued[a] = False
+            move = self._find_move(a, neighbors[a], cost)
+            if move is None:
+                continue
+
+            delta, forward, b, c, d = move
+            if forward:
+                # The edges (a, b) and (c, d) become (a, c) and (b, d)
+                tour.reverse(tour.index.item(b), tour.index.item(c))
+            else:
+                # The edges (b, a) and (d, c) become (c, a) and (d, b)
+                tour.reverse(tour.index.item(a), tour.index.item(d))
+            self.cost += delta
+            self.count += 1
+            self.plot_solution()
+            for vertex in (a, b, c, d):
+                if not queued[vertex]:
+                    queued[vertex] = True
+                    queue.append(vertex)
+
+    def _run_best(self, initial_time):
+        tour = self.tour
+        order = tour.order
+        n = len(order)
+        batch = self.graph.distances.batch
+        indices = np.arange(n)
+        following = (indices + 1) % n
+        # The cost of the edge that goes from each index of the order to the next one
+        lengths = batch(order, order[following])
+        step = max(1, BLOCK_SIZE // n)
+        # The blocks of rows grow while there are no moves and shrink after each move
+        size = 1
+
+        improved = n > 3
+        while improved:
+            if (datetime.datetime.utcnow() - initial_time).seconds > self.max_time:
+                break
+            improved = False
+            i = 0
+            while i < n - 2:
+                # The edge (a, b) at each row is exchanged with each edge (c, d) at j > i + 1
+                # for (a, c) and (b, d). The last edge shares a with the first one.
+                rows = indices[i : min(i + size, n - 2), np.newaxis]
+                start = i + 2
+                gains = (
+                    lengths[rows]
+                    + lengths[start:]
+                    - batch(order[rows], order[start:])
+                    - batch(order[following[rows]], order[following[start:]])
+                )
+                gains[indices[start:] < rows + 2] = -np.inf
+                if i == 0:
+                    gains[0, -1] = -np.inf
+                best = np.argmax(gains, axis=1)
+                improving = np.flatnonzero(gains[indices[: len(rows)], best] > EPSILON)
+                if len(improving) == 0:
+                    i += len(rows)
+                    size = min(2 * size, step)
+                    continue
+
+                # The rows after the first improving one are not valid after its move
+                i = i + improving.item(0)
+                j = start + best.item(improving.item(0))
+                tour.reverse(i + 1, j)
+                # Only the edges inside the reversed side and next to it have changed
+                if 2 * (j - i) > n:
+                    changed = np.arange(j, i + n + 1) % n
+                else:
+                    changed = np.arange(i, j + 1)
+                lengths[changed] = batch(order[changed], order[following[changed]])
+                self.cost -= gains.item(improving.item(0), j - start)
+                self.count += 1
+                self.plot_solution()
+                improved = True
+                i += 1
+                size = max(1, size // 2)
+
+    def _find_move(self, a, neighbors, cost):
+        """
+        Returns the first improving move that adds an edge from a to one of its neighbours,
+        as a tuple with the change of cost, whether the edges removed are the ones after a and c
+        or before them, and the vertices b, c and d, or None if there is no improving move.
+        The neighbours are sorted by distance, so the search stops at the first one that is
+        farther than the vertex next to a.
+        """
+        tour = self.tour
+        for forward in (True, False):
+            b = tour.next(a) if forward else tour.prev(a)
+            removed = cost(a, b)
+            for c in neighbors:
+                added = cost(a, c)
+                if added >= removed:
+                    break
+                d = tour.next(c) if forward else tour.prev(c)
+                if c == b or d == a:
+                    continue
+                delta = added + cost(b, d) - removed - cost(c, d)
+                if delta < -EPSILON:
+                    return delta, forward, b, c, d
+        return None
 
     def save(self, file):
         text = (
@@ -66,32 +222,35 @@ class TwoOpt(BaseSolver):
             myfile.write(text)
 
     def reverse_if_better(self, i, j):
+        order = self.tour.order.item
         a, b, c, d = (
-            self.solution[i - 1],
-            self.solution[i],
-            self.solution[j - 1],
-            self.solution[j % len(self.solution)],
+            order(i - 1),
+            order(i),
+            order(j - 1),
+            order(j % len(self.tour)),
         )
-        d0 = self.graph.calculate_cost(a, b) + self.graph.calculate_cost(c, d)
+        cost = self.graph.distances.cost
+        d0 = cost(a, b) + cost(c, d)
 
-        d1 = self.graph.calculate_cost(a, c) + self.graph.calculate_cost(b, d)
+        d1 = cost(a, c) + cost(b, d)
 
         if d0 > d1:
-            self.solution[i:j] = reversed(self.solution[i:j])
+            self.tour.reverse(i, j - 1)
             self.count += 1
-            if self.plot:
-                filename = (
-                    f"plots/two_opt_{self.graph.number_vertices}_{self.count}.png"
-                )
-                self.cost = self.graph.get_cost(self.solution)
-                title = "Two opt " + "\n Solution cost: " + str(round(self.cost, 2))
-                self.graph.plot_solution(
-                    self.solution, pheromones=False, filename=filename, title=title
-                )
-
+            self.cost += d1 - d0
+            self.plot_solution()
             return -d0 + d1
         return 0
 
     @staticmethod
     def all_segments(n: int):
         return ((i, j) for i in range(n) for j in range(i + 2, n))
+
+    def plot_solution(self):
+        if self.plot:
+            filename = f"plots/two_opt_{self.graph.number_vertices}_{self.count}.png"
+            self.solution = self.tour.to_path(self.graph)
+            title = "Two opt " + "\n Solution cost: " + str(round(self.cost, 2))
+            self.graph.plot_solution(
+                self.solution, pheromones=False, filename=filename, title=title
+            )
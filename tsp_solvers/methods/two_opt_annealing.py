@@ -7,7 +7,8 @@ from datetime import datetime
 from random import random
 
 # Import from internal modules
-from tsp_solvers.initializers import NearestNeighbor, RandomInitializer
+from tsp_solvers.graph import Tour
+from tsp_solvers.initializers import create_initializer
 from tsp_solvers.methods.base import BaseSolver
 
 
@@ -28,12 +29,10 @@ class SimulatedAnnealingTwoOpt(BaseSolver):
         self.cost = float("Inf")
         self.good_count = 0
         self.bad_count = 0
-        if self.init == "random":
-            self.initializer = RandomInitializer(self.graph)
-        elif self.init == "nearest":
-            self.initializer = NearestNeighbor(self.graph)
+        self.initializer = create_initializer(self.init, self.graph)
 
         self.solution = self.initializer.get_init()[0]
+        self.tour = Tour.from_path(self.graph, self.solution)
         self.cost = self.graph.get_cost(self.solution)
         self.temperature = 1
 
@@ -59,6 +58,7 @@ class SimulatedAnnealingTwoOpt(BaseSolver):
             self.temperature -= 0.33
 
         self.time = datetime.utcnow() - initial_time
+        self.solution = self.tour.to_path(self.graph)
         self.cost = self.graph.get_cost(self.solution)
 
     def save(self, file):
@@ -75,20 +75,22 @@ class SimulatedAnnealingTwoOpt(BaseSolver):
             myfile.write(text)
 
     def reverse_if_better(self, i, j):
+        order = self.tour.order.item
         a, b, c, d = (
-            self.solution[i - 1],
-            self.solution[i],
-            self.solution[j - 1],
-            self.solution[j % len(self.solution)],
+            order(i - 1),
+            order(i),
+            order(j - 1),
+            order(j % len(self.tour)),
         )
-        d0 = self.graph.calculate_cost(a, b) + self.graph.calculate_cost(c, d)
+        cost = self.graph.distances.cost
+        d0 = cost(a, b) + cost(c, d)
 
-        d1 = self.graph.calculate_cost(a, c) + self.graph.calculate_cost(b, d)
+        d1 = cost(a, c) + cost(b, d)
 
         rnd = random() <= self.temperature
 
         if d0 > d1 or (rnd and d0 * (1 + self.temperature) > d1):
-            self.solution[i:j] = reversed(self.solution[i:j])
+            self.tour.reverse(i, j - 1)
             if d0 > d1:
                 self.good_count += 1
             else:
@@ -96,6 +98,7 @@ class SimulatedAnnealingTwoOpt(BaseSolver):
 
             if self.plot:
                 filename = f"plots/sa_two_opt_{self.graph.number_vertices}_{self.good_count + self.bad_count}.png"
+                self.solution = self.tour.to_path(self.graph)
                 self.cost = self.graph.get_cost(self.solution)
                 title = "SA Two opt " + "\n Solution cost: " + str(round(self.cost, 2))
                 self.graph.plot_solution(
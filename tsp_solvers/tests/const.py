@@ -13,13 +13,11 @@ def get_test_file(relative_path):
 
 # For the 10 vertex problem
 GA_V10_COST = 54.557082002939914
-GA_V10_GENES = [3, 0, 6, 9, 2, 8, 4, 5, 7, 1]
+GA_V10_GENES = [8, 4, 5, 7, 1, 3, 0, 6, 9, 2]
 
 # For the 100 vertex problem
-GA_V100_COST = 1723.1183843940112
+GA_V100_COST = 1755.5631410335334
 GA_V100_GENES = [
-    12,
-    54,
     87,
     18,
     49,
@@ -27,23 +25,23 @@ GA_V100_GENES = [
     59,
     16,
     44,
+    78,
     69,
     74,
     80,
     37,
-    78,
     83,
     6,
     97,
     10,
     7,
     73,
-    17,
-    63,
-    14,
     3,
     19,
     65,
+    14,
+    63,
+    17,
     48,
     0,
     51,
@@ -52,10 +50,21 @@ GA_V100_GENES = [
     40,
     71,
     76,
-    70,
+    90,
     94,
     26,
     58,
+    22,
+    52,
+    66,
+    24,
+    82,
+    20,
+    43,
+    8,
+    4,
+    46,
+    68,
     88,
     72,
     9,
@@ -66,43 +75,17 @@ GA_V100_GENES = [
     91,
     23,
     86,
-    90,
+    70,
     60,
     64,
     85,
     42,
-    52,
-    66,
     79,
     2,
     36,
     61,
-    24,
-    82,
-    20,
-    22,
-    43,
-    8,
-    4,
-    46,
-    68,
-    35,
-    56,
-    57,
-    33,
-    84,
-    77,
-    38,
-    30,
-    81,
-    32,
-    27,
-    34,
-    21,
-    53,
-    25,
-    31,
     92,
+    31,
     75,
     98,
     28,
@@ -118,6 +101,23 @@ GA_V100_GENES = [
     96,
     62,
     45,
+    32,
+    27,
+    34,
+    21,
+    53,
+    25,
+    35,
+    56,
+    57,
+    33,
+    84,
+    77,
+    38,
+    30,
+    81,
+    12,
+    54,
 ]
 
 # For the 1000 vertex problem
@@ -0,0 +1,41 @@
+import random
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import AntColonyOptimization, Graph
+
+
+class ACOTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.g = Graph()
+        self.g.create_graph_from_json(get_test_file("./data/10v.json"))
+
+    def test_pheromone(self):
+        aco = AntColonyOptimization(graph=self.g, iterations=1, rho=0.5)
+        aco.run()
+        tours = np.array([ant.tour.order for ant in aco.ants])
+        costs = self.g.get_tour_costs(tours)
+        expected = np.ones((10, 10))
+        for tour, cost in zip(tours, costs):
+            for origin, destination in zip(tour, np.roll(tour, -1)):
+                expected[origin, destination] += 2 / cost
+        np.testing.assert_allclose(aco.pheromone, expected)
+        self.assertEqual(self.g.edges_collection[(0, 1)].pheromone, 0)
+
+        other = AntColonyOptimization(graph=self.g, iterations=5)
+        other.run()
+        self.assertIsNot(other.pheromone, aco.pheromone)
+        np.testing.assert_allclose(aco.pheromone, expected)
+        self.assertEqual(sorted(other.best_solution), sorted(self.g.vertices))
+
+    def test_visibility(self):
+        with patch("tsp_solvers.methods.aco.BLOCK_SIZE", 25):
+            aco = AntColonyOptimization(graph=self.g, beta=2)
+        distances = self.g.get_distance_matrix()
+        distances[distances == 0] = 0.1
+        np.testing.assert_allclose(aco.visibility, np.power(1 / distances, 2))
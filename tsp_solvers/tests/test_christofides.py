@@ -0,0 +1,109 @@
+import itertools
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Christofides, Graph
+from tsp_solvers.graph.euler import euler_tour, shortcut
+from tsp_solvers.graph.matching import max_weight_matching
+
+
+class ChristofidesTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+
+    def brute_force(self, n, edges):
+        weights = {(i, j): weight for i, j, weight in edges}
+        best = (0, 0)
+        for size in range(n // 2, 0, -1):
+            for chosen in itertools.combinations(weights, size):
+                ends = [v for edge in chosen for v in edge]
+                if len(set(ends)) == len(ends):
+                    best = max(best, (size, sum(weights[edge] for edge in chosen)))
+            if best[0]:
+                return best
+        return best
+
+    def test_matching(self):
+        for _ in range(200):
+            n = random.randint(2, 8)
+            edges = [
+                (i, j, random.randint(0, 20))
+                for i in range(n)
+                for j in range(i + 1, n)
+                if random.random() < 0.6
+            ]
+            weights = {(i, j): weight for i, j, weight in edges}
+            best = self.brute_force(n, edges)
+            for perfect in (False, True):
+                mate = max_weight_matching(edges, True, n, perfect)
+                self.assertTrue(
+                    all(mate[mate[v]] == v for v in range(n) if mate[v] != -1)
+                )
+                pairs = [(v, mate[v]) for v in range(n) if mate[v] > v]
+                result = (len(pairs), sum(weights[pair] for pair in pairs))
+                if not perfect or 2 * best[0] == n:
+                    self.assertEqual(result, best)
+
+    def test_exact_matching(self):
+        def minimum(vertices, matrix):
+            if not vertices:
+                return 0
+            first, rest = vertices[0], vertices[1:]
+            return min(
+                matrix[first, other] + minimum(rest[:i] + rest[i + 1 :], matrix)
+                for i, other in enumerate(rest)
+            )
+
+        g = Graph()
+        g.random_complete_graph(10, layout="clustered", seed=3)
+        matrix = g.distances.to_matrix()
+        origins, destinations = g.get_minimum_weight_perfect_matching(method="exact")
+        self.assertAlmostEqual(
+            matrix[origins, destinations].sum(), minimum(list(range(10)), matrix)
+        )
+
+    def test_euler_tour(self):
+        walk = euler_tour(5, [0, 1, 2, 0, 3, 4], [1, 2, 0, 3, 4, 0])
+        self.assertEqual(walk.tolist(), [0, 1, 2, 0, 3, 4, 0])
+        self.assertEqual(shortcut(walk).tolist(), [0, 1, 2, 3, 4])
+        self.assertRaises(ValueError, euler_tour, 3, [0, 1], [1, 2])
+
+    def test_christofides(self):
+        g = Graph()
+        g.create_graph_from_tsp(get_test_file("./data/ulysses16.tsp"))
+        c = Christofides(g)
+        c.run()
+        self.assertEqual(sorted(c.tour.order.tolist()), list(range(16)))
+        self.assertEqual(c.cost, g.get_cost(c.solution))
+        self.assertLessEqual(c.cost, 1.5 * 6859)
+
+    def test_large(self):
+        g = Graph()
+        g.random_complete_graph(2000, seed=1)
+        c = Christofides(g, tree="kruskal")
+        c.run()
+        self.assertEqual(sorted(c.tour.order.tolist()), list(range(2000)))
+        children = np.flatnonzero(c.parents >= 0)
+        tree = g.distances.batch(children, c.parents[children]).sum()
+        matching = g.distances.batch(*c.matching).sum()
+        self.assertLessEqual(c.cost, tree + matching + 1e-6)
+
+    def test_greedy_matching(self):
+        g = Graph()
+        g.random_complete_graph(1000, seed=2)
+        c = Christofides(g, matching="greedy")
+        c.run()
+        self.assertEqual(sorted(c.tour.order.tolist()), list(range(1000)))
+        self.assertEqual(
+            sorted(np.concatenate(c.matching).tolist()), c.odd_vertices.tolist()
+        )
+        self.assertGreaterEqual(c.matching_cost, c.exact_matching_cost - 1e-6)
+        candidates = g.get_minimum_weight_perfect_matching(c.odd_vertices, "blossom")
+        self.assertLessEqual(
+            c.exact_matching_cost, g.distances.batch(*candidates).sum() + 1e-6
+        )
+        self.assertRaises(ValueError, Christofides, g, matching="random")
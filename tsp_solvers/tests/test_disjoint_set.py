@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph
+from tsp_solvers.graph.disjoint_set import DisjointSet, connected_components
+
+
+class DisjointSetTestCase(TestCase):
+    def test_union_find(self):
+        sets = DisjointSet(6)
+        self.assertTrue(sets.union(0, 1))
+        self.assertTrue(sets.union(2, 3))
+        self.assertTrue(sets.union(1, 3))
+        self.assertFalse(sets.union(0, 2))
+        self.assertTrue(sets.connected(0, 3))
+        self.assertFalse(sets.connected(0, 4))
+        self.assertEqual(sets.count, 3)
+        self.assertEqual(sets.groups(), [[0, 1, 2, 3], [4], [5]])
+
+    def test_components(self):
+        components = connected_components(5, [0, 3, 1], [1, 4, 0])
+        self.assertEqual(components, [[0, 1], [2], [3, 4]])
+
+    def test_degrees(self):
+        g = Graph()
+        g.create_graph_from_json(get_test_file("./data/10v.json"))
+        g.create_minimum_spanning_tree()
+        g.add_edge(g.edges[0].destination, g.edges[0].origin)
+        g._calculate_vertices_degrees()
+        self.assertEqual(sum(vertex.degree for vertex in g.vertices), 18)
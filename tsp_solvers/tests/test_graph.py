@@ -0,0 +1,379 @@
+import json
+import multiprocessing
+import os
+import pickle
+import random
+import sqlite3
+import tempfile
+from math import dist
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph, Tour
+from tsp_solvers.graph import neighbors as neighbors_module
+from tsp_solvers.graph.cache import DiskCache
+
+
+class GraphTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.g = Graph()
+        self.g.create_graph_from_json(get_test_file("./data/10v.json"))
+
+    def test_distance_matrix(self):
+        matrix = self.g.get_distance_matrix()
+        self.assertIsInstance(matrix, np.ndarray)
+        self.assertEqual(matrix.shape, (10, 10))
+        for i in self.g.vertices:
+            for j in self.g.vertices:
+                self.assertEqual(
+                    self.g.get_edge_cost(i.idx, j.idx), dist((i.x, i.y), (j.x, j.y))
+                )
+
+    def test_edges_collection(self):
+        self.assertEqual(len(self.g.edges_collection), 90)
+        self.assertNotIn((1, 1), self.g.edges_collection)
+        edge = self.g.edges_collection[(1, 2)]
+        edge.pheromone = 3
+        self.assertEqual(self.g.edges_collection[(1, 2)].pheromone, 3)
+        self.assertEqual(edge.cost, self.g.get_edge_cost(1, 2))
+
+    def test_random_graph(self):
+        for layout in ["uniform", "clustered", "grid"]:
+            g = Graph()
+            g.random_complete_graph(200, layout, seed=3)
+            self.assertEqual(len(np.unique(g.coordinates, axis=0)), 200)
+            self.assertTrue((g.coordinates >= 0).all() and (g.coordinates <= 400).all())
+            same = Graph()
+            same.random_complete_graph(200, layout, seed=3)
+            np.testing.assert_array_equal(same.coordinates, g.coordinates)
+        self.assertRaises(ValueError, Graph().random_complete_graph, 50, scale=5)
+
+    def test_solution_cost(self):
+        path = self.g.get_random_paths(1)[0]
+        expected = sum(
+            self.g.calculate_cost(path[i - 1], path[i]) for i in range(1, len(path))
+        ) + self.g.calculate_cost(path[-1], path[0])
+        self.assertAlmostEqual(self.g.get_solution_cost(path), expected)
+
+    def test_tour_costs(self):
+        paths = self.g.get_random_paths(5)
+        tours = np.array([self.g.get_positions(path) for path in paths])
+        costs = self.g.get_tour_costs(tours)
+        self.assertEqual(costs.shape, (5,))
+        for path, tour, cost in zip(paths, tours, costs):
+            self.assertEqual(cost, self.g.get_solution_cost(path))
+            self.assertEqual(cost, self.g.get_tour_costs(tour))
+
+    def test_lazy_storage(self):
+        lazy = Graph(storage="lazy", cache_size=2)
+        lazy.create_graph_from_json(get_test_file("./data/10v.json"))
+        np.testing.assert_allclose(
+            lazy.get_distance_matrix(), self.g.get_distance_matrix()
+        )
+        for i in range(5):
+            np.testing.assert_allclose(lazy.distances.row(i), self.g.distances.row(i))
+        self.assertEqual(lazy.cache_info().currsize, 2)
+        lazy.distances.row(4)
+        self.assertEqual(lazy.cache_info().hits, 1)
+        self.assertIsNone(self.g.cache_info())
+        self.assertEqual(lazy.get_edge_cost(3, 7), self.g.get_edge_cost(3, 7))
+
+    def test_packed_storage(self):
+        matrix = self.g.get_distance_matrix()
+        packed = Graph(storage="packed", dtype="float32")
+        packed.create_graph_from_json(get_test_file("./data/10v.json"))
+        self.assertEqual(packed.distances.nbytes, 45 * 4)
+        np.testing.assert_allclose(packed.get_distance_matrix(), matrix, rtol=1e-6)
+        np.testing.assert_allclose(packed.distances.row(3), matrix[3], rtol=1e-6)
+        self.assertEqual(packed.distances.cost(2, 5), packed.distances.cost(5, 2))
+
+        rounded = Graph(dtype="int32")
+        rounded.create_graph_from_json(get_test_file("./data/10v.json"))
+        np.testing.assert_array_equal(
+            rounded.get_distance_matrix(), np.floor(matrix + 0.5)
+        )
+        path = self.g.vertices
+        self.assertEqual(
+            rounded.get_solution_cost(path),
+            sum(np.floor(matrix[np.arange(10), np.roll(np.arange(10), -1)] + 0.5)),
+        )
+        self.assertRaises(ValueError, Graph, storage="lazy", dtype="int32")
+
+    def test_binary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "10v.bin")
+            self.g.get_neighbors(3)
+            self.g.save_graph_to_binary(path)
+            loaded = Graph()
+            loaded.create_graph_from_binary(path, verify=True)
+            np.testing.assert_array_equal(
+                loaded.get_distance_matrix(), self.g.get_distance_matrix()
+            )
+            np.testing.assert_array_equal(loaded.coordinates, self.g.coordinates)
+            np.testing.assert_array_equal(loaded.neighbors, self.g.neighbors)
+            self.assertEqual(
+                [vertex.idx for vertex in loaded.vertices],
+                [vertex.idx for vertex in self.g.vertices],
+            )
+            del loaded
+
+            packed = Graph(storage="packed", dtype="float32")
+            packed.create_graph_from_json(get_test_file("./data/10v.json"))
+            packed.save_graph_to_binary(path)
+            loaded = Graph()
+            loaded.create_graph_from_binary(path, verify=True)
+            self.assertEqual(loaded.storage, "packed")
+            self.assertEqual(loaded.distances.values.dtype, np.float32)
+            # The distances are the memory mapped array of the file, not a copy
+            self.assertFalse(loaded.distances.values.flags.writeable)
+            self.assertEqual(loaded.distances.values.shape, (45,))
+            np.testing.assert_array_equal(
+                loaded.get_distance_matrix(), packed.get_distance_matrix()
+            )
+            del loaded
+
+    def test_neighbors(self):
+        matrix = self.g.get_distance_matrix()
+        neighbors = self.g.get_neighbors(4)
+        self.assertEqual(neighbors.shape, (10, 4))
+        for position, row in enumerate(neighbors):
+            self.assertNotIn(position, row)
+            expected = np.sort(np.delete(matrix[position], position))[:4]
+            np.testing.assert_array_equal(matrix[position, row], expected)
+
+        quadrant = self.g.get_neighbors(8, quadrant=True)
+        self.assertEqual(quadrant.shape, (10, 8))
+        for position, row in enumerate(quadrant):
+            self.assertEqual(len(set(row.tolist()) - {position}), 8)
+
+        # The spatial search gives the neighbours of the full rows when all are candidates
+        full = neighbors_module.quadrant_neighbors(
+            self.g.distances, 8, self.g.coordinates, "EXPLICIT"
+        )
+        rows = np.arange(10)[:, np.newaxis]
+        np.testing.assert_array_equal(matrix[rows, quadrant], matrix[rows, full])
+        with patch.object(neighbors_module, "cKDTree", None):
+            grid = neighbors_module.quadrant_neighbors(
+                self.g.distances, 8, self.g.coordinates, self.g.metric
+            )
+        np.testing.assert_array_equal(matrix[rows, grid], matrix[rows, full])
+
+    def test_minimum_spanning_tree(self):
+        g = Graph()
+        g.create_graph_from_json(get_test_file("./data/100v.json"))
+        costs = []
+        for method in ["prim", "kruskal"]:
+            parents = g.get_minimum_spanning_tree(method)
+            self.assertEqual((parents == -1).sum(), 1)
+            children = np.flatnonzero(parents != -1)
+            costs.append(g.distances.batch(children, parents[children]).sum())
+        self.assertAlmostEqual(costs[0], costs[1])
+
+        g.create_minimum_spanning_tree()
+        self.assertEqual(len(g.edges), 99)
+        self.assertAlmostEqual(sum(edge.cost for edge in g.edges), costs[0])
+
+    def test_spatial_index(self):
+        matrix = self.g.get_distance_matrix()
+        index = self.g.get_spatial_index().copy()
+        for position in [3, 0, 7, 5]:
+            row = matrix[position].copy()
+            row[position] = np.inf
+            row[~np.frombuffer(index._alive, dtype=bool)] = np.inf
+            nearest = index.nearest(position, 3)
+            np.testing.assert_array_equal(nearest, np.argsort(row, kind="stable")[:3])
+            index.remove(position)
+        self.assertEqual(len(index), 6)
+        self.assertEqual(len(self.g.get_spatial_index()), 10)
+
+        within = self.g.get_spatial_index().within(0, matrix[0].mean())
+        expected = [
+            p
+            for p in np.argsort(matrix[0], kind="stable")
+            if p and matrix[0, p] <= matrix[0].mean()
+        ]
+        np.testing.assert_array_equal(within, expected)
+
+    def test_subgraph(self):
+        for storage in Graph.STORAGES:
+            g = Graph(storage)
+            g.random_complete_graph(60, seed=4)
+            indices = np.array([5, 17, 2, 40, 33, 8])
+            sub = g.subgraph(indices)
+            self.assertEqual(sub.number_vertices, 6)
+            self.assertIs(sub.distances.distances, g.distances)
+            matrix = g.get_distance_matrix()[np.ix_(indices, indices)]
+            np.testing.assert_allclose(sub.get_distance_matrix(), matrix)
+            np.testing.assert_allclose(sub.distances.rows([1, 3]), matrix[[1, 3]])
+            self.assertAlmostEqual(sub.distances.cost(1, 4), matrix[1, 4])
+            self.assertAlmostEqual(sub.get_edge_cost(17, 40), g.get_edge_cost(17, 40))
+            # A subgraph of a subgraph remaps to the first storage
+            nested = sub.subgraph([4, 0])
+            self.assertIs(nested.distances.distances, g.distances)
+            self.assertAlmostEqual(nested.distances.cost(0, 1), matrix[4, 0])
+            np.testing.assert_array_equal(
+                sub.get_neighbors(2)[0], np.argsort(matrix[0])[1:3]
+            )
+
+    def test_sparse_edges(self):
+        records = [
+            {"n1": 1, "n2": 2, "w": 4.0},
+            {"n1": 2, "n2": 3, "w": 1.0},
+            {"n1": 3, "n2": 4, "w": 2.0},
+            {"n1": 4, "n2": 1, "w": 3.0},
+            {"n1": 1, "n2": 3, "w": 9.0},
+            {"n1": 3, "n2": 1, "w": 6.0},
+        ]
+        g = Graph()
+        g.create_graph_from_schema(records)
+        self.assertEqual([vertex.idx for vertex in g.vertices], [1, 2, 3, 4])
+        self.assertEqual(len(g.edges_collection), 10)
+        self.assertEqual(g.get_edge_cost(1, 3), 6.0)
+        self.assertEqual(g.edges_collection[(2, 1)].cost, 4.0)
+        self.assertNotIn((2, 4), g.edges_collection)
+        self.assertEqual(g.get_solution_cost(g.vertices), 10.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {
+                "csv": os.path.join(directory, "edges.csv"),
+                "ndjson": os.path.join(directory, "edges.ndjson"),
+            }
+            with open(paths["csv"], "w") as f:
+                f.write("n1,n2,w\n")
+                f.writelines("{n1},{n2},{w}\n".format(**record) for record in records)
+            with open(paths["ndjson"], "w") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+            for path in paths.values():
+                loaded = Graph()
+                loaded.create_graph_from_edges(path, complete=True)
+                self.assertEqual(loaded.metric, "EXPLICIT")
+                self.assertEqual(loaded.get_edge_cost(2, 4), 3.0)
+                self.assertEqual(loaded.get_edge_cost(1, 3), 5.0)
+                np.testing.assert_array_equal(
+                    loaded.sparse_edges.indptr, g.sparse_edges.indptr
+                )
+
+        records.append({"n1": 5, "n2": 6, "w": 1.0})
+        self.assertRaises(ValueError, Graph().create_graph_from_schema, records, True)
+
+    def test_database(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE nodes (idx INTEGER, x REAL, y REAL)")
+        connection.executemany(
+            "INSERT INTO nodes VALUES (?, ?, ?)",
+            [(vertex.idx, vertex.x, vertex.y) for vertex in self.g.vertices],
+        )
+        g = Graph()
+        g.create_graph_from_db(connection)
+        np.testing.assert_array_equal(
+            g.get_distance_matrix(), self.g.get_distance_matrix()
+        )
+
+        connection.execute("CREATE TABLE roads (n1 INTEGER, n2 INTEGER, w REAL)")
+        connection.executemany(
+            "INSERT INTO roads VALUES (?, ?, ?)",
+            [(i, (i + 1) % 10, i + 1.0) for i in range(10)],
+        )
+        g = Graph()
+        g.create_graph_from_db(
+            connection, "SELECT idx FROM nodes", "SELECT n1, n2, w FROM roads"
+        )
+        self.assertEqual(g.sparse_edges.number_edges, 20)
+        self.assertEqual(g.get_edge_cost(3, 2), 3.0)
+        self.assertEqual(g.get_solution_cost(g.vertices), 55.0)
+
+        g.save_tour_to_db(connection, g.vertices[::-1], name="reversed")
+        rows = connection.execute("SELECT tour, position, idx FROM tours").fetchall()
+        self.assertEqual(rows[0], ("reversed", 0, 9))
+        self.assertEqual([row[2] for row in rows], list(range(9, -1, -1)))
+        self.assertRaises(ValueError, g.save_tour_to_db, connection, [], "bad table")
+        connection.close()
+
+    def test_shared(self):
+        for storage in Graph.STORAGES:
+            g = Graph(storage)
+            g.random_complete_graph(50, seed=5)
+            g.get_neighbors(5)
+            with g.share() as shared:
+                self.assertLess(len(pickle.dumps(shared)), 1000)
+                owner = Graph()
+                owner.create_graph_from_shared(shared)
+                attached = Graph()
+                attached.create_graph_from_shared(pickle.loads(pickle.dumps(shared)))
+                self.assertEqual(attached.storage, storage)
+                np.testing.assert_array_equal(
+                    attached.get_distance_matrix(), g.get_distance_matrix()
+                )
+                np.testing.assert_array_equal(attached.neighbors, g.neighbors)
+                self.assertFalse(attached.coordinates.flags.writeable)
+                tours = np.array([np.random.permutation(50) for _ in range(4)])
+                with multiprocessing.Pool(2) as pool:
+                    costs = pool.starmap(
+                        shared_tour_cost, [(shared, tour) for tour in tours]
+                    )
+                np.testing.assert_allclose(costs, g.get_tour_costs(tours))
+                # The blocks are kept open while the arrays of the graph use them
+                attached.shared.close()
+                np.testing.assert_array_equal(
+                    attached.get_distance_matrix(), g.get_distance_matrix()
+                )
+            np.testing.assert_array_equal(
+                owner.get_distance_matrix(), g.get_distance_matrix()
+            )
+            np.testing.assert_array_equal(owner.neighbors, g.neighbors)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            g = Graph(disk_cache=directory)
+            g.random_complete_graph(100, seed=6)
+            parents = g.get_minimum_spanning_tree("kruskal", 5)
+            g.get_neighbors(5)
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+            cached = Graph(disk_cache=directory)
+            cached.random_complete_graph(100, seed=6)
+            self.assertEqual(cached.fingerprint(), g.fingerprint())
+            self.assertFalse(cached.distances.matrix.flags.writeable)
+            np.testing.assert_array_equal(cached.get_neighbors(3), g.get_neighbors(3))
+            np.testing.assert_array_equal(
+                cached.get_minimum_spanning_tree("kruskal", 5), parents
+            )
+            other = Graph(dtype="int32", disk_cache=directory)
+            other.random_complete_graph(100, seed=6)
+            self.assertNotEqual(other.fingerprint(), g.fingerprint())
+
+            self.assertIsNone(g.get_best_tour("2-opt", {"k": 5}))
+            tour = np.random.permutation(100)
+            cost = g.get_tour_costs(tour)
+            self.assertTrue(g.save_best_tour("2-opt", {"k": 5}, Tour(tour), cost))
+            self.assertFalse(g.save_best_tour("2-opt", {"k": 5}, Tour(tour), cost + 1))
+            stored, stored_cost = cached.get_best_tour("2-opt", {"k": 5})
+            np.testing.assert_array_equal(stored.order, tour)
+            self.assertEqual(stored_cost, cost)
+            self.assertIsNone(cached.get_best_tour("2-opt", {"k": 6}))
+
+            # Only the entry that has just been stored fits
+            small = DiskCache(directory, max_bytes=1)
+            small.put("key", "entry", {"values": np.arange(10)})
+            self.assertEqual(os.listdir(directory), ["key-entry.bin"])
+
+            # On Windows the files that are memory mapped can not be replaced or removed
+            with patch("os.replace", side_effect=PermissionError):
+                small.put("key", "entry", {"values": np.arange(5)})
+            self.assertEqual(os.listdir(directory), ["key-entry.bin"])
+            self.assertEqual(len(small.get("key", "entry")[1]["values"]), 10)
+            with patch("os.remove", side_effect=PermissionError):
+                small.evict()
+                small.clear()
+            self.assertEqual(os.listdir(directory), ["key-entry.bin"])
+
+
+def shared_tour_cost(shared, tour):
+    g = Graph()
+    g.create_graph_from_shared(shared)
+    return g.get_tour_costs(tour)
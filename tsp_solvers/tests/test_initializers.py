@@ -0,0 +1,98 @@
+import random
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph
+from tsp_solvers.graph.disjoint_set import DisjointSet
+from tsp_solvers.initializers import (
+    INITIALIZERS,
+    GreedyEdge,
+    NearestNeighbor,
+    RandomInitializer,
+    Savings,
+    create_initializer,
+)
+from tsp_solvers.initializers import nearest_neighbor
+from tsp_solvers.initializers.space_filling_curve import hilbert_keys
+
+
+class InitializersTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.g = Graph()
+        self.g.create_graph_from_json(get_test_file("./data/100v.json"))
+
+    def test_nearest_neighbor(self):
+        tours = NearestNeighbor(self.g, 30).get_tours()
+        self.assertEqual(tours.shape, (30, 100))
+        self.assertEqual(len(set(tours[:, 0].tolist())), 30)
+
+        matrix = self.g.distances.to_matrix()
+        for tour in tours:
+            self.assertListEqual(sorted(tour.tolist()), list(range(100)))
+            # Each tour is the one built from its start alone
+            visited = np.zeros(100, dtype=bool)
+            current = tour[0]
+            for position in tour[1:]:
+                visited[current] = True
+                current = np.argmin(np.where(visited, np.inf, matrix[current]))
+                self.assertEqual(current, position)
+
+        random.seed(42)
+        with patch.object(nearest_neighbor, "SPATIAL_LIMIT", 10):
+            np.testing.assert_array_equal(
+                NearestNeighbor(self.g, 30).get_tours(), tours
+            )
+
+        # The starts are only repeated when there are more tours than vertices
+        tours = NearestNeighbor(self.g, 150).get_tours()
+        self.assertEqual(len(set(tours[:100, 0].tolist())), 100)
+        paths = NearestNeighbor(self.g, 2).get_init()
+        self.assertEqual(sorted(paths[0]), sorted(self.g.vertices))
+
+    def test_random(self):
+        tours = RandomInitializer(self.g, 5).get_tours()
+        self.assertEqual(tours.shape, (5, 100))
+        for tour in tours:
+            self.assertListEqual(sorted(tour.tolist()), list(range(100)))
+
+    def test_constructions(self):
+        random_cost = self.g.get_tour_costs(RandomInitializer(self.g, 1).get_tours())
+        for init in INITIALIZERS:
+            tours = create_initializer(init, self.g, 3).get_tours()
+            self.assertEqual(tours.shape, (3, 100))
+            for tour in tours:
+                self.assertListEqual(sorted(tour.tolist()), list(range(100)))
+            if init != "random":
+                self.assertLess(self.g.get_tour_costs(tours)[0], random_cost[0] / 3)
+        with self.assertRaises(ValueError):
+            create_initializer("unknown", self.g)
+
+        starts = Savings(self.g, 5).get_tours()[:, 0]
+        self.assertEqual(len(set(starts.tolist())), 5)
+        np.testing.assert_array_equal(
+            hilbert_keys(np.array([[0.0, 0.0], [1.0, 1.0], [0.0, 1.0], [1.0, 0.0]]), 1),
+            [0, 2, 1, 3],
+        )
+
+    def test_greedy_edge(self):
+        self.g.create_graph_from_json(get_test_file("./data/10v.json"))
+        matrix = self.g.distances.to_matrix()
+        origins, destinations = np.triu_indices(10, 1)
+        order = np.argsort(matrix[origins, destinations], kind="stable")
+        degree = np.zeros(10, dtype=int)
+        sets = DisjointSet(10)
+        edges = set()
+        for a, b in zip(origins[order].tolist(), destinations[order].tolist()):
+            if degree[a] < 2 and degree[b] < 2 and sets.union(a, b):
+                degree[a] += 1
+                degree[b] += 1
+                edges.add((a, b))
+
+        tour = GreedyEdge(self.g).get_tours()[0]
+        pairs = {tuple(sorted(pair)) for pair in zip(tour[:-1], tour[1:])}
+        self.assertSetEqual(pairs, edges)
@@ -0,0 +1,26 @@
+import random
+from unittest import TestCase
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph, ParticleSwarmOptimization
+
+
+class PSOTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.g = Graph()
+        self.g.create_graph_from_json(get_test_file("./data/10v.json"))
+
+    def test_solutions(self):
+        pso = ParticleSwarmOptimization(self.g, 5, 4, init="nearest")
+        pso.run()
+        for particle in pso.particles:
+            for solution, tour, cost in (
+                (particle.solution, particle.tour, particle.cost),
+                (particle.best_solution, particle.best_tour, particle.best_cost),
+            ):
+                self.assertEqual(sorted(solution), sorted(self.g.vertices))
+                self.assertListEqual(solution, tour.to_path(self.g))
+                self.assertAlmostEqual(self.g.get_tour_costs(tour.order), cost)
+            self.assertLessEqual(particle.best_cost, particle.cost)
@@ -0,0 +1,47 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph
+from tsp_solvers.graph import Tour
+
+
+class TourTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.tour = Tour([3, 1, 0, 2, 4, 6, 5])
+
+    def edges(self, tour):
+        order = tour.order.tolist()
+        return {frozenset(edge) for edge in zip(order, order[1:] + order[:1])}
+
+    def test_queries(self):
+        self.assertEqual(self.tour.next(5), 3)
+        self.assertEqual(self.tour.prev(3), 5)
+        self.assertTrue(self.tour.between(0, 4, 6))
+        self.assertTrue(self.tour.between(6, 3, 1))
+        self.assertFalse(self.tour.between(6, 2, 1))
+
+    def test_reverse(self):
+        for i, j in [(1, 3), (2, 6), (5, 1), (0, 6)]:
+            tour = self.tour.copy()
+            order = self.tour.order.tolist()
+            indices = [(i + k) % len(order) for k in range((j - i) % len(order) + 1)]
+            for index, vertex in zip(indices, [order[k] for k in reversed(indices)]):
+                order[index] = vertex
+
+            tour.reverse(i, j)
+            self.assertEqual(self.edges(tour), self.edges(Tour(order)))
+            np.testing.assert_array_equal(tour.index[tour.order], np.arange(len(tour)))
+        self.assertEqual(self.tour.order.tolist(), [3, 1, 0, 2, 4, 6, 5])
+
+    def test_path(self):
+        g = Graph()
+        g.create_graph_from_json(get_test_file("./data/10v.json"))
+        path = g.get_random_paths(1)[0]
+        tour = Tour.from_path(g, path)
+        self.assertEqual(tour.to_path(g), path)
+        self.assertEqual(tour.cost(g), g.get_solution_cost(path))
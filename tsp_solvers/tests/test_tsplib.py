@@ -0,0 +1,70 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph
+from tsp_solvers.graph.tsplib import read_tsplib
+
+WEIGHTS = np.array([[0, 3, 4, 5], [3, 0, 6, 7], [4, 6, 0, 8], [5, 7, 8, 0]])
+
+
+class TSPLibTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def write_file(self, text):
+        path = os.path.join(self.directory.name, "instance.tsp")
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def write_explicit(self, edge_weight_format, values):
+        return self.write_file(
+            "NAME: explicit\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+            "EDGE_WEIGHT_FORMAT: {}\nEDGE_WEIGHT_SECTION\n{}\nEOF\n".format(
+                edge_weight_format, "\n".join(str(value) for value in values)
+            )
+        )
+
+    def test_geo(self):
+        g = Graph()
+        g.create_graph_from_tsp(get_test_file("./data/ulysses16.tsp"))
+        self.assertEqual(g.metric, "GEO")
+        self.assertEqual(g.number_vertices, 16)
+        tour = [1, 14, 13, 12, 7, 6, 15, 5, 11, 9, 10, 16, 3, 2, 4, 8]
+        path = [g.vertices_collection[idx] for idx in tour]
+        self.assertEqual(g.get_solution_cost(path), 6859)
+
+    def test_euc_2d(self):
+        path = self.write_file(
+            "NAME : small\nTYPE : TSP\nDIMENSION : 3\nEDGE_WEIGHT_TYPE : EUC_2D\n"
+            "NODE_COORD_SECTION\n1   0.0\t0.0\n  2 1.0 1.0\n3 3 4\nEOF\n"
+        )
+        instance = read_tsplib(path)
+        np.testing.assert_array_equal(instance.ids, [1, 2, 3])
+        g = Graph()
+        g.create_graph_from_tsp(path)
+        self.assertEqual(g.get_edge_cost(1, 2), 1)
+        self.assertEqual(g.get_edge_cost(1, 3), 5)
+
+    def test_explicit_formats(self):
+        formats = {
+            "FULL_MATRIX": WEIGHTS.ravel(),
+            "UPPER_ROW": WEIGHTS[np.triu_indices(4, 1)],
+            "LOWER_DIAG_ROW": WEIGHTS[np.tril_indices(4)],
+        }
+        for edge_weight_format, values in formats.items():
+            instance = read_tsplib(self.write_explicit(edge_weight_format, values))
+            np.testing.assert_array_equal(instance.weights, WEIGHTS)
+
+    def test_incomplete_section(self):
+        path = self.write_explicit("UPPER_ROW", WEIGHTS[np.triu_indices(4, 1)][:-1])
+        self.assertRaises(ValueError, read_tsplib, path)
@@ -0,0 +1,76 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from tsp_solvers.tests.const import get_test_file
+from tsp_solvers import Graph, TwoOpt
+
+
+def has_improving_move(graph, order):
+    """
+    Checks all the 2-opt moves of the tour
+    """
+    matrix = graph.distances.to_matrix()
+    following = np.roll(order, -1)
+    removed = matrix[order, following]
+    for i in range(len(order)):
+        gains = (
+            removed[i]
+            + removed
+            - matrix[order[i], order]
+            - matrix[following[i], following]
+        )
+        if np.any(gains[i + 2 :] > 1e-9):
+            return True
+    return False
+
+
+class TwoOptTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        random.seed(42)
+        self.g = Graph()
+        self.g.create_graph_from_json(get_test_file("./data/100v.json"))
+
+    def test_neighbors(self):
+        two_opt = TwoOpt(self.g, 60, k=99)
+        initial_cost = two_opt.cost
+        two_opt.run()
+        order = two_opt.tour.order
+        self.assertLess(two_opt.cost, initial_cost)
+        self.assertAlmostEqual(two_opt.cost, self.g.get_tour_costs(order))
+        self.assertListEqual(sorted(order.tolist()), list(range(100)))
+        self.assertFalse(has_improving_move(self.g, order))
+
+        two_opt = TwoOpt(self.g, 60, init="greedy")
+        two_opt.run()
+        self.assertAlmostEqual(
+            two_opt.cost, self.g.get_cost(two_opt.solution), places=6
+        )
+
+    def test_lazy_cache(self):
+        lazy = Graph(storage="lazy", cache_size=20)
+        lazy.create_graph_from_json(get_test_file("./data/100v.json"))
+        random.seed(42)
+        two_opt = TwoOpt(lazy, 60)
+        two_opt.run()
+        self.assertGreater(lazy.cache_info().hits, 0)
+        self.assertLessEqual(lazy.cache_info().currsize, 20)
+        self.assertAlmostEqual(two_opt.cost, self.g.get_tour_costs(two_opt.tour.order))
+
+    def test_best(self):
+        two_opt = TwoOpt(self.g, 60, method="best")
+        two_opt.run()
+        order = two_opt.tour.order
+        self.assertAlmostEqual(two_opt.cost, self.g.get_tour_costs(order))
+        self.assertListEqual(sorted(order.tolist()), list(range(100)))
+        self.assertFalse(has_improving_move(self.g, order))
+
+    def test_exhaustive(self):
+        two_opt = TwoOpt(self.g, 60, method="exhaustive")
+        two_opt.run()
+        self.assertAlmostEqual(two_opt.cost, self.g.get_cost(two_opt.solution))
+        self.assertFalse(has_improving_move(self.g, two_opt.tour.order))
+        with self.assertRaises(ValueError):
+            TwoOpt(self.g, 60, method="unknown")